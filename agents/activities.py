@@ -1,9 +1,69 @@
+import calendar
+import hashlib
+import re
+from datetime import datetime
 from typing import Optional, List, Literal
+from dateutil import parser as date_parser
 from pydantic import BaseModel, Field
 
 CategoryEnum = Literal["Live Entertainment", "Movies & Film", "Museums & Exhibits", "Community Events & Activities",
                        "Sports & Recreation", "Health & Wellness", "Learning & Skill-Building", "Shopping", "Food & Drink Experiences", "Self-Guided Activities & Destinations", "Other"]
 
+# Fields describing the activity itself, in the order they appear in the embedding text.
+# Internal (id, timestamps, score) and volatile (image_url, data_source) fields are left out
+# so the same place always gets the same embedding
+EMBEDDING_FIELDS = ["category", "name", "description", "location", "full_address", "website",
+                    "start_time", "end_time", "hours_of_operation", "cost", "booking_info",
+                    "family_friendliness", "accessibility_features", "age_restrictions", "indoor_outdoor",
+                    "recommended_attire_or_equipment", "weather_considerations"]
+
+# Storage fields (vector reuse, range filters), left out of activities returned to the model
+STORAGE_FIELDS = {"embedding_fingerprint", "start_timestamp"}
+
+
+WEEKDAY_PATTERN = (r"\b(?:mon(?:day)?|tue(?:s|sday)?|wed(?:nesday)?|thu(?:r|rs|rsday)?|fri(?:day)?"
+                   r"|sat(?:urday)?|sun(?:day)?)\b")
+
+
+def parse_timestamp(value: str, now: datetime = None) -> Optional[int]:
+    """Parse free-form time like 'Sat, Apr 12, 1 – 4 PM' or ISO datetime to epoch seconds of its start.
+
+Time without timezone is local wall-clock time, it's stored as if it was UTC,
+so filters built with the same function compare local times.
+Date without year is the next such date: 'Fri, Jan 2' parsed in October is in the next year.
+Time without date ('8 PM') has no timestamp, weekday ('Sat 1 PM') is the coming one.
+    """
+    if not value:
+        return None
+    now = now or datetime.now()
+
+    # Keep range start, but borrow AM/PM from range end: '1 – 4 PM' starts at 1 PM
+    parts = re.split(r"\s+(?:[–—-]|to)\s+", value.strip(), maxsplit=1)
+    start = parts[0]
+    if len(parts) > 1 and re.search(r"\d$", start) and not re.search(r"\b[ap]\.?m\.?\b", start, re.IGNORECASE):
+        meridiem = re.search(r"\b([ap])\.?m\.?\b", parts[1], re.IGNORECASE)
+        if meridiem:
+            start = f"{start} {meridiem.group(1).upper()}M"
+
+    try:
+        # Fields which differ between parses with different defaults are missing in text
+        first = date_parser.parse(start, fuzzy=True, default=datetime(2000, 1, 1))
+        second = date_parser.parse(start, fuzzy=True, default=datetime(2004, 3, 3))
+        has_date = first.month == second.month or first.day == second.day
+        if not has_date and not re.search(WEEKDAY_PATTERN, start, re.IGNORECASE):
+            return None
+
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        parsed = date_parser.parse(start, fuzzy=True, default=today)
+        if has_date and first.year != second.year and parsed.date() < today.date():
+            parsed = parsed.replace(year=parsed.year + 1)
+    except (ValueError, OverflowError):
+        return None
+
+    if parsed.tzinfo is not None:
+        return int(parsed.timestamp())
+    return calendar.timegm(parsed.timetuple())
+
 
 class ActivityDetails(BaseModel):
     """Represents detailed information about an activity or event.
@@ -22,6 +82,10 @@ If certain fields lack sufficient data or are unavailable, they will be assigned
         default=None, description="For internal use only.")
     similarity_score: Optional[float] = Field(
         default=None, description="For internal use only. Similarity score of the activity to the vectore store query.")
+    embedding_fingerprint: Optional[str] = Field(
+        default=None, description="For internal use only. Hash of the text the activity vector was built from.")
+    start_timestamp: Optional[int] = Field(
+        default=None, description="For internal use only. Parsed start_time for range filters.")
 
     data_source: Optional[str] = Field(
         default="Model", description="Source of the information. Can be 'Model' or tool name.")
@@ -73,9 +137,48 @@ If certain fields lack sufficient data or are unavailable, they will be assigned
         )
     )
 
+    def get_embedding_text(self) -> str:
+        """Canonical text for embedding: semantic fields only, fixed order, empty values dropped"""
+        lines = []
+        for field in EMBEDDING_FIELDS:
+            value = getattr(self, field)
+            if isinstance(value, list):
+                value = ", ".join(str(item) for item in value if item)
+            if value is None:
+                continue
+
+            value = " ".join(str(value).split())
+            if not value or value.upper() == "N/A":
+                continue
+
+            lines.append(f"{field}: {value}")
+
+        return "\n".join(lines)
+
+    def get_embedding_fingerprint(self, embedding_model: str) -> str:
+        """Hash of embedding text and model, vectors of another model are not reused"""
+        return hashlib.sha256(f"{embedding_model}\n{self.get_embedding_text()}".encode("utf-8")).hexdigest()
+
 
 class ActivitiesList(BaseModel):
     """Holds a collection of activity details representing recommendations"""
     activities: List[ActivityDetails]
     reason: Optional[str] = Field(
         default="No reason provided", description="Reason for the recommendations and tools selection.")
+
+
+class ResultSelection(BaseModel):
+    """Search result selected by result_id, with fields the search result does not have"""
+    result_id: str = Field(description="result_id of the search result.")
+    # Search results have no category, it is required so category filters work for saved results
+    category: str = Field(
+        description="Possible values: Live Entertainment, Movies & Film, Museums & Exhibits, Community Events & Activities, Sports & Recreation, Health & Wellness, Learning & Skill-Building, Shopping, Food & Drink Experiences, Self-Guided Activities & Destinations, Other")
+    description: Optional[str] = Field(
+        default=None, description="Only when search result description is missing or misleading.")
+
+
+class SelectedResults(BaseModel):
+    """Holds search results selected to be saved"""
+    selections: List[ResultSelection]
+    reason: Optional[str] = Field(
+        default="No reason provided", description="Reason for the results selection.")
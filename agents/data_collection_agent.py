@@ -1,4 +1,5 @@
 import os
+from collections import Counter
 
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, AIMessage, ToolMessage
@@ -8,6 +9,7 @@ from langgraph.prebuilt import ToolNode
 from langgraph.graph import MessagesState
 from langchain_core.runnables import RunnableConfig
 import agents.prompts as prmt
+from agents.tools import SEARCH_FANOUT_LIMIT
 
 
 class DataCollectionAgent:
@@ -25,9 +27,6 @@ class DataCollectionAgent:
 
         self.tools = tools
         self.llm_agent = self.llm.bind_tools(self.tools)
-        
-        # Unfinite duplicate tool calls detection
-        self.tool_calls_history = {}
 
     def get_system_prompt(self, prompt, config, web_search_count=0):
         # Direct access to config if not graph invoked, otherwise use graph config via configurable
@@ -53,7 +52,7 @@ class DataCollectionAgent:
         for msg in state["messages"]:
             if isinstance(msg, AIMessage):
                 for call in msg.additional_kwargs["tool_calls"]:
-                    if call["function"]["name"] in [t.name for t in self.tools if t.name != "save_results"]:
+                    if call["function"]["name"] in [t.name for t in self.tools if t.name not in ("save_results", "save_selected_results")]:
                         web_search_count += 1
 
         system_prompt = self.get_system_prompt(
@@ -88,20 +87,21 @@ class DataCollectionAgent:
                 raise Exception(message.content)
 
         if "tool_calls" in last_message.additional_kwargs:
+            # Unfinite duplicate tool calls detection. History is counted from the state,
+            # so the same compiled graph can serve many runs and sessions
+            tool_calls_history = Counter()
+            for message in state["messages"]:
+                if isinstance(message, AIMessage):
+                    for call in message.additional_kwargs.get("tool_calls", []):
+                        tool_calls_history[(call["function"]["name"], call["function"]["arguments"])] += 1
+
             for call in last_message.additional_kwargs["tool_calls"]:
                 fn_name = call["function"]["name"]
                 fn_args = call["function"]["arguments"]
-                                                                
-                if fn_name not in self.tool_calls_history:
-                    self.tool_calls_history[fn_name] = {fn_args: 1}
-                elif fn_args not in self.tool_calls_history[fn_name]:
-                    self.tool_calls_history[fn_name][fn_args] = 1
-                else:
-                    self.tool_calls_history[fn_name][fn_args] += 1
                          
                 # Infinite tool calls control    
                 limit = 3
-                if self.tool_calls_history[fn_name][fn_args] >= limit:
+                if tool_calls_history[(fn_name, fn_args)] >= limit:
                     raise Exception(f"Tool call limit reached ({limit}): {fn_name} with args: {fn_args}")
 
             return "Search"
@@ -117,7 +117,9 @@ class DataCollectionAgent:
         graph.add_edge(START, COLLECT_DATA_NODE)
 
         graph.add_node(COLLECT_DATA_NODE, self.agent_node)
-        graph.add_node(DATA_SOURCE_NODE, ToolNode(self.tools))
+        # Tool calls of one turn run concurrently: async tools share search limits of agents.tools,
+        # sync invoke runs tools in a thread pool limited by max_concurrency
+        graph.add_node(DATA_SOURCE_NODE, ToolNode(self.tools).with_config(max_concurrency=SEARCH_FANOUT_LIMIT))
         graph.set_entry_point(COLLECT_DATA_NODE)
 
         graph.add_conditional_edges(
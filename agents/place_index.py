@@ -0,0 +1,122 @@
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from agents.activities import ActivityDetails
+
+# Raw result fields with nested lists of places, e.g. top_sights.sights, local_ads.ads
+NESTED_PLACE_LISTS = ["sights", "ads", "places"]
+
+
+def normalize_place_name(name: str) -> str:
+    name = re.sub(r"[^\w\s]", " ", str(name).lower())
+    name = re.sub(r"^the\s+", "", name.strip())
+    return " ".join(name.split())
+
+
+class PlaceIndex:
+    """Structured place data (address, GPS coordinates) of raw search results collected during a run.
+
+Search tools add raw results, save_results fills addresses of activities re-emitted by the model,
+so Google geocoding is needed only for activities without structured data.
+Entries are keyed by data source and normalized name, lookup falls back to name only.
+    """
+
+    def __init__(self):
+        self.places: Dict[Tuple[str, str], dict] = {}
+        self.hits = 0
+        self.misses = 0
+        # Tool calls of one model turn run in parallel threads
+        self._lock = threading.Lock()
+
+    def _add_place(self, data_source: str, name: str, address: Optional[str], coordinates: Optional[dict]):
+        if not name or not (address or coordinates):
+            return
+
+        name = normalize_place_name(name)
+        with self._lock:
+            for key in [(data_source, name), ("", name)]:
+                place = self.places.setdefault(key, {"address": None, "coordinates": None})
+                # Keep the most complete data seen for the place
+                place["address"] = place["address"] or address
+                place["coordinates"] = place["coordinates"] or coordinates
+
+    def add_result(self, data_source: str, result: dict):
+        address = result.get("address")
+        if isinstance(address, list):
+            # Events: ["Kiest Park, 3080 S Hampton Rd", "Dallas, TX"]
+            address = ", ".join(part for part in address if part)
+
+        coordinates = None
+        gps = result.get("gps_coordinates")
+        if isinstance(gps, dict) and gps.get("latitude") is not None and gps.get("longitude") is not None:
+            coordinates = {"lat": gps["latitude"], "lon": gps["longitude"]}
+
+        self._add_place(data_source, result.get("title") or result.get("name"), address, coordinates)
+
+        # Event venue is a place too
+        venue = result.get("venue")
+        if isinstance(venue, dict):
+            self._add_place(data_source, venue.get("name"), address, None)
+
+    def add_results(self, search_results: dict):
+        """Index search tool output: search type -> descriptor with data_source and search_results"""
+        for search_type, descriptor in search_results.items():
+            if search_type == "error":
+                continue
+
+            results = descriptor.get("search_results")
+            if isinstance(results, dict):
+                nested = [results[field] for field in NESTED_PLACE_LISTS if isinstance(results.get(field), list)]
+                results = [item for items in nested for item in items] or [results]
+            if not isinstance(results, list):
+                continue
+
+            for result in results:
+                if isinstance(result, dict):
+                    self.add_result(descriptor.get("data_source", ""), result)
+
+    def lookup(self, name: str, data_source: str = None) -> Optional[dict]:
+        if not name:
+            return None
+
+        name = normalize_place_name(name)
+        return self.places.get((data_source or "", name)) or self.places.get(("", name))
+
+    def fill_addresses(self, activities: List[ActivityDetails]):
+        """Set location of activities found in index.
+
+Address becomes activity location, so it is normalized by address validation instead of a place
+search and the activity keeps the same full_address (and id) it had when saved before.
+        """
+        for activity in activities:
+            if activity.full_address:
+                continue
+
+            place = self.lookup(activity.name, activity.data_source)
+            with self._lock:
+                if place:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            if not place:
+                continue
+
+            address = place["address"]
+            if address and (place["coordinates"] or not activity.location):
+                activity.location = address
+
+    def fill_coordinates(self, activity: ActivityDetails, base_location: str) -> bool:
+        """Fallback for location which does not pass address validation.
+
+Only index address with GPS coordinates of the same search result is used as full_address,
+other locations (e.g. from the model) go through place search.
+        """
+        place = self.lookup(activity.name, activity.data_source)
+        if not place or not place["coordinates"] or place["address"] != activity.location:
+            return False
+
+        location = activity.location
+        activity.full_address = location if "," in location else f"{location}, {base_location}"
+        activity.coordinates = place["coordinates"]
+        return True
@@ -8,7 +8,7 @@ Itinerary must be practical, enjoyable, and aligned with the user preferences.
 Do not use model knowledge for experience, instead use the tools only to get external latest information.
 
 1. Define 2-3 categories of experiences based on user preferences
-2. For each category query vector db for experiences to get 5 results of each category
+2. Query vector db for experiences to get 5 results of each category, all categories in one vector_store_multi_search call
 
 -- Itinerary planning instructions:
 
@@ -94,7 +94,8 @@ Phase 2: Search-Enhanced Expansion
 - if there is only save_results tool in the list, skip this phase
 
 Phase 3: Save results
-- Save results using save_results tool
+- Save search tool results by result_id using save_selected_results tool, set category of every result
+- Save other results (model knowledge, web page extraction) using save_results tool
 
 Phase 4: Report back
 1. Explain how search budget was consumed
@@ -109,7 +110,7 @@ Phase 4: Report back
 
 Operational Constraints:
 - Search tools budget: Absolute maximum {search_limit} queries to single search tool
-- Storage Compliance: All result preservation via save_results tool
+- Storage Compliance: All result preservation via save_selected_results and save_results tools
 """
 
 data_collection_system_prompt_model_only = """Core Objective: 
@@ -0,0 +1,166 @@
+"""Deterministic mapping of SerpAPI results to ActivityDetails.
+
+Search tools register raw results, every normalized result gets a stable result_id which is shown
+to the model with projected results. The model selects and annotates results by id
+(save_selected_results), so it does not have to re-emit data the code already has.
+"""
+import hashlib
+import threading
+from typing import Callable, Dict, Optional
+
+from agents.activities import ActivityDetails
+from agents.place_index import NESTED_PLACE_LISTS
+
+# Search types with places, events or pages, other types (showtimes, shopping) are left to the model
+NORMALIZED_SEARCH_TYPES = ["local_results", "ads_results", "events_results", "organic_results",
+                           "knowledge_graph", "top_sights", "local_ads"]
+
+
+def _text(value) -> Optional[str]:
+    if isinstance(value, list):
+        value = ", ".join(str(part) for part in value if part)
+    if value in (None, ""):
+        return None
+    return " ".join(str(value).split())
+
+
+def _image_url(item: dict) -> Optional[str]:
+    return item.get("image_url") or item.get("image") or item.get("thumbnail") or item.get("favicon")
+
+
+def _hours(item: dict) -> Optional[str]:
+    # Local results "hours" is a live status ("Closed ⋅ Opens 11 AM"), not hours of operation
+    operating_hours = item.get("operating_hours")
+    if isinstance(operating_hours, dict):
+        return "; ".join(f"{day}: {value}" for day, value in operating_hours.items())
+    return None
+
+
+def _website(item: dict) -> Optional[str]:
+    links = item.get("links")
+    if isinstance(links, dict) and links.get("website"):
+        return links["website"]
+    return item.get("website") or item.get("link")
+
+
+def _description(item: dict) -> Optional[str]:
+    # Local results have short quoted review as description and cuisine or place kind as type
+    parts = [_text(item.get("type")), _text(item.get("description") or item.get("snippet"))]
+    return ". ".join(part.strip('"') for part in parts if part) or None
+
+
+def normalize_place_result(item: dict, data_source: str) -> ActivityDetails:
+    """Google local, Google local pack, top sights and knowledge graph place"""
+    return ActivityDetails(
+        data_source=data_source,
+        name=_text(item.get("title") or item.get("name")),
+        description=_description(item),
+        image_url=_image_url(item),
+        location=_text(item.get("address")),
+        website=_website(item),
+        hours_of_operation=_hours(item),
+        cost=_text(item.get("price")),
+    )
+
+
+def normalize_event_result(item: dict, data_source: str) -> ActivityDetails:
+    date = item.get("date") if isinstance(item.get("date"), dict) else {}
+    tickets = [ticket for ticket in item.get("ticket_info", []) if isinstance(ticket, dict) and ticket.get("link")]
+
+    return ActivityDetails(
+        data_source=data_source,
+        name=_text(item.get("title")),
+        description=_text(item.get("description")),
+        image_url=_image_url(item),
+        location=_text(item.get("address")),
+        website=item.get("link"),
+        start_time=_text(date.get("when") or date.get("start_date")),
+        booking_info="; ".join(f"{ticket.get('source', 'Tickets')}: {ticket['link']}" for ticket in tickets[:2]) or None,
+    )
+
+
+def normalize_yelp_result(item: dict, data_source: str) -> ActivityDetails:
+    categories = [category.get("title") for category in item.get("categories", []) if isinstance(category, dict)]
+    description = ". ".join(part for part in [_text(categories), _text(item.get("snippet"))] if part)
+
+    return ActivityDetails(
+        data_source=data_source,
+        name=_text(item.get("title")),
+        description=description or None,
+        image_url=_image_url(item),
+        # Yelp has neighborhood only, full address is resolved by place search
+        location=_text(item.get("address") or item.get("neighborhoods")),
+        website=item.get("link"),
+        cost=_text(item.get("price")),
+    )
+
+
+def normalize_organic_result(item: dict, data_source: str) -> ActivityDetails:
+    """Web page, address is resolved by place search with page title"""
+    return ActivityDetails(
+        data_source=data_source,
+        name=_text(item.get("title")),
+        description=_text(item.get("snippet")),
+        image_url=_image_url(item),
+        website=item.get("link"),
+    )
+
+
+def get_normalizer(engine: str, search_type: str) -> Callable[[dict, str], ActivityDetails]:
+    if engine == "google_events":
+        return normalize_event_result
+    if engine == "yelp":
+        return normalize_yelp_result
+    if engine == "google" and search_type == "organic_results":
+        return normalize_organic_result
+    return normalize_place_result
+
+
+def get_result_id(data_source: str, item: dict) -> str:
+    key = "|".join(str(part) for part in [
+        data_source, item.get("title") or item.get("name"), _text(item.get("address")), item.get("link")])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:8]
+
+
+class ResultRegistry:
+    """Normalized search results collected during a run, by result_id.
+
+Raw result items get result_id field, so it's kept in projected results the model reads.
+    """
+
+    def __init__(self):
+        self.activities: Dict[str, ActivityDetails] = {}
+        # Tool calls of one model turn run in parallel threads
+        self._lock = threading.Lock()
+
+    def add_results(self, search_results: dict):
+        """Register search tool output: search type -> descriptor with data_source and search_results"""
+        for search_type, descriptor in search_results.items():
+            if search_type not in NORMALIZED_SEARCH_TYPES:
+                continue
+
+            data_source = descriptor.get("data_source", "")
+            normalizer = get_normalizer(data_source, search_type)
+
+            results = descriptor.get("search_results")
+            if isinstance(results, dict):
+                nested = [results[field] for field in NESTED_PLACE_LISTS if isinstance(results.get(field), list)]
+                results = [item for items in nested for item in items] or [results]
+            if not isinstance(results, list):
+                continue
+
+            for item in results:
+                if not isinstance(item, dict) or not (item.get("title") or item.get("name")):
+                    continue
+
+                result_id = get_result_id(data_source, item)
+                activity = normalizer(item, data_source)
+                with self._lock:
+                    self.activities[result_id] = activity
+                item["result_id"] = result_id
+
+    def get(self, result_id: str) -> Optional[ActivityDetails]:
+        """Copy of normalized result, so annotations do not change registered one"""
+        activity = self.activities.get(result_id)
+        return activity.model_copy(deep=True) if activity else None
+
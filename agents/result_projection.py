@@ -0,0 +1,139 @@
+"""Compact projection of raw search results before they are sent to the model.
+
+Search tools return whole SerpAPI blocks: tracking and SerpAPI links, nested reviews, ids.
+Tool messages stay in the conversation, so every byte is paid again on each later model turn.
+Projection keeps only fields ActivityDetails is built from and truncates long text and lists.
+"""
+import json
+import logging
+from typing import Dict, List, Optional
+
+# Prose longer than this is cut, other strings (links, image URLs, names) are kept whole
+# because the model copies them into saved activities
+MAX_TEXT_LENGTH = 300
+TRUNCATED_FIELDS = {"description", "snippet"}
+MAX_LIST_ITEMS = 3
+
+# Fields kept from result items, ordered roughly by ActivityDetails
+COMMON_FIELDS = [
+    "result_id", "title", "name", "type", "description", "snippet", "address", "image_url",
+    "link", "website", "links", "date", "hours", "operating_hours", "price", "rating", "reviews", "phone",
+]
+ENGINE_FIELDS: Dict[str, List[str]] = {
+    "google": COMMON_FIELDS + ["source", "extensions", "day", "theaters"],
+    "google_events": COMMON_FIELDS + ["venue", "ticket_info"],
+    "google_local": COMMON_FIELDS + ["service_options"],
+    "yelp": COMMON_FIELDS + ["categories", "neighborhoods", "highlights", "service_options"],
+}
+# Fields kept inside nested values: venue, ticket_info, categories, links, showtimes
+NESTED_FIELDS = {"name", "title", "source", "link", "website", "when", "start_date", "day", "date", "time", "type",
+                 "theaters", "showing"}
+
+_encoding = None
+_encoding_loaded = False
+
+
+def _get_encoding():
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            # Encoding files are downloaded on first use, fall back to estimate offline
+            logging.warning(f"Token counts are estimated, tiktoken encoding is not available: {e}")
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is None:
+        # About 4 bytes per token for English JSON
+        return len(text.encode("utf-8")) // 4
+    return len(encoding.encode(text))
+
+
+def _truncate(text: str) -> str:
+    return text if len(text) <= MAX_TEXT_LENGTH else text[:MAX_TEXT_LENGTH].rstrip() + "…"
+
+
+def _project_value(value, depth: int = 0):
+    if isinstance(value, list):
+        return [_project_value(item, depth + 1) for item in value[:MAX_LIST_ITEMS]]
+    if isinstance(value, dict):
+        if depth > 3:
+            return None
+        return {k: _project_value(v, depth + 1) for k, v in value.items() if k in NESTED_FIELDS}
+    return value
+
+
+def project_item(item, fields: List[str]):
+    if not isinstance(item, dict):
+        return _project_value(item)
+
+    projected = {}
+    for field in fields:
+        value = item.get(field)
+        if value in (None, "", [], {}):
+            continue
+        if field in TRUNCATED_FIELDS and isinstance(value, str):
+            projected[field] = _truncate(value)
+        else:
+            projected[field] = _project_value(value)
+    return projected
+
+
+def project_results(results: dict, engine: str) -> dict:
+    """Tool output with search_results of every search type projected, descriptors are kept"""
+    fields = ENGINE_FIELDS.get(engine, COMMON_FIELDS)
+
+    projected = {}
+    for search_type, descriptor in results.items():
+        if search_type == "error":
+            projected[search_type] = descriptor
+            continue
+
+        search_results = descriptor.get("search_results")
+
+        if isinstance(search_results, list):
+            search_results = [project_item(item, fields) for item in search_results]
+        elif isinstance(search_results, dict):
+            # top_sights and local_ads wrap places list, knowledge_graph is a single place
+            nested = {key: value for key, value in search_results.items() if key in ("sights", "ads", "places")}
+            if nested:
+                search_results = {key: [project_item(item, fields) for item in value] for key, value in nested.items()}
+            else:
+                search_results = project_item(search_results, fields)
+
+        projected[search_type] = {**descriptor, "search_results": search_results}
+
+    return projected
+
+
+def get_projection_stats(tool_name: str, raw: dict, projected: dict) -> dict:
+    raw_text = json.dumps(raw, ensure_ascii=False)
+    projected_text = json.dumps(projected, ensure_ascii=False)
+
+    return {
+        "tool": tool_name,
+        "raw_bytes": len(raw_text.encode("utf-8")),
+        "projected_bytes": len(projected_text.encode("utf-8")),
+        "raw_tokens": count_tokens(raw_text),
+        "projected_tokens": count_tokens(projected_text),
+    }
+
+
+def project_tool_results(tool_name: str, results: dict, engine: str, config: Optional[dict] = None) -> dict:
+    """Project results and report raw vs projected size, stats are added to projection_stats list of config"""
+    projected = project_results(results, engine)
+
+    stats = get_projection_stats(tool_name, results, projected)
+    logging.info(f"{tool_name} results: {stats['raw_bytes']} -> {stats['projected_bytes']} bytes, "
+                 f"{stats['raw_tokens']} -> {stats['projected_tokens']} tokens")
+
+    cfg = (config or {}).get("configurable", {})
+    if "projection_stats" in cfg:
+        cfg["projection_stats"].append(stats)
+
+    return projected
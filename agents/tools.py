@@ -1,18 +1,39 @@
+import asyncio
 import json
+import logging
 import os
-from serpapi import GoogleSearch
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime
 from langchain_core.tools import tool
 from langchain_core.runnables import RunnableConfig
 from langgraph.prebuilt import InjectedStore
-from typing import List, Dict, Annotated
+from typing import List, Dict, Annotated, Optional
 
-from integrations.geocoding import get_place_address, get_validated_address
+from integrations.geocoding import get_geocoding_cache_stats, get_place_address, get_validated_address
 from integrations.vector_database import VectorDatabase
-from agents.activities import ActivitiesList, ActivityDetails
+from agents.place_index import PlaceIndex
+from agents.activities import STORAGE_FIELDS, ActivitiesList, ActivityDetails, SelectedResults, parse_timestamp
 from integrations.uule_convertor import UuleConverter
+from integrations.serpapi_cache import cached_search
+from integrations.serpapi_pagination import get_page_params, merge_pages, paginated_search
+from agents.result_projection import project_tool_results
 
 from langchain_hyperbrowser import HyperbrowserExtractTool
 
+# Activities of one save_results batch resolved in parallel
+ADDRESS_RESOLUTION_WORKERS = int(os.getenv("ADDRESS_RESOLUTION_WORKERS", 16))
+# Search location rounded to this number of decimals, 2 is ~1 km
+SERPAPI_LOCATION_PRECISION = int(os.getenv("SERPAPI_LOCATION_PRECISION", 2))
+# Searches running at once in one agent turn, all engines together and per engine
+SEARCH_FANOUT_LIMIT = int(os.getenv("SEARCH_FANOUT_LIMIT", 4))
+SEARCH_ENGINE_CONCURRENCY = int(os.getenv("SEARCH_ENGINE_CONCURRENCY", 2))
+
+_search_semaphores = weakref.WeakKeyDictionary()
+_search_semaphores_lock = threading.Lock()
+
 # check this page https://blog.offerpad.com/things-to-do-dallas-tx
 # check this page https://www.visitdallas.com
 # use google_organic_search to find dallas kids center
@@ -41,19 +62,33 @@ def __extract_image_url(place):
 
     return None
 
-@tool("web_page_data_extraction")
-def web_page_data_extraction(url: str):
-    """
-        Extract data from a single web page
-    """
-    results = HyperbrowserExtractTool().run(
-        {
-            "url": url,
-            "schema": ActivitiesList,
-            "session_options": {"session_options": {"use_proxy": True}},
-        }
-    )
-
+def __coroutine_of(search_tool):
+    """Register decorated async function as coroutine of a tool, so the tool works with invoke and ainvoke"""
+    def decorator(coroutine):
+        search_tool.coroutine = coroutine
+        return coroutine
+    return decorator
+
+def __get_search_semaphores(engine: str):
+    # asyncio semaphores are bound to event loop, every run (asyncio.run) gets its own
+    loop = asyncio.get_running_loop()
+    with _search_semaphores_lock:
+        semaphores = _search_semaphores.setdefault(loop, {})
+        if None not in semaphores:
+            semaphores[None] = asyncio.Semaphore(SEARCH_FANOUT_LIMIT)
+        if engine not in semaphores:
+            semaphores[engine] = asyncio.Semaphore(SEARCH_ENGINE_CONCURRENCY)
+        return semaphores[None], semaphores[engine]
+
+@asynccontextmanager
+async def __search_slot(engine: str):
+    """Limit concurrent searches of one engine, then of all engines together"""
+    fanout, engine_semaphore = __get_search_semaphores(engine)
+    async with engine_semaphore:
+        async with fanout:
+            yield
+
+def __web_page_results(url, results):
     return {
         "web_page_data_extraction": {
             "data_source": "hyperbrowser",
@@ -64,29 +99,39 @@ def web_page_data_extraction(url: str):
         }
     }
 
-@tool("google_organic_search")
-def google_organic_search(query: str, config: RunnableConfig):
-    """Universal search tool to find all places to go out using Google search. 
+def __web_page_extract_input(url):
+    return {
+        "url": url,
+        "schema": ActivitiesList,
+        "session_options": {"session_options": {"use_proxy": True}},
+    }
 
-Use it to search:
-- Movies & Film (showtimes, cinemas)
-- Other categories which are not covered by specialized search tools
+@tool("web_page_data_extraction")
+def web_page_data_extraction(url: str):
+    """
+        Extract data from a single web page
+    """
+    results = HyperbrowserExtractTool().run(__web_page_extract_input(url))
 
-Can also be used to augment more 'general' knowledge to a previous specialist query."""
-    # TODO: Consider pagination vs number of results
-
-    result_types = [
-        "organic_results",
-        "shopping_results",
-        "local_ads",
-        "knowledge_graph",
-        "top_sights",
-        "showtimes",
-    ]
-        
-    results = serpapi_search(query, "google", config, result_types)
-    #  , mock_file = "mockups/serpapi-1.json")
+    return __web_page_results(url, results)
+
+@__coroutine_of(web_page_data_extraction)
+async def aweb_page_data_extraction(url: str):
+    async with __search_slot("hyperbrowser"):
+        results = await HyperbrowserExtractTool().ainvoke(__web_page_extract_input(url))
 
+    return __web_page_results(url, results)
+
+GOOGLE_ORGANIC_RESULT_TYPES = [
+    "organic_results",
+    "shopping_results",
+    "local_ads",
+    "knowledge_graph",
+    "top_sights",
+    "showtimes",
+]
+
+def __google_organic_results(results, config):
     try:
         for result_type, result_descriptor in results.items():
             if result_type in ["knowledge_graph"]:
@@ -106,9 +151,42 @@ Can also be used to augment more 'general' knowledge to a previous specialist qu
             __set_image_url(places_list)
     except Exception as e:
         print(f"Error: {e}")
-        return results
+        return project_tool_results("google_organic_search", results, "google", config)
                 
-    return results              
+    return project_tool_results("google_organic_search", results, "google", config)
+
+@tool("google_organic_search")
+def google_organic_search(query: str, config: RunnableConfig):
+    """Universal search tool to find all places to go out using Google search. 
+
+Use it to search:
+- Movies & Film (showtimes, cinemas)
+- Other categories which are not covered by specialized search tools
+
+Can also be used to augment more 'general' knowledge to a previous specialist query."""
+
+    results = serpapi_search(query, "google", config, GOOGLE_ORGANIC_RESULT_TYPES)
+    #  , mock_file = "mockups/serpapi-1.json")
+
+    return __google_organic_results(results, config)
+
+@__coroutine_of(google_organic_search)
+async def agoogle_organic_search(query: str, config: RunnableConfig):
+    results = await aserpapi_search(query, "google", config, GOOGLE_ORGANIC_RESULT_TYPES)
+
+    return __google_organic_results(results, config)
+
+GOOGLE_EVENTS_RESULT_TYPES = [
+    "events_results",
+]
+
+def __google_events_results(results, config):
+    for result_type, result_descriptor in results.items():
+        if result_type in ["events_results"]:
+            places_list = result_descriptor["search_results"]
+            __set_image_url(places_list)
+
+    return project_tool_results("google_events_search", results, "google_events", config)
 
 @tool("google_events_search")
 def google_events_search(query: str, config: RunnableConfig):
@@ -120,19 +198,29 @@ Use this tool to find
 - Learning & Skillbuilding: cooking classes, art classes, workshops, seminars
 and other activities based on your query"""
 
-    result_types = [
-        "events_results",
-    ]
-
-    results = serpapi_search(query, "google_events", config, result_types)
+    results = serpapi_search(query, "google_events", config, GOOGLE_EVENTS_RESULT_TYPES)
     #  , mock_file = "mockups/serpapi-events-1.json")
 
+    return __google_events_results(results, config)
+
+@__coroutine_of(google_events_search)
+async def agoogle_events_search(query: str, config: RunnableConfig):
+    results = await aserpapi_search(query, "google_events", config, GOOGLE_EVENTS_RESULT_TYPES)
+
+    return __google_events_results(results, config)
+
+GOOGLE_LOCAL_RESULT_TYPES = [
+    "ads_results",
+    "local_results",
+]
+
+def __google_local_results(results, config):
     for result_type, result_descriptor in results.items():
-        if result_type in ["events_results"]:
+        if result_type in ["local_results", "ads_results"]:
             places_list = result_descriptor["search_results"]
             __set_image_url(places_list)
 
-    return results
+    return project_tool_results("google_local_search", results, "google_local", config)
 
 @tool("google_local_search")
 def google_local_search(query: str, config: RunnableConfig):
@@ -148,20 +236,36 @@ Use it to find following categories:
 - Attractions
 """
 
-    result_types = [
-        "ads_results",
-        "local_results",
-    ]
-
-    results = serpapi_search(query, "google_local", config, result_types)
+    results = serpapi_search(query, "google_local", config, GOOGLE_LOCAL_RESULT_TYPES)
     #  , mock_file = "mockups/serpapi-locals-1.json")
 
+    return __google_local_results(results, config)
+
+@__coroutine_of(google_local_search)
+async def agoogle_local_search(query: str, config: RunnableConfig):
+    results = await aserpapi_search(query, "google_local", config, GOOGLE_LOCAL_RESULT_TYPES)
+
+    return __google_local_results(results, config)
+
+YELP_RESULT_TYPES = [
+    "ads_results",
+    "organic_results",
+]
+
+def __yelp_params(query, config):
+    cfg = config.get("configurable", {})
+    return {
+        "find_desc": query,
+        "find_loc": cfg["exact_location"]["formatted_address"],
+    }
+
+def __yelp_results(results, config):
     for result_type, result_descriptor in results.items():
-        if result_type in ["local_results", "ads_results"]:
+        if result_type in ["organic_results", "ads_results"]:
             places_list = result_descriptor["search_results"]
             __set_image_url(places_list)
 
-    return results
+    return project_tool_results("yelp_search", results, "yelp", config)
 
 @tool("yelp_search")
 def yelp_search(query: str, config: RunnableConfig):
@@ -171,31 +275,18 @@ def yelp_search(query: str, config: RunnableConfig):
     """
     # TODO: Maybe use advanced search parameters
 
-    result_types = [
-        "ads_results",
-        "organic_results",
-    ]
-
-    cfg = config.get("configurable", {})
-    extra_params = {
-        "find_desc": query,
-        "find_loc": cfg["exact_location"]["formatted_address"],
-    }
-
-    results = serpapi_search(query, "yelp", config, result_types, extra_params)
+    results = serpapi_search(query, "yelp", config, YELP_RESULT_TYPES, __yelp_params(query, config))
     #  , mock_file = "mockups/serpapi-locals-1.json")
     
-    for result_type, result_descriptor in results.items():
-        if result_type in ["organic_results", "ads_results"]:
-            places_list = result_descriptor["search_results"]
-            __set_image_url(places_list)
+    return __yelp_results(results, config)
 
-    return results
+@__coroutine_of(yelp_search)
+async def ayelp_search(query: str, config: RunnableConfig):
+    results = await aserpapi_search(query, "yelp", config, YELP_RESULT_TYPES, __yelp_params(query, config))
 
-def serpapi_search(query: str, engine: str, config: RunnableConfig, result_types: List[str] = None, extra_params: Dict[str, str] = None, mock_file: str = None):
-    # TODO: Consider use pagination together with number of results
+    return __yelp_results(results, config)
 
-    cfg = config.get("configurable", {})
+def __serpapi_params(query: str, engine: str, cfg: dict, extra_params: Dict[str, str] = None):
     params = {
         "engine": engine,
         "api_key": os.getenv("SERPAPI_KEY"),
@@ -204,20 +295,49 @@ def serpapi_search(query: str, engine: str, config: RunnableConfig, result_types
     }
     
     exact_location = cfg["exact_location"]
-    params["uule"] = UuleConverter.encode(
-        exact_location["lat"], exact_location["lon"])
+    # Deterministic location parameter, so repeated searches from the same area are cache hits
+    params["uule"] = UuleConverter.encode_quantized(
+        exact_location["lat"], exact_location["lon"], SERPAPI_LOCATION_PRECISION)
 
     if extra_params:
         params.update(extra_params)
 
+    return params
+
+def serpapi_search(query: str, engine: str, config: RunnableConfig, result_types: List[str] = None, extra_params: Dict[str, str] = None, mock_file: str = None):
+    cfg = config.get("configurable", {})
+    params = __serpapi_params(query, engine, cfg, extra_params)
+
     results = {}
     if mock_file:
         with open(mock_file, 'r') as f:
             results = json.load(f)
     else:
-        search = GoogleSearch(params)
-        results = search.get_json()
+        # Pages needed for number_of_results are fetched at once and merged
+        results = paginated_search(params, cached_search)
+
+    return __filter_serpapi_results(results, engine, cfg, result_types, mock_file)
 
+async def aserpapi_search(query: str, engine: str, config: RunnableConfig, result_types: List[str] = None, extra_params: Dict[str, str] = None, mock_file: str = None):
+    """serpapi_search for async tools, searches of one agent turn run concurrently within search limits"""
+    cfg = config.get("configurable", {})
+    params = __serpapi_params(query, engine, cfg, extra_params)
+
+    results = {}
+    if mock_file:
+        with open(mock_file, 'r') as f:
+            results = json.load(f)
+    else:
+        # One search slot per tool call, pages of the search are fetched together within it.
+        # SerpAPI client is blocking, every page runs in a worker thread
+        async with __search_slot(engine):
+            pages = await asyncio.gather(
+                *[asyncio.to_thread(cached_search, page) for page in get_page_params(params)], return_exceptions=True)
+        results = merge_pages(pages, params["num"], engine)
+
+    return __filter_serpapi_results(results, engine, cfg, result_types, mock_file)
+
+def __filter_serpapi_results(results: dict, engine: str, cfg: dict, result_types: List[str] = None, mock_file: str = None):
     filtered_results = {}
 
     search_url = next((v for k, v in results.get("search_metadata", {}).items(
@@ -253,10 +373,47 @@ def serpapi_search(query: str, engine: str, config: RunnableConfig, result_types
             "search_query": search_query,
             "search_results": [results["error"]]
         }
+
+    # Keep structured addresses and coordinates, model re-emits results without them
+    if "place_index" in cfg:
+        cfg["place_index"].add_results(filtered_results)
+
+    # Normalized results are saved by result_id, see save_selected_results
+    if "result_registry" in cfg:
+        cfg["result_registry"].add_results(filtered_results)
         
     return filtered_results
     
-def add_full_address(activities: List[ActivityDetails], base_location: str, location_bias_lat: float, location_bias_lon: float):
+def __resolve_address(activity: ActivityDetails, base_location: str, location_bias_lat: float, location_bias_lon: float,
+                      place_index: PlaceIndex = None):
+    address_normalized = False
+    if activity.location:
+        address_details = get_validated_address(activity.location, base_location)
+        if not address_details and place_index and place_index.fill_coordinates(activity, base_location):
+            # Search result address with GPS coordinates of the same result, place search is not needed
+            return
+        if not address_details:
+            address_details = get_place_address(
+                f"{activity.name}, {activity.location}", location_bias_lat, location_bias_lon)
+        else:
+            address_normalized = True
+    else:
+        address_details = get_place_address(
+            activity.name, location_bias_lat, location_bias_lon)
+                            
+    if address_details:
+        if not address_normalized:
+            validated_address_details = get_validated_address(
+                address_details.formatted_address, base_location)
+            if validated_address_details:
+                address_details = validated_address_details
+
+        activity.full_address = address_details.formatted_address
+        activity.coordinates = {
+            "lat": address_details.latitude, "lon": address_details.longitude}
+
+def add_full_address(activities: List[ActivityDetails], base_location: str, location_bias_lat: float, location_bias_lon: float,
+                     place_index: PlaceIndex = None):
 # Goal find most likely address for activity
 
 # Correct address has priority over Place name 
@@ -273,30 +430,16 @@ def add_full_address(activities: List[ActivityDetails], base_location: str, loca
 # If place search is used, it will be normalized by address validation
 # to reduce dublicates
     
-    for activity in activities:
-        if not activity.full_address:
-            address_normalized = False
-            if activity.location:
-                address_details = get_validated_address(activity.location, base_location)
-                if not address_details:
-                    address_details = get_place_address(
-                        f"{activity.name}, {activity.location}", location_bias_lat, location_bias_lon)
-                else:
-                    address_normalized = True
-            else:
-                address_details = get_place_address(
-                    activity.name, location_bias_lat, location_bias_lon)
-                                    
-            if address_details:
-                if not address_normalized:
-                    validated_address_details = get_validated_address(
-                        address_details.formatted_address, base_location)
-                    if validated_address_details:
-                        address_details = validated_address_details
-
-                activity.full_address = address_details.formatted_address
-                activity.coordinates = {
-                    "lat": address_details.latitude, "lon": address_details.longitude}
+    # Activities are independent, addresses are resolved in parallel. Requests per API are
+    # limited in integrations.geocoding
+    with ThreadPoolExecutor(max_workers=ADDRESS_RESOLUTION_WORKERS) as executor:
+        list(executor.map(
+            lambda activity: __resolve_address(activity, base_location, location_bias_lat, location_bias_lon, place_index),
+            [activity for activity in activities if not activity.full_address]))
+
+    for namespace, stats in get_geocoding_cache_stats().items():
+        logging.info(f"Geocoding cache {namespace}: {stats['hits']} hits, {stats['misses']} misses, "
+                     f"hit rate {stats['hit_rate']:.0%}")
          
 @tool("save_results")
 def save_results(data: ActivitiesList, config: RunnableConfig, store: Annotated[VectorDatabase, InjectedStore()]):
@@ -312,9 +455,12 @@ def save_results(data: ActivitiesList, config: RunnableConfig, store: Annotated[
     """
     cfg = config.get("configurable", {})    
     exact_location = cfg["exact_location"]
+
+    if "place_index" in cfg:
+        cfg["place_index"].fill_addresses(data.activities)
     
     add_full_address(
-        data.activities, cfg["base_location"], exact_location["lat"], exact_location["lon"])
+        data.activities, cfg["base_location"], exact_location["lat"], exact_location["lon"], cfg.get("place_index"))
 
     store.save_activities(activities=data.activities)
     
@@ -327,29 +473,102 @@ def save_results(data: ActivitiesList, config: RunnableConfig, store: Annotated[
         "data_source": data.activities[0].data_source if data.activities else "n/a",
         "records_affected": len(data.activities),
     }
-    
-@tool("vector_store_search")
-def vector_store_search(query: str, config: RunnableConfig, store: Annotated[VectorDatabase, InjectedStore()], limit: int = 5):
+
+@tool("save_selected_results")
+def save_selected_results(data: SelectedResults, config: RunnableConfig, store: Annotated[VectorDatabase, InjectedStore()]):
     """
-        Search and retrieve data from vector store
+        Save search tool results selected by result_id to persistent storage for future use.
+        Results are saved as returned by search tools, set category of every result and description only when needed.
         Parameters:
-            query: query to search for
-            limit: number of results to return
+            data: The result ids with annotations in SelectedResults schema to save
+        Returns:
+            status: "success" if the result was saved successfully
+            message: "Data saved" if the result was saved successfully
+            data_source: "data_source" of the result
+            records_affected: number of records saved
+            unknown_result_ids: result ids not returned by search tools in this run
     """
-    
     cfg = config.get("configurable", {})
+    exact_location = cfg["exact_location"]
+
+    # Without registry (e.g. discovery and itinerary runs) no result id is known
+    registry = cfg.get("result_registry")
+
+    activities, unknown_ids = [], []
+    # Last annotation wins when the same result is selected twice
+    selections = {selection.result_id: selection for selection in data.selections}
+    for result_id, selection in selections.items():
+        activity = registry.get(result_id) if registry else None
+        if not activity:
+            unknown_ids.append(result_id)
+            continue
+
+        activity.category = selection.category
+        activity.description = selection.description or activity.description
+        activities.append(activity)
+
+    if "place_index" in cfg:
+        cfg["place_index"].fill_addresses(activities)
+
+    add_full_address(
+        activities, cfg["base_location"], exact_location["lat"], exact_location["lon"], cfg.get("place_index"))
+
+    store.save_activities(activities=activities)
+
+    if "affected_records" in cfg:
+        cfg["affected_records"].extend([activity.id for activity in activities])
+
+    return {
+        "status": "success",
+        "message": "Data saved",
+        "data_source": activities[0].data_source if activities else "n/a",
+        "records_affected": len(activities),
+        "unknown_result_ids": unknown_ids,
+    }
     
+def __search_filters(cfg, categories, data_sources, updated_within_days, starts_after, starts_before):
+    geo_filter = None
     if cfg["search_radius"] > 0:
         geo_filter = {
             "lat": cfg["exact_location"]["lat"],
             "lon": cfg["exact_location"]["lon"],
             "radius": cfg["search_radius"]
         }
-        activities = store.similarity_search(query, limit, geo_filter)
-    else:    
-        activities = store.similarity_search(query, limit)
-        
+
+    updated_after = None
+    if updated_within_days:
+        updated_after = int(datetime.now().timestamp()) - updated_within_days * 24 * 60 * 60
+
+    return {
+        "geo_filter": geo_filter,
+        "categories": categories,
+        "data_sources": data_sources,
+        "updated_after": updated_after,
+        "starts_after": parse_timestamp(starts_after),
+        "starts_before": parse_timestamp(starts_before),
+    }
+
+@tool("vector_store_search")
+def vector_store_search(query: str, config: RunnableConfig, store: Annotated[VectorDatabase, InjectedStore()], limit: int = 5,
+                        categories: Optional[List[str]] = None, data_sources: Optional[List[str]] = None,
+                        updated_within_days: Optional[int] = None, starts_after: Optional[str] = None, starts_before: Optional[str] = None):
+    """
+        Search and retrieve data from vector store
+        Parameters:
+            query: query to search for
+            limit: number of results to return
+            categories: return only these categories, e.g. ["Food & Drink Experiences", "Live Entertainment"]
+            data_sources: return only results from these sources, e.g. ["google_events", "yelp"]
+            updated_within_days: return only results collected or updated in the last N days
+            starts_after: return only time-bound activities starting at or after this local date/time, e.g. "2025-04-12 18:00"
+            starts_before: return only time-bound activities starting at or before this local date/time
+    """
+    
+    cfg = config.get("configurable", {})
     
+    activities = store.similarity_search(query, limit, **__search_filters(
+        cfg, categories, data_sources, updated_within_days, starts_after, starts_before))
+        
     if "affected_records" in cfg:
         cfg["affected_records"].extend([activity.id for activity in activities])
     
@@ -359,8 +578,42 @@ def vector_store_search(query: str, config: RunnableConfig, store: Annotated[Vec
             "search_type": "vector_store",
             "search_url": "https://qdrant.io",
             "search_query": query,
-            "search_results": [activity.model_dump() for activity in activities]
+            "search_results": [activity.model_dump(exclude=STORAGE_FIELDS) for activity in activities]
+        }
+    }
+
+@tool("vector_store_multi_search")
+def vector_store_multi_search(queries: List[str], config: RunnableConfig, store: Annotated[VectorDatabase, InjectedStore()], limit: int = 5,
+                              categories: Optional[List[str]] = None, data_sources: Optional[List[str]] = None,
+                              updated_within_days: Optional[int] = None, starts_after: Optional[str] = None, starts_before: Optional[str] = None):
+    """
+        Run several vector store searches at once, e.g. one query per experience category.
+        Prefer it over multiple vector_store_search calls.
+        Parameters:
+            queries: queries to search for
+            limit: number of results to return for each query
+            categories, data_sources, updated_within_days, starts_after, starts_before: 
+                same filters as in vector_store_search, applied to every query
+    """
+
+    cfg = config.get("configurable", {})
+
+    results = store.similarity_search_batch(queries, limit, **__search_filters(
+        cfg, categories, data_sources, updated_within_days, starts_after, starts_before))
+
+    if "affected_records" in cfg:
+        cfg["affected_records"].extend(
+            [activity.id for activities in results for activity in activities])
+
+    return {
+        f"similarity_search: {query}": {
+            "data_source": "qdrant",
+            "search_type": "vector_store",
+            "search_url": "https://qdrant.io",
+            "search_query": query,
+            "search_results": [activity.model_dump(exclude=STORAGE_FIELDS) for activity in activities]
         }
+        for query, activities in zip(queries, results)
     }
 
 @tool("vector_store_scroll")
@@ -389,7 +642,7 @@ def vector_store_scroll(config: RunnableConfig, store: Annotated[VectorDatabase,
             "search_type": "vector_store",
             "search_url": "https://qdrant.io",
             "search_query": f"Scroll from {offset}",
-            "search_results": [activity.model_dump() for activity in activities]
+            "search_results": [activity.model_dump(exclude=STORAGE_FIELDS) for activity in activities]
         }
     }
 
@@ -413,7 +666,7 @@ def vector_store_by_id(ids: List[str], config: RunnableConfig, store: Annotated[
             "search_type": "vector_store",
             "search_url": "https://qdrant.io",
             "search_query": str(ids),
-            "search_results": [activity.model_dump() for activity in activities]
+            "search_results": [activity.model_dump(exclude=STORAGE_FIELDS) for activity in activities]
         }
     }
     
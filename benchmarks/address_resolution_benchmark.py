@@ -0,0 +1,107 @@
+"""Wall-clock time of add_full_address vs batch size, sequential and concurrent.
+
+Google Address Validation and Places APIs are replaced by a local fake server answering
+after fixed latency. Geocoding cache starts empty for every run, so every lookup is a request.
+
+    python -m benchmarks.address_resolution_benchmark [latency_ms]
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import agents.tools as tools
+import integrations.geocoding as geocoding
+from agents.activities import ActivityDetails
+
+BATCH_SIZES = [5, 10, 20, 40]
+WORKERS = [1, tools.ADDRESS_RESOLUTION_WORKERS]
+
+
+class FakeGoogleApiServer(ThreadingHTTPServer):
+    # Default listen backlog of 5 drops connections of concurrent clients
+    request_queue_size = 128
+
+
+class FakeGoogleApiHandler(BaseHTTPRequestHandler):
+    latency = 0.1
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(self.latency)
+
+        if self.path.startswith("/validate"):
+            line = payload["address"]["addressLines"][0]
+            # Street addresses validate, venue names and areas don't
+            granularity = "PREMISE" if line[0].isdigit() else "ROUTE"
+            result = {"result": {
+                "verdict": {"validationGranularity": granularity},
+                "address": {"formattedAddress": f"{line}, Dallas, TX 75201, USA"},
+                "geocode": {"location": {"latitude": 32.78, "longitude": -96.8}},
+            }}
+        else:
+            number = abs(hash(payload["textQuery"])) % 9000 + 100
+            result = {"places": [{
+                "displayName": {"text": payload["textQuery"]},
+                "formattedAddress": f"{number} Main Street",
+                "location": {"latitude": 32.78, "longitude": -96.8},
+            }]}
+
+        body = json.dumps(result).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_activities(count):
+    # Mix of the three resolution paths: address, name with area, name only
+    locations = ["{i} Elm Street", "Deep Ellum", ""]
+    return [
+        ActivityDetails(name=f"Venue {i}", location=locations[i % 3].format(i=i + 1))
+        for i in range(count)
+    ]
+
+
+def main():
+    FakeGoogleApiHandler.latency = (int(sys.argv[1]) if len(sys.argv) > 1 else 100) / 1000
+
+    server = FakeGoogleApiServer(("127.0.0.1", 0), FakeGoogleApiHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    geocoding.ADDRESS_VALIDATION_URL = f"{base_url}/validate"
+    geocoding.PLACES_SEARCH_TEXT_URL = f"{base_url}/places"
+
+    print(f"Fake API latency {FakeGoogleApiHandler.latency * 1000:.0f} ms")
+    print(f"{'batch':>6} " + " ".join(f"{f'{workers} workers, s':>16}" for workers in WORKERS) + f" {'speedup':>8}")
+
+    for batch_size in BATCH_SIZES:
+        timings = []
+        for workers in WORKERS:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                os.environ["SIERGE_CACHE_DIR"] = cache_dir
+                geocoding._geocoding_cache = None
+                tools.ADDRESS_RESOLUTION_WORKERS = workers
+
+                activities = make_activities(batch_size)
+                start = time.perf_counter()
+                tools.add_full_address(activities, "Dallas", 32.7767, -96.797)
+                timings.append(time.perf_counter() - start)
+
+                assert all(activity.full_address for activity in activities)
+
+        print(f"{batch_size:>6} " + " ".join(f"{timing:>16.2f}" for timing in timings) +
+              f" {timings[0] / timings[-1]:>7.1f}x")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
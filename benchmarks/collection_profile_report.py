@@ -0,0 +1,92 @@
+"""Recall vs latency of collection tuning profiles on a synthetic collection.
+
+Every profile gets its own throwaway collection with the same clustered random vectors.
+Ground truth is exact (brute force) search, recall@k is measured for the profile search params.
+
+Needs server Qdrant (QDRANT_URL / QDRANT_API_KEY): embedded Qdrant has no HNSW and no quantization,
+so with QDRANT_MODE=local every profile degrades to the same brute-force baseline.
+
+    python -m benchmarks.collection_profile_report [points] [dimension]
+"""
+import statistics
+import sys
+import time
+import uuid
+
+import numpy as np
+from qdrant_client import models
+
+from integrations.collection_profiles import (
+    COLLECTION_PROFILES, get_hnsw_config, get_quantization_config, get_search_params)
+from integrations.vector_database import create_qdrant_client
+
+QUERIES = 100
+LIMIT = 10
+CLUSTERS = 50
+
+
+def make_vectors(count, dimension, rng):
+    centers = rng.normal(size=(CLUSTERS, dimension))
+    vectors = centers[rng.integers(0, CLUSTERS, count)] + rng.normal(scale=0.6, size=(count, dimension))
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def wait_for_indexing(client, collection_name, timeout=600):
+    start = time.time()
+    while time.time() - start < timeout:
+        if client.get_collection(collection_name).status == models.CollectionStatus.GREEN:
+            return
+        time.sleep(1)
+
+
+def main():
+    points = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    dimension = int(sys.argv[2]) if len(sys.argv) > 2 else 384
+
+    rng = np.random.default_rng(42)
+    vectors = make_vectors(points, dimension, rng)
+    queries = make_vectors(QUERIES, dimension, rng)
+
+    client = create_qdrant_client()
+    print(f"{points} points, {dimension} dimensions, {QUERIES} queries, recall@{LIMIT}")
+    print(f"{'profile':>10} {'recall':>8} {'p50 ms':>8} {'p95 ms':>8} {'RAM vectors MB':>15}")
+
+    for name, profile in COLLECTION_PROFILES.items():
+        collection_name = f"profile-report-{name}-{uuid.uuid4().hex[:6]}"
+        client.create_collection(
+            collection_name=collection_name,
+            vectors_config=models.VectorParams(
+                size=dimension, distance=models.Distance.COSINE, on_disk=profile.on_disk_vectors),
+            hnsw_config=get_hnsw_config(profile),
+            quantization_config=get_quantization_config(profile),
+            on_disk_payload=profile.on_disk_payload,
+        )
+        try:
+            client.upload_collection(collection_name, vectors=vectors, ids=list(range(points)), batch_size=512)
+            wait_for_indexing(client, collection_name)
+
+            search_params = get_search_params(profile)
+            recalls = []
+            latencies = []
+            for query in queries:
+                exact = client.query_points(collection_name, query=query.tolist(), limit=LIMIT,
+                                            search_params=models.SearchParams(exact=True)).points
+                start = time.perf_counter()
+                approximate = client.query_points(collection_name, query=query.tolist(), limit=LIMIT,
+                                                  search_params=search_params).points
+                latencies.append((time.perf_counter() - start) * 1000)
+
+                expected = {point.id for point in exact}
+                recalls.append(len(expected & {point.id for point in approximate}) / LIMIT)
+
+            # Estimate of RAM used by vectors used for search
+            bytes_per_vector = dimension if profile.quantization else (0 if profile.on_disk_vectors else dimension * 4)
+            latencies.sort()
+            print(f"{name:>10} {statistics.mean(recalls):>8.3f} {statistics.median(latencies):>8.2f} "
+                  f"{latencies[int(len(latencies) * 0.95) - 1]:>8.2f} {points * bytes_per_vector / 2**20:>15.1f}")
+        finally:
+            client.delete_collection(collection_name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Latency of VectorDatabase.save_activities against embedding batch size.
+
+Uses a stubbed embedder which sleeps per request (network round trip) and per text,
+and an in-memory Qdrant, so no external services are called.
+
+    python -m benchmarks.embedding_batch_benchmark
+"""
+import os
+import tempfile
+import time
+from unittest import mock
+
+import integrations.embeddings as embeddings
+import integrations.vector_database as vdb
+from agents.activities import ActivityDetails
+
+ROUND_TRIP_SECONDS = 0.08
+PER_TEXT_SECONDS = 0.002
+DIMENSION = 1536
+
+
+class StubEmbeddings:
+    def __init__(self, **kwargs):
+        self.requests = 0
+
+    def embed_documents(self, texts):
+        self.requests += 1
+        time.sleep(ROUND_TRIP_SECONDS + PER_TEXT_SECONDS * len(texts))
+        return [[float(len(text) % 7 + 1)] * DIMENSION for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def make_activities(count):
+    return [
+        ActivityDetails(
+            name=f"Venue {i}",
+            full_address=f"{i} Main Street, Dallas, TX 75201, USA",
+            description="Live music, local craft beer and a large patio",
+            category="Food & Drink Experiences",
+        )
+        for i in range(count)
+    ]
+
+
+def make_store(embedding_batch_size):
+    os.environ.setdefault("UPLOADCARE_PUBLIC_KEY", "benchmark")
+    os.environ.setdefault("UPLOADCARE_SECRET_KEY", "benchmark")
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    # Fresh embedding cache, otherwise every run after the first one is served from cache
+    os.environ["SIERGE_CACHE_DIR"] = tempfile.mkdtemp()
+
+    with mock.patch.object(embeddings, "OpenAIEmbeddings", StubEmbeddings), \
+            mock.patch.object(vdb, "Uploadcare", mock.MagicMock()):
+        return vdb.VectorDatabase("benchmark", embedding_batch_size=embedding_batch_size,
+                                  embeddings_backend="openai", qdrant_mode=vdb.QDRANT_LOCAL_MODE)
+
+
+def main():
+    print(f"{'activities':>10} {'batch size':>10} {'requests':>9} {'seconds':>8}")
+    for count in (5, 20, 100):
+        for batch_size in (1, 8, 32, vdb.EMBEDDING_BATCH_SIZE):
+            store = make_store(batch_size)
+            start = time.perf_counter()
+            store.save_activities(make_activities(count))
+            elapsed = time.perf_counter() - start
+            print(f"{count:>10} {batch_size:>10} {store.embeddings.embeddings.requests:>9} {elapsed:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Micro-benchmark of VectorDatabase operations across Qdrant transports.
+
+Embedded modes always run. Remote HTTP and gRPC run when QDRANT_URL / QDRANT_API_KEY are set,
+a throwaway collection is created there and dropped afterwards.
+Hashing embeddings keep embedding cost out of the numbers.
+
+    python -m benchmarks.qdrant_transport_benchmark
+"""
+import os
+import statistics
+import tempfile
+import time
+import uuid
+
+from agents.activities import ActivityDetails
+from integrations.vector_database import (
+    QDRANT_GRPC_MODE, QDRANT_HTTP_MODE, QDRANT_LOCAL_MODE, VectorDatabase)
+
+ACTIVITIES = 200
+SAVE_BATCH = 20
+REPEATS = 30
+
+
+def make_activities(count, offset=0):
+    return [
+        ActivityDetails(
+            name=f"Venue {offset + i}",
+            full_address=f"{offset + i} Main Street, Dallas, TX 75201, USA",
+            description=["Live music and craft beer", "Modern art museum", "Family friendly park"][i % 3],
+            category="Other",
+        )
+        for i in range(count)
+    ]
+
+
+def timed(fn, repeats):
+    samples = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def run(label, store):
+    ids = []
+    for offset in range(0, ACTIVITIES, SAVE_BATCH):
+        activities = make_activities(SAVE_BATCH, offset)
+        store.save_activities(activities)
+        ids.extend(activity.id for activity in activities)
+
+    results = {
+        "save_activities": timed(lambda i: store.save_activities(make_activities(SAVE_BATCH, ACTIVITIES + i * SAVE_BATCH)), REPEATS),
+        "similarity_search": timed(lambda i: store.similarity_search(f"live music {i}", limit=5), REPEATS),
+        "get_by_ids": timed(lambda i: store.get_by_ids(ids[i:i + 10]), REPEATS),
+    }
+    for operation, (median, worst) in results.items():
+        print(f"{label:>14} {operation:>18} {median:>10.2f} {worst:>10.2f}")
+
+
+def main():
+    os.environ.setdefault("UPLOADCARE_PUBLIC_KEY", "benchmark")
+    os.environ.setdefault("UPLOADCARE_SECRET_KEY", "benchmark")
+    os.environ["SIERGE_CACHE_DIR"] = tempfile.mkdtemp()
+
+    print(f"{'transport':>14} {'operation':>18} {'median ms':>10} {'max ms':>10}")
+
+    run("local :memory:", VectorDatabase("benchmark", embeddings_backend="hashing",
+                                         qdrant_mode=QDRANT_LOCAL_MODE, qdrant_path=":memory:"))
+    run("local path", VectorDatabase("benchmark", embeddings_backend="hashing",
+                                     qdrant_mode=QDRANT_LOCAL_MODE, qdrant_path=tempfile.mkdtemp()))
+
+    if not os.getenv("QDRANT_URL"):
+        print("QDRANT_URL is not set, skipping remote transports")
+        return
+
+    for mode in [QDRANT_HTTP_MODE, QDRANT_GRPC_MODE]:
+        collection_name = f"benchmark-{uuid.uuid4().hex[:8]}"
+        store = VectorDatabase(collection_name, embeddings_backend="hashing", qdrant_mode=mode)
+        try:
+            run(f"remote {mode}", store)
+        finally:
+            store.client.delete_collection(collection_name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Quality and time of local waypoint ordering against exact optimum on random city itineraries.
+
+Routes API is not involved: orderings are compared by straight-line route length, optimum is
+found by brute force over all orders of intermediate places.
+
+    python -m benchmarks.route_optimizer_benchmark [itineraries]
+"""
+import itertools
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from integrations.route_optimizer import haversine_matrix, nearest_neighbour_order, optimize_route, route_distance
+
+PLACES = [4, 6, 8, 9]
+
+
+def main():
+    itineraries = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    rng = np.random.default_rng(42)
+
+    print(f"{itineraries} random itineraries per size, route length relative to optimum")
+    print(f"{'places':>6} {'original':>9} {'nearest':>9} {'optimized':>10} {'worst':>7} {'ms':>7}")
+
+    for places in PLACES:
+        original, nearest, optimized, timings = [], [], [], []
+        for _ in range(itineraries):
+            latitudes = 32.78 + rng.normal(scale=0.05, size=places)
+            longitudes = -96.8 + rng.normal(scale=0.05, size=places)
+            distances = haversine_matrix(latitudes, longitudes)
+
+            last = places - 1
+            optimum = min(route_distance(distances, [0, *middle, last])
+                          for middle in itertools.permutations(range(1, last)))
+
+            start = time.perf_counter()
+            route = optimize_route(latitudes, longitudes)
+            timings.append((time.perf_counter() - start) * 1000)
+
+            original.append(route_distance(distances, range(places)) / optimum)
+            nearest.append(route_distance(distances, nearest_neighbour_order(distances)) / optimum)
+            optimized.append(route.distance_meters / optimum)
+
+        print(f"{places:>6} {statistics.mean(original):>9.3f} {statistics.mean(nearest):>9.3f} "
+              f"{statistics.mean(optimized):>10.3f} {max(optimized):>7.3f} {statistics.mean(timings):>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Agent diagrams rendered once per graph topology and served from disk cache.
+
+Rendering Mermaid to PNG with pyppeteer starts headless Chromium, so PNG is cached by hash of
+Mermaid source (graph structure and node styles). Pre-render at build time to warm the cache:
+
+    python -m diagram_cache
+"""
+import hashlib
+import logging
+import os
+
+from dotenv import load_dotenv
+from langchain_core.runnables.graph import Graph, MermaidDrawMethod, NodeStyles
+from langchain_core.runnables.graph_mermaid import draw_mermaid_png
+
+from integrations.disk_cache import DiskCache, get_cache_path
+
+DIAGRAM_NAMESPACE = "mermaid:png"
+
+DIAGRAM_NODE_STYLES = NodeStyles(
+    default='fill:#ff4b4b,line-height:1.2,fill-opacity:0.5, stroke:#ff4b4b',
+    first='fill-opacity:0',
+    last='fill-opacity:0',
+)
+
+_disk_cache = None
+
+
+def get_diagram_cache() -> DiskCache:
+    global _disk_cache
+    if _disk_cache is None:
+        _disk_cache = DiskCache(get_cache_path("diagrams.sqlite"))
+    return _disk_cache
+
+
+def get_diagram_key(mermaid_syntax: str, draw_method: MermaidDrawMethod) -> str:
+    return hashlib.sha256(f"{draw_method.value}\n{mermaid_syntax}".encode("utf-8")).hexdigest()
+
+
+def get_diagram_png(graph: Graph, node_styles: NodeStyles = DIAGRAM_NODE_STYLES,
+                    draw_method: MermaidDrawMethod = MermaidDrawMethod.PYPPETEER) -> bytes:
+    """PNG of graph from cache, rendered only when topology or styles changed"""
+    # Mermaid source is cheap to build and fully describes the picture
+    mermaid_syntax = graph.draw_mermaid(node_colors=node_styles)
+    key = get_diagram_key(mermaid_syntax, draw_method)
+
+    cache = get_diagram_cache()
+    png = cache.get(DIAGRAM_NAMESPACE, key)
+    if png is None:
+        logging.info(f"Rendering agent diagram {key[:12]}")
+        png = draw_mermaid_png(mermaid_syntax, draw_method=draw_method)
+        cache.set(DIAGRAM_NAMESPACE, key, png)
+
+    return png
+
+
+def prerender_diagrams():
+    """Render diagrams of app agents into the cache, no vector store or model calls needed"""
+    import agents.tools as tools_set
+    from agents.data_collection_agent import DataCollectionAgent
+    from streamlit_resources import COLLECTION_TOOLS
+
+    # Agent creates model client, it's never called here. Placeholder key lets the graph be built
+    # at build time without secrets
+    placeholder_key = "OPENAI_API_KEY" not in os.environ
+    if placeholder_key:
+        os.environ["OPENAI_API_KEY"] = "diagram-prerender"
+    try:
+        settings = {"model": "gpt-4o-mini", "data_collection_prompt": ""}
+        agent = DataCollectionAgent(None, [getattr(tools_set, name) for name in COLLECTION_TOOLS], settings)
+        agent.setup()
+    finally:
+        if placeholder_key:
+            del os.environ["OPENAI_API_KEY"]
+
+    get_diagram_png(agent.runnable.get_graph())
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    prerender_diagrams()
+    print(f"Agent diagrams cached in {get_diagram_cache().path}")
@@ -0,0 +1,70 @@
+import os
+from typing import NamedTuple, Optional
+
+from qdrant_client import models
+
+
+class CollectionProfile(NamedTuple):
+    """Index, storage and search settings of a city collection"""
+    hnsw_m: int
+    hnsw_ef_construct: int
+    # int8 scalar quantization, quantized vectors are kept in RAM, originals are used for rescoring
+    quantization: bool
+    on_disk_vectors: bool
+    on_disk_payload: bool
+    # None means Qdrant picks ef = limit
+    search_hnsw_ef: Optional[int]
+    oversampling: Optional[float] = None
+
+
+COLLECTION_PROFILES = {
+    # Qdrant defaults, everything in RAM
+    "default": CollectionProfile(hnsw_m=16, hnsw_ef_construct=100, quantization=False,
+                                 on_disk_vectors=False, on_disk_payload=False, search_hnsw_ef=None),
+    # Larger graph and search beam, when recall matters more than memory
+    "accurate": CollectionProfile(hnsw_m=32, hnsw_ef_construct=256, quantization=False,
+                                  on_disk_vectors=False, on_disk_payload=False, search_hnsw_ef=256),
+    # int8 vectors in RAM, float32 originals on disk for rescoring
+    "balanced": CollectionProfile(hnsw_m=16, hnsw_ef_construct=128, quantization=True,
+                                  on_disk_vectors=True, on_disk_payload=False, search_hnsw_ef=128, oversampling=2.0),
+    # Smallest RAM footprint for big collections
+    "compact": CollectionProfile(hnsw_m=8, hnsw_ef_construct=64, quantization=True,
+                                 on_disk_vectors=True, on_disk_payload=True, search_hnsw_ef=64, oversampling=1.5),
+}
+
+
+def get_collection_profile(name: str = None) -> CollectionProfile:
+    """Profile given explicitly or by QDRANT_COLLECTION_PROFILE environment variable"""
+    name = name or os.getenv("QDRANT_COLLECTION_PROFILE", "default")
+    if name not in COLLECTION_PROFILES:
+        raise ValueError(f"Unknown collection profile '{name}', expected one of: {', '.join(COLLECTION_PROFILES)}")
+
+    return COLLECTION_PROFILES[name]
+
+
+def get_hnsw_config(profile: CollectionProfile) -> models.HnswConfigDiff:
+    return models.HnswConfigDiff(m=profile.hnsw_m, ef_construct=profile.hnsw_ef_construct)
+
+
+def get_quantization_config(profile: CollectionProfile) -> Optional[models.ScalarQuantization]:
+    if not profile.quantization:
+        return None
+
+    return models.ScalarQuantization(
+        scalar=models.ScalarQuantizationConfig(
+            type=models.ScalarType.INT8,
+            quantile=0.99,
+            always_ram=True,
+        )
+    )
+
+
+def get_search_params(profile: CollectionProfile) -> Optional[models.SearchParams]:
+    if profile.search_hnsw_ef is None and not profile.quantization:
+        return None
+
+    quantization = None
+    if profile.quantization:
+        quantization = models.QuantizationSearchParams(rescore=True, oversampling=profile.oversampling)
+
+    return models.SearchParams(hnsw_ef=profile.search_hnsw_ef, quantization=quantization)
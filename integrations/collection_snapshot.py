@@ -0,0 +1,281 @@
+"""Streaming export and import of a city collection as JSONL or Parquet snapshot.
+
+Memory use doesn't depend on collection size: points are read with VectorDatabase.iter_collection
+and written page by page (one Parquet row group per page), import reads and upserts chunk by chunk.
+
+    python -m integrations.collection_snapshot export "Dallas, Texas, United States" dallas.parquet
+    python -m integrations.collection_snapshot import "Dallas, Texas, United States" dallas.parquet
+"""
+import argparse
+import ast
+import json
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from qdrant_client import models
+
+from agents.activities import ActivityDetails, parse_timestamp
+from integrations.vector_database import QDRANT_LOCAL_MODE, VectorDatabase
+
+EXPORT_PAGE_SIZE = 1000
+IMPORT_CHUNK_SIZE = 256
+# Parallel upsert requests in flight during import
+IMPORT_WORKERS = 4
+
+# Payload fields which are not plain strings
+ARROW_FIELD_TYPES = {
+    "created_at": "int64",
+    "updated_at": "int64",
+    "start_timestamp": "int64",
+    "similarity_score": "float64",
+    "coordinates": "coordinates",
+    "accessibility_features": "string_list",
+}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("pyarrow package is required for Parquet snapshots: pip install pyarrow")
+
+    return pyarrow
+
+
+def get_arrow_schema(with_vectors: bool = True):
+    pa = _import_pyarrow()
+    types = {
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "coordinates": pa.struct([("lat", pa.float64()), ("lon", pa.float64())]),
+        "string_list": pa.list_(pa.string()),
+    }
+
+    fields = [pa.field(name, types.get(ARROW_FIELD_TYPES.get(name), pa.string()))
+              for name in ActivityDetails.model_fields]
+    if with_vectors:
+        fields.append(pa.field("vector", pa.list_(pa.float32())))
+
+    return pa.schema(fields)
+
+
+def _iter_pages(store: VectorDatabase, with_vectors: bool, page_size: int) -> Iterator[list]:
+    page = []
+    for item in store.iter_collection(page_size=page_size, with_vectors=with_vectors):
+        page.append(item)
+        if len(page) >= page_size:
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+def export_jsonl(store: VectorDatabase, path: str, with_vectors: bool = True, page_size: int = EXPORT_PAGE_SIZE) -> int:
+    """One {"id", "payload", "vector"} object per line, returns number of exported points"""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for page in _iter_pages(store, with_vectors, page_size):
+            for item in page:
+                activity, vector = item if with_vectors else (item, None)
+                record = {"id": str(activity.id), "payload": activity.model_dump(exclude={"id"})}
+                if with_vectors:
+                    record["vector"] = vector
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                count += 1
+
+    return count
+
+
+def export_parquet(store: VectorDatabase, path: str, with_vectors: bool = True, page_size: int = EXPORT_PAGE_SIZE) -> int:
+    """Columnar export, activity fields as columns plus vector column, returns number of exported points"""
+    pa = _import_pyarrow()
+    schema = get_arrow_schema(with_vectors)
+
+    count = 0
+    with pa.parquet.ParquetWriter(path, schema, compression="zstd") as writer:
+        for page in _iter_pages(store, with_vectors, page_size):
+            rows = []
+            for item in page:
+                activity, vector = item if with_vectors else (item, None)
+                row = activity.model_dump()
+                row["id"] = str(activity.id)
+                if with_vectors:
+                    row["vector"] = vector
+                rows.append(row)
+
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            count += len(rows)
+
+    return count
+
+
+SnapshotRecord = Tuple[ActivityDetails, Optional[List[float]]]
+
+
+def _chunks(records, chunk_size: int) -> Iterator[List[SnapshotRecord]]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _read_jsonl(path: str) -> Iterator[SnapshotRecord]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            activity = ActivityDetails(**record.get("payload", {}))
+            activity.id = record.get("id")
+            yield activity, record.get("vector")
+
+
+def _read_parquet(path: str, chunk_size: int) -> Iterator[SnapshotRecord]:
+    pa = _import_pyarrow()
+    parquet_file = pa.parquet.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=chunk_size):
+        for row in batch.to_pylist():
+            vector = row.pop("vector", None)
+            yield ActivityDetails(**row), vector
+
+
+def _read_vector_store_dump(path: str) -> Iterator[SnapshotRecord]:
+    """LangChain InMemoryVectorStore dump, like mockups/vector_store.json: text is repr of activity dict"""
+    with open(path, "r", encoding="utf-8") as f:
+        documents = json.load(f)
+
+    for document in documents.values():
+        try:
+            fields = ast.literal_eval(document["text"])
+        except (ValueError, SyntaxError):
+            fields = dict(document.get("metadata", {}))
+        yield ActivityDetails(**fields), document.get("vector")
+
+
+def read_snapshot(path: str, chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[SnapshotRecord]:
+    if path.endswith(".parquet"):
+        return _read_parquet(path, chunk_size)
+    if path.endswith(".jsonl"):
+        return _read_jsonl(path)
+    return _read_vector_store_dump(path)
+
+
+def _is_uuid(value) -> bool:
+    try:
+        uuid.UUID(str(value))
+        return True
+    except ValueError:
+        return False
+
+
+def _prepare_points(store: VectorDatabase, chunk: List[SnapshotRecord]) -> List[models.PointStruct]:
+    current_timestamp = int(datetime.now().timestamp())
+    vector_size = store.embedding_backend.size
+
+    activities = []
+    vectors = []
+    for activity, vector in chunk:
+        # Ids of legacy dumps are names, Qdrant accepts only UUIDs and integers
+        if not _is_uuid(activity.id):
+            activity.id = store.get_activity_uuid(activity)
+        activity.created_at = activity.created_at or current_timestamp
+        activity.updated_at = activity.updated_at or current_timestamp
+        activity.similarity_score = None
+        if activity.start_timestamp is None:
+            activity.start_timestamp = parse_timestamp(activity.start_time)
+
+        if vector is not None and len(vector) != vector_size:
+            logging.warning(
+                f"Snapshot vector size {len(vector)} doesn't match collection size {vector_size}, re-embedding {activity.id}")
+            vector = None
+        if vector is None:
+            # Vector is built from canonical text below. Precomputed vectors of legacy dumps
+            # have no fingerprint, so they are re-embedded on next save
+            activity.embedding_fingerprint = store.get_embedding_fingerprint(activity)
+
+        activities.append(activity)
+        vectors.append(vector)
+
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
+    if missing:
+        embedded = store.embed_texts([activities[i].get_embedding_text() for i in missing])
+        for i, vector in zip(missing, embedded):
+            vectors[i] = vector
+
+    return [
+        models.PointStruct(id=str(activity.id), vector=vector, payload=activity.model_dump())
+        for activity, vector in zip(activities, vectors)
+    ]
+
+
+def import_snapshot(store: VectorDatabase, path: str, chunk_size: int = IMPORT_CHUNK_SIZE,
+                    workers: int = IMPORT_WORKERS, wait: bool = False) -> int:
+    """Bulk load activities with precomputed vectors, missing vectors are computed with batched embedder.
+
+Chunks are upserted in parallel, with wait=False Qdrant acknowledges before indexing.
+Images are not re-uploaded and addresses are not re-validated, so there are no external calls
+except embeddings for records without vector. Returns number of imported points.
+    """
+    if store.qdrant_mode == QDRANT_LOCAL_MODE:
+        # Embedded Qdrant is not safe for concurrent writes, and there is no network latency to overlap
+        workers = 1
+
+    count = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        for chunk in _chunks(read_snapshot(path, chunk_size), chunk_size):
+            points = _prepare_points(store, chunk)
+            pending.append(executor.submit(
+                store.client.upsert, collection_name=store.collection_name, points=points, wait=wait))
+            count += len(points)
+
+            # Bound number of chunks held in memory
+            if len(pending) >= workers * 2:
+                pending.pop(0).result()
+
+        for future in pending:
+            future.result()
+
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or import city collection snapshot")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Export collection to .jsonl or .parquet file")
+    export_parser.add_argument("collection_name")
+    export_parser.add_argument("path")
+    export_parser.add_argument("--no-vectors", action="store_true", help="Export payloads only")
+
+    import_parser = subparsers.add_parser(
+        "import", help="Import .jsonl, .parquet or vector store .json dump into collection")
+    import_parser.add_argument("collection_name")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--workers", type=int, default=IMPORT_WORKERS)
+
+    args = parser.parse_args()
+    load_dotenv()
+
+    store = VectorDatabase(collection_name=args.collection_name)
+    if args.command == "export":
+        export = export_parquet if args.path.endswith(".parquet") else export_jsonl
+        count = export(store, args.path, with_vectors=not args.no_vectors)
+        print(f"Exported {count} points from {args.collection_name} to {args.path}")
+    else:
+        count = import_snapshot(store, args.path, workers=args.workers)
+        print(f"Imported {count} points from {args.path} to {args.collection_name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+# Every cache lives in this directory unless explicit path is given
+CACHE_DIR_ENV = "SIERGE_CACHE_DIR"
+DEFAULT_CACHE_DIR = ".cache"
+
+# Check total size every N writes, SUM over the table is not free
+EVICTION_CHECK_INTERVAL = 64
+# Evict down to this fraction of max_bytes to avoid evicting on every write
+EVICTION_TARGET_RATIO = 0.9
+
+
+def get_cache_path(file_name: str) -> str:
+    cache_dir = os.getenv(CACHE_DIR_ENV, DEFAULT_CACHE_DIR)
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, file_name)
+
+
+class DiskCache:
+    """SQLite backed key-value store for bytes, safe to share between threads and processes.
+
+Entries are grouped by namespace, can expire after ttl seconds and
+least recently used entries are evicted when total size exceeds max_bytes.
+    """
+
+    def __init__(self, path: str, max_bytes: Optional[int] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.counters = Counter()
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        connection = self._connection()
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value BLOB,
+                size INTEGER NOT NULL,
+                expires_at REAL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )""")
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections can't be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+
+        return connection
+
+    def get(self, namespace: str, key: str, default=None):
+        return self.get_many(namespace, [key]).get(key, default)
+
+    def get_many(self, namespace: str, keys: Iterable[str]) -> Dict[str, bytes]:
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
+        now = time.time()
+        connection = self._connection()
+        found = {}
+        # Stay below SQLite host parameters limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = connection.execute(
+                f"SELECT key, value, expires_at FROM cache WHERE namespace = ? AND key IN ({placeholders})",
+                [namespace, *chunk]).fetchall()
+            for key, value, expires_at in rows:
+                if expires_at is None or expires_at > now:
+                    found[key] = value
+
+        if found:
+            try:
+                connection.executemany(
+                    "UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                    [(now, namespace, key) for key in found])
+            except sqlite3.OperationalError as e:
+                # Access time is used for eviction only, not worth failing the read
+                logging.warning(f"Cache access time was not updated (DiskCache): {e}")
+
+        with self._lock:
+            self.counters[f"{namespace}.hits"] += len(found)
+            self.counters[f"{namespace}.misses"] += len(keys) - len(found)
+
+        return found
+
+    def set(self, namespace: str, key: str, value: bytes, ttl: Optional[float] = None):
+        self.set_many(namespace, {key: value}, ttl)
+
+    def set_many(self, namespace: str, items: Dict[str, bytes], ttl: Optional[float] = None):
+        if not items:
+            return
+
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        self._connection().executemany(
+            "INSERT OR REPLACE INTO cache (namespace, key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+            [(namespace, key, value, len(value or b""), expires_at, now) for key, value in items.items()])
+
+        with self._lock:
+            self._writes += len(items)
+            check_size = self._writes >= EVICTION_CHECK_INTERVAL
+            if check_size:
+                self._writes = 0
+
+        if check_size:
+            self.evict()
+
+    def delete(self, namespace: str, key: str):
+        self._connection().execute(
+            "DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def clear(self, namespace: Optional[str] = None):
+        if namespace is None:
+            self._connection().execute("DELETE FROM cache")
+        else:
+            self._connection().execute(
+                "DELETE FROM cache WHERE namespace = ?", (namespace,))
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones until size fits max_bytes"""
+        connection = self._connection()
+        connection.execute(
+            "DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+
+        if not self.max_bytes:
+            return
+
+        total_size = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total_size <= self.max_bytes:
+            return
+
+        excess = total_size - int(self.max_bytes * EVICTION_TARGET_RATIO)
+        rows = connection.execute(
+            "SELECT namespace, key, size FROM cache ORDER BY accessed_at").fetchall()
+
+        evicted: List[tuple] = []
+        for namespace, key, size in rows:
+            if excess <= 0:
+                break
+            evicted.append((namespace, key))
+            excess -= size
+
+        connection.executemany(
+            "DELETE FROM cache WHERE namespace = ? AND key = ?", evicted)
+        with self._lock:
+            self.counters["evictions"] += len(evicted)
+
+    def stats(self, namespace: str) -> dict:
+        entries, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache WHERE namespace = ?",
+            (namespace,)).fetchone()
+        hits = self.counters[f"{namespace}.hits"]
+        misses = self.counters[f"{namespace}.misses"]
+
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
@@ -0,0 +1,121 @@
+import hashlib
+import math
+import os
+import re
+from typing import List, NamedTuple, Optional
+
+from langchain_core.embeddings import Embeddings
+from langchain_openai import OpenAIEmbeddings
+
+OPENAI_BACKEND = "openai"
+FASTEMBED_BACKEND = "fastembed"
+HASHING_BACKEND = "hashing"
+
+DEFAULT_MODELS = {
+    OPENAI_BACKEND: "text-embedding-3-small",
+    FASTEMBED_BACKEND: "BAAI/bge-small-en-v1.5",
+    HASHING_BACKEND: "hashing-384",
+}
+
+OPENAI_EMBEDDING_SIZES = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
+
+
+class EmbeddingBackend(NamedTuple):
+    name: str
+    model_name: str
+    size: int
+    embeddings: Embeddings
+    # Worth putting in front of embedding cache (network or heavy model)
+    cacheable: bool
+
+
+class HashingEmbeddings(Embeddings):
+    """Deterministic feature hashing embedder: no model, no network.
+Similar texts share tokens and get close vectors, good enough for tests, benchmarks and offline CI.
+    """
+
+    def __init__(self, size: int = 384):
+        self.size = size
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.size
+        tokens = re.findall(r"\w+", text.lower())
+        for token in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+            digest = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+            vector[digest % self.size] += 1.0 if digest & (1 << 63) else -1.0
+
+        norm = math.sqrt(sum(value * value for value in vector))
+        if norm == 0:
+            # Zero vector is not allowed with cosine distance
+            vector[0] = norm = 1.0
+
+        return [value / norm for value in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+class FastEmbedEmbeddings(Embeddings):
+    """Local CPU ONNX embedding model through fastembed"""
+
+    def __init__(self, model_name: str):
+        try:
+            from fastembed import TextEmbedding
+        except ImportError:
+            raise ImportError(
+                "fastembed package is required for 'fastembed' embeddings backend: pip install fastembed")
+
+        self.model = TextEmbedding(model_name=model_name)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [vector.tolist() for vector in self.model.embed(texts)]
+
+    def embed_query(self, text: str) -> List[float]:
+        return next(iter(self.model.query_embed(text))).tolist()
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        return [vector.tolist() for vector in self.model.query_embed(texts)]
+
+
+def embed_queries(embeddings: Embeddings, texts: List[str]) -> List[List[float]]:
+    """Embed several search queries in one call"""
+    if hasattr(embeddings, "embed_queries"):
+        return embeddings.embed_queries(texts)
+
+    # OpenAI and hashing embeddings are symmetric: query vector is the same as document vector
+    return embeddings.embed_documents(texts)
+
+
+def get_embedding_backend(backend: Optional[str] = None, model_name: Optional[str] = None) -> EmbeddingBackend:
+    """Embedding backend selected by argument or EMBEDDINGS_BACKEND / EMBEDDINGS_MODEL environment variables"""
+    backend = backend or os.getenv("EMBEDDINGS_BACKEND", OPENAI_BACKEND)
+    if backend not in DEFAULT_MODELS:
+        raise ValueError(f"Unknown embeddings backend '{backend}', expected one of: {', '.join(DEFAULT_MODELS)}")
+
+    model_name = model_name or os.getenv("EMBEDDINGS_MODEL") or DEFAULT_MODELS[backend]
+
+    if backend == OPENAI_BACKEND:
+        if model_name not in OPENAI_EMBEDDING_SIZES:
+            raise ValueError(f"Unknown OpenAI embedding model '{model_name}'")
+
+        embeddings = OpenAIEmbeddings(
+            model=model_name,
+            openai_api_key=os.environ["OPENAI_API_KEY"]
+        )
+        return EmbeddingBackend(backend, model_name, OPENAI_EMBEDDING_SIZES[model_name], embeddings, True)
+
+    if backend == FASTEMBED_BACKEND:
+        embeddings = FastEmbedEmbeddings(model_name)
+        size = len(embeddings.embed_query("dimension probe"))
+        return EmbeddingBackend(backend, model_name, size, embeddings, True)
+
+    # Model name carries vector size, e.g. hashing-384
+    size = int(model_name.rsplit("-", 1)[-1]) if model_name[-1].isdigit() else 384
+    return EmbeddingBackend(backend, model_name, size, HashingEmbeddings(size), False)
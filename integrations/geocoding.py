@@ -1,12 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import hashlib
+import json
 import logging
 import os
-import googlemaps
 import pytz
-import requests
+import threading
+import time
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Callable, NamedTuple, Optional, Tuple
+
+from integrations.disk_cache import DiskCache, get_cache_path
+from integrations.http_client import get_googlemaps_client, request
+
+# Found addresses are stable, "not found" is cached for shorter time since Google data improves
+GEOCODING_CACHE_TTL = int(os.getenv("GEOCODING_CACHE_TTL", 30 * 24 * 60 * 60))
+GEOCODING_NEGATIVE_CACHE_TTL = int(os.getenv("GEOCODING_NEGATIVE_CACHE_TTL", 7 * 24 * 60 * 60))
+
+VALIDATED_ADDRESS_NAMESPACE = "geocoding:validated_address"
+PLACE_ADDRESS_NAMESPACE = "geocoding:place_address"
+LOCATION_NAMESPACE = "geocoding:location"
+GEOCODING_NAMESPACES = [VALIDATED_ADDRESS_NAMESPACE, PLACE_ADDRESS_NAMESPACE, LOCATION_NAMESPACE]
+
+class SpatialCachePolicy(NamedTuple):
+    # Geohash cell length: 4 is ~40 km, 5 is ~5 km, 6 is ~1 km
+    geohash_precision: int
+    # Answers are reused within time bucket, None means answer doesn't depend on time
+    time_bucket_seconds: Optional[int]
+
+WEATHER_FORECAST_NAMESPACE = "spatial:weather_forecast"
+CURRENT_CONDITIONS_NAMESPACE = "spatial:current_conditions"
+TIMEZONE_NAMESPACE = "spatial:timezone"
+
+# Answers for nearby points within the same hour are the same for every user
+SPATIAL_CACHE_POLICIES = {
+    WEATHER_FORECAST_NAMESPACE: SpatialCachePolicy(int(os.getenv("WEATHER_GEOHASH_PRECISION", 5)), 60 * 60),
+    CURRENT_CONDITIONS_NAMESPACE: SpatialCachePolicy(int(os.getenv("WEATHER_GEOHASH_PRECISION", 5)), 15 * 60),
+    # Timezones practically never change
+    TIMEZONE_NAMESPACE: SpatialCachePolicy(int(os.getenv("TIMEZONE_GEOHASH_PRECISION", 4)), None),
+}
+
+ADDRESS_VALIDATION_URL = "https://addressvalidation.googleapis.com/v1:validateAddress"
+PLACES_SEARCH_TEXT_URL = "https://places.googleapis.com/v1/places:searchText"
 
 class PlaceAddressDetails(BaseModel):
     name: Optional[str] = None
@@ -14,73 +50,179 @@ class PlaceAddressDetails(BaseModel):
     latitude: float 
     longitude: float
 
-def get_validated_address(location_str, base_location) -> Optional[PlaceAddressDetails]:
-    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+_geocoding_cache = None
+_geocoding_cache_lock = threading.Lock()
 
-    try:
-        url = f"https://addressvalidation.googleapis.com/v1:validateAddress?key={api_key}"
+def get_geocoding_cache() -> DiskCache:
+    global _geocoding_cache
+    # Lookups run in parallel threads, all of them should share one cache and its counters
+    with _geocoding_cache_lock:
+        if _geocoding_cache is None:
+            _geocoding_cache = DiskCache(get_cache_path("geocoding.sqlite"))
+    return _geocoding_cache
 
-        headers = {
-            "Content-Type": "application/json",
-        }
-        payload = {
-            "address": {
-                "regionCode": "US",
-                "locality": base_location,
-                "addressLines": [location_str]
-            }
-        }
+def get_geocoding_cache_stats() -> dict:
+    """Hits, misses, hit rate and size of geocoding cache per lookup type"""
+    cache = get_geocoding_cache()
+    return {namespace: cache.stats(namespace) for namespace in GEOCODING_NAMESPACES + list(SPATIAL_CACHE_POLICIES)}
 
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()  # Raise an exception for bad status codes
+def normalize_query(text: str) -> str:
+    return " ".join(str(text).lower().split())
 
-        result = response.json()["result"]
-        
-        if result["verdict"]["validationGranularity"] in ["PREMISE_PROXIMITY", "PREMISE", "SUB_PREMISE"]:
-            place = PlaceAddressDetails(
-                formatted_address=result["address"]["formattedAddress"],
-                latitude=result["geocode"]["location"]["latitude"],
-                longitude=result["geocode"]["location"]["longitude"]
-            )
-            return place
-        else:
-            return None        
+def cached_lookup(namespace: str, key_parts: tuple, lookup: Callable[[], Optional[PlaceAddressDetails]]) -> Optional[PlaceAddressDetails]:
+    """Result of lookup from cache, negative results (None) are cached as well.
+Exceptions raised by lookup (API errors) are not cached.
+    """
+    key = hashlib.sha256(json.dumps(key_parts).encode("utf-8")).hexdigest()
+    cache = get_geocoding_cache()
+
+    cached = cache.get(namespace, key)
+    if cached is not None:
+        fields = json.loads(cached)
+        return PlaceAddressDetails(**fields) if fields else None
+
+    place = lookup()
+    cache.set(namespace, key, json.dumps(place.model_dump() if place else None).encode("utf-8"),
+              ttl=GEOCODING_CACHE_TTL if place else GEOCODING_NEGATIVE_CACHE_TTL)
+
+    return place
+
+def get_validated_address(location_str, base_location) -> Optional[PlaceAddressDetails]:
+    try:
+        return cached_lookup(VALIDATED_ADDRESS_NAMESPACE, (normalize_query(location_str), base_location),
+                             lambda: _validate_address(location_str, base_location))
     except Exception as e:
         logging.error(
             f"Error fetching address data (get_validated_address): {str(e)}")
         
         return None
 
-def get_weather_data(latitude, longitude, days=3):
-    """Get current weather data from Google Weather API using coordinates."""
+def _validate_address(location_str, base_location) -> Optional[PlaceAddressDetails]:
     api_key = os.getenv("GOOGLE_MAPS_API_KEY")
 
-    try:
-        url = f"https://weather.googleapis.com/v1/forecast/days:lookup?key={api_key}&location.latitude={latitude}&location.longitude={longitude}&days={days}&unitsSystem=IMPERIAL"
+    url = f"{ADDRESS_VALIDATION_URL}?key={api_key}"
+
+    headers = {
+        "Content-Type": "application/json",
+    }
+    payload = {
+        "address": {
+            "regionCode": "US",
+            "locality": base_location,
+            "addressLines": [location_str]
+        }
+    }
+
+    response = request("address_validation", "POST", url, headers=headers, json=payload)
+    response.raise_for_status()  # Raise an exception for bad status codes
+
+    result = response.json()["result"]
 
-        response = requests.get(url)
-        response.raise_for_status()  # Raise an exception for bad status codes
+    if result["verdict"]["validationGranularity"] in ["PREMISE_PROXIMITY", "PREMISE", "SUB_PREMISE"]:
+        place = PlaceAddressDetails(
+            formatted_address=result["address"]["formattedAddress"],
+            latitude=result["geocode"]["location"]["latitude"],
+            longitude=result["geocode"]["location"]["longitude"]
+        )
+        return place
+    else:
+        return None
 
-        weather_data = response.json()
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+def geohash_encode(latitude: float, longitude: float, precision: int) -> str:
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(geohash) < precision:
+        # Bits alternate between longitude and latitude, 5 bits per character
+        value, value_range = (longitude, lon_range) if even else (latitude, lat_range)
+        middle = (value_range[0] + value_range[1]) / 2
+        if value >= middle:
+            bits = bits * 2 + 1
+            value_range[0] = middle
+        else:
+            bits = bits * 2
+            value_range[1] = middle
+        even = not even
+
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(geohash)
+
+def cached_spatial_lookup(namespace: str, latitude: float, longitude: float, lookup: Callable[[], Any], key_extra: Tuple = ()) -> Any:
+    """JSON result of lookup shared by all points of geohash cell within time bucket.
+None results and exceptions (API errors) are not cached.
+    """
+    policy = SPATIAL_CACHE_POLICIES[namespace]
+    key = geohash_encode(float(latitude), float(longitude), policy.geohash_precision)
+    ttl = None
+    if policy.time_bucket_seconds:
+        key += f":{int(time.time() // policy.time_bucket_seconds)}"
+        ttl = policy.time_bucket_seconds
+    if key_extra:
+        key += ":" + ":".join(str(part) for part in key_extra)
+
+    cache = get_geocoding_cache()
+    cached = cache.get(namespace, key)
+    if cached is not None:
+        return json.loads(cached)
+
+    result = lookup()
+    if result is not None:
+        cache.set(namespace, key, json.dumps(result).encode("utf-8"), ttl=ttl)
+
+    return result
 
-        return weather_data
+def get_weather_data(latitude, longitude, days=3):
+    """Get current weather data from Google Weather API using coordinates."""
+    try:
+        return cached_spatial_lookup(WEATHER_FORECAST_NAMESPACE, latitude, longitude,
+                                     lambda: _fetch_weather("forecast/days", latitude, longitude, f"&days={days}"),
+                                     key_extra=(days,))
     except Exception as e:
         logging.error(
             f"Error fetching weather data (get_weather_data): {str(e)}")
         return { "weather": "Forecast is not available due to error"}
 
+def get_current_conditions(latitude, longitude) -> dict:
+    """Current weather conditions from Google Weather API, raises on API errors"""
+    return cached_spatial_lookup(CURRENT_CONDITIONS_NAMESPACE, latitude, longitude,
+                                 lambda: _fetch_weather("currentConditions", latitude, longitude))
+
+def _fetch_weather(endpoint, latitude, longitude, extra_params=""):
+    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+
+    url = f"https://weather.googleapis.com/v1/{endpoint}:lookup?key={api_key}&location.latitude={latitude}&location.longitude={longitude}{extra_params}&unitsSystem=IMPERIAL"
+
+    response = request("weather", "GET", url)
+    response.raise_for_status()  # Raise an exception for bad status codes
+
+    return response.json()
+
 def get_timezone_from_coordinates(latitude, longitude):
-    gmaps = googlemaps.Client(key=os.getenv("GOOGLE_MAPS_API_KEY"))
+    timezone_id = cached_spatial_lookup(TIMEZONE_NAMESPACE, latitude, longitude,
+                                        lambda: _lookup_timezone(latitude, longitude))
+
+    return timezone_id or "America/Chicago"
+
+def _lookup_timezone(latitude, longitude) -> Optional[str]:
+    gmaps = get_googlemaps_client()
     timezone_result = gmaps.timezone(
         location=(latitude, longitude)
     )
     
     if timezone_result.get("status") == "OK":
-        timezone_id = timezone_result["timeZoneId"]
-    else:
-        timezone_id = "America/Chicago"
-    
-    return timezone_id
+        return timezone_result["timeZoneId"]
+
+    return None
 
 #TODO: Would be good to add Location/Region bias
 def get_location_from_string(location_str) -> Optional[PlaceAddressDetails]:
@@ -88,28 +230,30 @@ def get_location_from_string(location_str) -> Optional[PlaceAddressDetails]:
     if not location_str:
         return None
 
-    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
-
     try:
-        gmaps = googlemaps.Client(key=api_key)
-        result = gmaps.geocode(location_str)
-
-        if result:
-            location = result[0]['geometry']['location']
-            formatted_address = result[0]['formatted_address']
-
-            return PlaceAddressDetails(
-                formatted_address=formatted_address,
-                latitude=location['lat'],
-                longitude=location['lng']
-            )
-        else:
-            return None
+        return cached_lookup(LOCATION_NAMESPACE, (normalize_query(location_str),),
+                             lambda: _geocode_location(location_str))
     except Exception as e:
         logging.error(
             f"Error fetching location data (get_location_from_string): {str(e)}")
         return None
 
+def _geocode_location(location_str) -> Optional[PlaceAddressDetails]:
+    gmaps = get_googlemaps_client()
+    result = gmaps.geocode(location_str)
+
+    if result:
+        location = result[0]['geometry']['location']
+        formatted_address = result[0]['formatted_address']
+
+        return PlaceAddressDetails(
+            formatted_address=formatted_address,
+            latitude=location['lat'],
+            longitude=location['lng']
+        )
+    else:
+        return None
+
 def get_place_address(searchText, bias_latitude, bias_longitude, radius=20000) -> Optional[PlaceAddressDetails]:
     """Get formatted address from Google Maps API using coordinates."""
     # Default radius is set to 20km (Dallas) to be able to find all places in the city
@@ -121,47 +265,58 @@ def get_place_address(searchText, bias_latitude, bias_longitude, radius=20000) -
     if not searchText:
         return None
 
-    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
-
     try:
-        url = "https://places.googleapis.com/v1/places:searchText"
-        headers = {
-            "Content-Type": "application/json",
-            "X-Goog-Api-Key": api_key,
-            "X-Goog-FieldMask": "places.displayName,places.formattedAddress,places.location"
-        }
-        payload = {
-            "textQuery": searchText,
-            "locationBias": {
-                "circle": {
-                    "center": {
-                        "latitude": bias_latitude,
-                        "longitude": bias_longitude
-                    },
-                    "radius": radius
-                }
-            }
-        }
-
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()
-        result = response.json()
-
-        if result and 'places' in result:
-            place = result['places'][0]
-            return PlaceAddressDetails(
-                name=place['displayName']['text'],
-                formatted_address=place['formattedAddress'],
-                latitude=place['location']['latitude'],
-                longitude=place['location']['longitude']
-            )
-        else:
-            return None
+        # Bias center rounded to ~10 meters, so slightly different exact locations share entries
+        bias = (round(float(bias_latitude), 4), round(float(bias_longitude), 4), radius)
+        return cached_lookup(PLACE_ADDRESS_NAMESPACE, (normalize_query(searchText), *bias),
+                             lambda: _search_place_address(searchText, bias_latitude, bias_longitude, radius))
     except Exception as e:
         logging.error(
             f"Error fetching address data (get_place_address): {str(e)}")
         return None
 
+def _search_place_address(searchText, bias_latitude, bias_longitude, radius) -> Optional[PlaceAddressDetails]:
+    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+
+    url = PLACES_SEARCH_TEXT_URL
+    headers = {
+        "Content-Type": "application/json",
+        "X-Goog-Api-Key": api_key,
+        "X-Goog-FieldMask": "places.displayName,places.formattedAddress,places.location"
+    }
+    payload = {
+        "textQuery": searchText,
+        "locationBias": {
+            "circle": {
+                "center": {
+                    "latitude": bias_latitude,
+                    "longitude": bias_longitude
+                },
+                "radius": radius
+            }
+        }
+    }
+
+    response = request("places", "POST", url, headers=headers, json=payload)
+    response.raise_for_status()
+    result = response.json()
+
+    if result and 'places' in result:
+        place = result['places'][0]
+        return PlaceAddressDetails(
+            name=place['displayName']['text'],
+            formatted_address=place['formattedAddress'],
+            latitude=place['location']['latitude'],
+            longitude=place['location']['longitude']
+        )
+    else:
+        return None
+
+def get_local_datetime(latitude, longitude) -> datetime:
+    """Current time in time zone of coordinates, time zone lookup is cached by area"""
+    tz = get_timezone_from_coordinates(latitude, longitude)
+    return datetime.now(pytz.timezone("UTC")).astimezone(pytz.timezone(tz))
+
 def get_datetime_info(latitude, longitude):
     datetime_now_utc = datetime.now(pytz.timezone("UTC"))
     tz = get_timezone_from_coordinates(latitude, longitude)
@@ -172,6 +327,14 @@ def get_datetime_info(latitude, longitude):
 
     return datetime_now_info
 
+def get_location_context(latitude, longitude, days=3) -> Tuple[str, dict]:
+    """Date time info and weather forecast for itinerary, looked up concurrently"""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        datetime_info = executor.submit(get_datetime_info, latitude, longitude)
+        weather_data = executor.submit(get_weather_data, latitude, longitude, days)
+
+        return datetime_info.result(), weather_data.result()
+
 
 def get_route_plan(places: PlaceAddressDetails, travel_mode="DRIVE", optimize_waypoint_order=False):
     if len(places) < 2:
@@ -234,7 +397,7 @@ def get_route_plan(places: PlaceAddressDetails, travel_mode="DRIVE", optimize_wa
                 for place in places[1:-1]
             ]
 
-        response = requests.post(url, headers=headers, json=payload)
+        response = request("routes", "POST", url, headers=headers, json=payload)
         response.raise_for_status()
         result = response.json()
 
@@ -0,0 +1,158 @@
+"""Shared HTTP transport of Google integrations.
+
+One pooled keep-alive session for the process: no TLS handshake per request, per-API timeouts,
+retries with jittered exponential backoff on connection errors, 429 and 5xx (Retry-After is
+respected) and client-side rate limiting with a token bucket per API.
+Every attempt is rate limited, retries are done above the session, not by urllib3 under it.
+"""
+import os
+import random
+import threading
+import time
+from typing import NamedTuple, Tuple
+
+import googlemaps
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", 3))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", 32))
+# Retry n waits backoff_factor * 2 ** (n - 1) seconds plus up to backoff_jitter
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_BACKOFF_JITTER = 0.5
+HTTP_BACKOFF_MAX = 10
+
+
+class ApiLimits(NamedTuple):
+    # (connect, read) seconds
+    timeout: Tuple[float, float]
+    # Sustained requests per second and burst size of token bucket
+    rate: float
+    burst: int
+    # Requests in flight
+    concurrency: int
+
+
+API_LIMITS = {
+    "address_validation": ApiLimits((3.05, 10), float(os.getenv("ADDRESS_VALIDATION_QPS", 50)), 20,
+                                    int(os.getenv("ADDRESS_VALIDATION_CONCURRENCY", 8))),
+    "places": ApiLimits((3.05, 10), float(os.getenv("PLACES_QPS", 50)), 20,
+                        int(os.getenv("PLACES_CONCURRENCY", 8))),
+    "weather": ApiLimits((3.05, 10), float(os.getenv("WEATHER_QPS", 20)), 10, 8),
+    "routes": ApiLimits((3.05, 30), float(os.getenv("ROUTES_QPS", 20)), 10, 4),
+}
+
+
+class TokenBucket:
+    """Blocks callers to keep request rate below rate per second, allowing bursts of capacity"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+
+_rate_limiters = {api: TokenBucket(limits.rate, limits.burst) for api, limits in API_LIMITS.items()}
+_concurrency_limits = {api: threading.BoundedSemaphore(limits.concurrency) for api, limits in API_LIMITS.items()}
+
+_session = None
+_googlemaps_client = None
+_lock = threading.Lock()
+
+
+def create_http_session(retries: int = HTTP_RETRIES) -> requests.Session:
+    retry = Retry(
+        total=retries,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        backoff_jitter=HTTP_BACKOFF_JITTER,
+        backoff_max=HTTP_BACKOFF_MAX,
+        status_forcelist=RETRY_STATUSES,
+        # Google endpoints used with POST are lookups, safe to repeat
+        allowed_methods=frozenset({"GET", "POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return session
+
+
+def get_http_session() -> requests.Session:
+    global _session
+    with _lock:
+        if _session is None:
+            # Retries are done by request(), so each attempt takes a rate limit token
+            _session = create_http_session(retries=0)
+    return _session
+
+
+def _retry_delay(retry: int, response: requests.Response = None) -> float:
+    retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+    if retry_after.strip().isdigit():
+        return float(retry_after)
+    return min(HTTP_BACKOFF_FACTOR * 2 ** (retry - 1) + random.uniform(0, HTTP_BACKOFF_JITTER), HTTP_BACKOFF_MAX)
+
+
+def request(api: str, method: str, url: str, **kwargs) -> requests.Response:
+    """HTTP request through shared session with timeout, rate and concurrency limits of api.
+
+Every attempt takes a rate limit token and a concurrency slot, the slot is not held during backoff.
+    """
+    kwargs.setdefault("timeout", API_LIMITS[api].timeout)
+    session = get_http_session()
+
+    for retry in range(HTTP_RETRIES + 1):
+        _rate_limiters[api].acquire()
+        response = None
+        try:
+            with _concurrency_limits[api]:
+                response = session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if retry == HTTP_RETRIES:
+                raise
+
+        if response is not None:
+            if response.status_code not in RETRY_STATUSES or retry == HTTP_RETRIES:
+                return response
+            response.close()
+        time.sleep(_retry_delay(retry + 1, response))
+
+
+def get_googlemaps_client() -> googlemaps.Client:
+    """Shared googlemaps client on pooled keep-alive session. It has own rate limiting and
+retries with backoff, so session doesn't retry
+    """
+    global _googlemaps_client
+    with _lock:
+        if _googlemaps_client is None:
+            _googlemaps_client = googlemaps.Client(
+                key=os.getenv("GOOGLE_MAPS_API_KEY"),
+                connect_timeout=3.05,
+                read_timeout=10,
+                retry_timeout=30,
+                queries_per_second=int(os.getenv("GOOGLEMAPS_QPS", 50)),
+                requests_session=create_http_session(retries=0),
+            )
+    return _googlemaps_client
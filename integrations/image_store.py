@@ -0,0 +1,69 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from pyuploadcare import Uploadcare
+
+from integrations.disk_cache import DiskCache, get_cache_path
+
+# Uploads run in parallel, Uploadcare polls every URL upload until the file is ready
+IMAGE_UPLOAD_WORKERS = int(os.getenv("IMAGE_UPLOAD_WORKERS", 8))
+UPLOADCARE_CDN_HOSTS = ("ucarecdn.com", "ucarecd.net")
+
+SOURCE_TO_CDN_NAMESPACE = "uploadcare:source_to_cdn"
+
+
+class ImageIngestor:
+    """Copies source images (SerpAPI thumbnails, favicons) to Uploadcare CDN.
+
+Every source URL is uploaded once: already uploaded ones are taken from
+the persistent source URL -> CDN URL map, CDN URLs are returned as is.
+    """
+
+    def __init__(self, uploadcare: Uploadcare, disk_cache: DiskCache = None, max_workers: int = IMAGE_UPLOAD_WORKERS):
+        self.uploadcare = uploadcare
+        self.disk_cache = disk_cache or DiskCache(get_cache_path("images.sqlite"))
+        self.max_workers = max_workers
+
+    def is_cdn_url(self, url: str) -> bool:
+        host = urlparse(url).hostname or ""
+        cdn_host = urlparse(getattr(self.uploadcare, "cdn_base", "") or "").hostname
+        return host == cdn_host or any(host == h or host.endswith("." + h) for h in UPLOADCARE_CDN_HOSTS)
+
+    def _upload(self, source_url: str, activity_id: str) -> Optional[str]:
+        try:
+            ucare_file = self.uploadcare.upload(source_url, store=True, metadata={
+                "activity_id": f"{activity_id}"})
+            return ucare_file.cdn_url
+        except Exception as e:
+            logging.error(f"Error uploading image: {e}")
+            return None
+
+    def ingest(self, source_urls: List[str], activity_ids: List[str]) -> Dict[str, Optional[str]]:
+        """Returns CDN URL for every source URL, None if upload failed"""
+        cdn_urls = {}
+        pending = {}
+        for source_url, activity_id in zip(source_urls, activity_ids):
+            if not source_url or source_url in cdn_urls or source_url in pending:
+                continue
+            if self.is_cdn_url(source_url):
+                cdn_urls[source_url] = source_url
+            else:
+                pending[source_url] = activity_id
+
+        if pending:
+            for source_url, cdn_url in self.disk_cache.get_many(SOURCE_TO_CDN_NAMESPACE, pending.keys()).items():
+                cdn_urls[source_url] = cdn_url.decode("utf-8")
+                del pending[source_url]
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+                uploaded = dict(zip(pending.keys(), executor.map(self._upload, pending.keys(), pending.values())))
+
+            cdn_urls.update(uploaded)
+            self.disk_cache.set_many(SOURCE_TO_CDN_NAMESPACE, {
+                source_url: cdn_url.encode("utf-8") for source_url, cdn_url in uploaded.items() if cdn_url})
+
+        return cdn_urls
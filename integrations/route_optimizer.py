@@ -0,0 +1,242 @@
+"""Local waypoint order optimizer for itinerary routes.
+
+Replaces Routes API optimizeWaypointOrder: the first and the last place stay in place, intermediate
+places are ordered by nearest neighbour heuristic improved with 2-opt and relocation moves, using
+straight-line (haversine) distances. Optional opening hours time windows penalize arriving after
+closing time.
+"""
+import re
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_METERS = 6371008.8
+# Average city driving speed used to estimate arrival times, meters per second (~30 km/h)
+TRAVEL_SPEED_MPS = 8.33
+# Time spent at every place when time windows are used
+VISIT_MINUTES = 60
+# Cost of one minute of arriving after closing time, in meters
+LATENESS_PENALTY_METERS = 1000
+
+TimeWindow = Tuple[int, int]
+
+DAY_NAMES = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+DAY_PATTERN = (r"\b(?:mon(?:day)?|tue(?:s|sday)?|wed(?:nesday)?|thu(?:r|rs|rsday)?|fri(?:day)?"
+               r"|sat(?:urday)?|sun(?:day)?)\b\.?")
+
+
+class RouteOrder(NamedTuple):
+    # Indices of places in visiting order, first and last place included
+    order: List[int]
+    distance_meters: float
+    # Sum of minutes of arrivals after closing time
+    lateness_minutes: float
+
+
+def haversine_matrix(latitudes: Sequence[float], longitudes: Sequence[float]) -> np.ndarray:
+    """Great-circle distances in meters between all pairs of points"""
+    lat = np.radians(np.asarray(latitudes, dtype=float))[:, None]
+    lon = np.radians(np.asarray(longitudes, dtype=float))[:, None]
+
+    dlat = lat - lat.T
+    dlon = lon - lon.T
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat) * np.cos(lat.T) * np.sin(dlon / 2) ** 2
+
+    return 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def _parse_minute(value: str) -> Optional[int]:
+    match = re.match(r"(\d{1,2})(?::(\d{2}))?\s*([ap])?", value.strip().lower())
+    if not match:
+        return None
+
+    hour, minute, meridiem = int(match.group(1)), int(match.group(2) or 0), match.group(3)
+    if meridiem == "p" and hour < 12:
+        hour += 12
+    if meridiem == "a" and hour == 12:
+        hour = 0
+
+    return hour * 60 + minute
+
+
+def _day_index(day: str) -> int:
+    return DAY_NAMES.index(day[:3].lower())
+
+
+def _days_of(day_spec: str) -> set:
+    """Weekdays (Monday is 0) of text like 'Mon-Fri', 'Sat, Sun' or 'Friday - Monday'"""
+    tokens = list(re.finditer(DAY_PATTERN, day_spec, re.IGNORECASE))
+    days = set()
+    for previous, token in zip([None] + tokens[:-1], tokens):
+        day = _day_index(token.group(0))
+        if previous and re.search(r"[-–—]|to|through", day_spec[previous.end():token.start()], re.IGNORECASE):
+            current = _day_index(previous.group(0))
+            while current != day:
+                days.add(current)
+                current = (current + 1) % 7
+        days.add(day)
+
+    return days
+
+
+def _parse_time_range(hours: str) -> Optional[TimeWindow]:
+    if re.search(r"24\s*hours", hours, re.IGNORECASE):
+        return 0, 24 * 60
+
+    time = r"\d{1,2}(?::\d{2})?\s*(?:[ap]\.?m\.?)?"
+    match = re.search(rf"({time})\s*(?:[-–—]|to)\s*({time})", hours, re.IGNORECASE)
+    if not match:
+        return None
+
+    start, end = match.group(1).replace(".", ""), match.group(2).replace(".", "")
+    opens, closes = _parse_minute(start), _parse_minute(end)
+    if opens is None or closes is None:
+        return None
+
+    # Borrow AM/PM from range end: '1 - 4 PM', but not '10 - 5 PM'
+    end_meridiem = re.search(r"[ap]", end, re.IGNORECASE)
+    if end_meridiem and not re.search(r"[ap]", start, re.IGNORECASE):
+        borrowed = _parse_minute(start + end_meridiem.group(0))
+        if borrowed <= closes:
+            opens = borrowed
+    if closes <= opens:
+        # Closes after midnight
+        closes += 24 * 60
+
+    return opens, closes
+
+
+def parse_hours_of_operation(hours: Optional[str], weekday: Optional[int] = None) -> Optional[TimeWindow]:
+    """Opening and closing minute of the day from text like '10 AM - 5 PM' or '11:00am–2:00am'.
+
+Hours listed by days ('Mon-Fri 9am - 5pm, Sat 10am - 2pm', 'Monday: 10 AM–5 PM; Tuesday: Closed')
+give the range of weekday (Monday is 0). None when there is no recognizable range for the day,
+or when hours depend on the day and weekday is unknown.
+    """
+    if not hours:
+        return None
+
+    day_specs = list(re.finditer(
+        rf"{DAY_PATTERN}(?:\s*(?:[-–—,&]|to|through|and)\s*{DAY_PATTERN})*", hours, re.IGNORECASE))
+    if not day_specs:
+        # Same hours every day
+        return _parse_time_range(hours)
+    if weekday is None:
+        return None
+
+    for day_spec, following in zip(day_specs, day_specs[1:] + [None]):
+        if weekday in _days_of(day_spec.group(0)):
+            return _parse_time_range(hours[day_spec.end():following.start() if following else len(hours)])
+
+    return None
+
+
+def route_distance(distances: np.ndarray, order: Sequence[int]) -> float:
+    order = np.asarray(order)
+    return float(distances[order[:-1], order[1:]].sum())
+
+
+def route_lateness(distances: np.ndarray, order: Sequence[int], time_windows: Sequence[Optional[TimeWindow]],
+                   start_minute: int) -> float:
+    """Minutes of arrivals after closing time, visitors wait when a place is not open yet"""
+    minute = start_minute
+    lateness = 0.0
+    for previous, current in zip(order[:-1], order[1:]):
+        minute += distances[previous, current] / TRAVEL_SPEED_MPS / 60
+        window = time_windows[current]
+        if window:
+            opens, closes = window
+            minute = max(minute, opens)
+            lateness += max(0.0, minute - closes)
+        minute += VISIT_MINUTES
+
+    return lateness
+
+
+def _route_cost(distances, order, time_windows, start_minute) -> float:
+    cost = route_distance(distances, order)
+    if time_windows is not None:
+        cost += LATENESS_PENALTY_METERS * route_lateness(distances, order, time_windows, start_minute)
+    return cost
+
+
+def nearest_neighbour_order(distances: np.ndarray) -> List[int]:
+    """Start at place 0, end at the last place, always go to the closest unvisited place in between"""
+    last = len(distances) - 1
+    unvisited = set(range(1, last))
+    order = [0]
+    while unvisited:
+        current = order[-1]
+        following = min(unvisited, key=lambda place: distances[current, place])
+        order.append(following)
+        unvisited.remove(following)
+
+    return order + [last] if last > 0 else order
+
+
+def two_opt(distances: np.ndarray, order: List[int], time_windows=None, start_minute: int = 0) -> List[int]:
+    """Reverse segments of intermediate places while route cost improves"""
+    best = list(order)
+    best_cost = _route_cost(distances, best, time_windows, start_minute)
+
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, len(best) - 2):
+            for j in range(i + 1, len(best) - 1):
+                candidate = best[:i] + best[i:j + 1][::-1] + best[j + 1:]
+                cost = _route_cost(distances, candidate, time_windows, start_minute)
+                if cost < best_cost - 1e-9:
+                    best, best_cost = candidate, cost
+                    improved = True
+
+    return best
+
+
+def or_opt(distances: np.ndarray, order: List[int], time_windows=None, start_minute: int = 0) -> List[int]:
+    """Move single intermediate places to another position while route cost improves"""
+    best = list(order)
+    best_cost = _route_cost(distances, best, time_windows, start_minute)
+
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, len(best) - 1):
+            rest = best[:i] + best[i + 1:]
+            for j in range(1, len(rest)):
+                if j == i:
+                    continue
+                candidate = rest[:j] + [best[i]] + rest[j:]
+                cost = _route_cost(distances, candidate, time_windows, start_minute)
+                if cost < best_cost - 1e-9:
+                    best, best_cost = candidate, cost
+                    improved = True
+                    break
+            if improved:
+                break
+
+    return best
+
+
+def optimize_route(latitudes: Sequence[float], longitudes: Sequence[float],
+                   time_windows: Optional[Sequence[Optional[TimeWindow]]] = None,
+                   start_minute: Optional[int] = None) -> RouteOrder:
+    """Visiting order of places with fixed first and last place.
+
+time_windows has opening hours per place (None for unknown), start_minute is local departure time
+from the first place, in minutes from midnight. Time windows are used only with departure time.
+    """
+    distances = haversine_matrix(latitudes, longitudes)
+    if start_minute is None or (time_windows is not None and not any(time_windows)):
+        time_windows = None
+
+    order = nearest_neighbour_order(distances)
+    # 2-opt untangles crossing legs, relocation fixes single misplaced places, repeat until neither helps
+    while True:
+        improved = or_opt(distances, two_opt(distances, order, time_windows, start_minute), time_windows, start_minute)
+        if improved == order:
+            break
+        order = improved
+
+    lateness = float(route_lateness(distances, order, time_windows, start_minute)) if time_windows else 0.0
+    return RouteOrder(order, route_distance(distances, order), lateness)
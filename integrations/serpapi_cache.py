@@ -0,0 +1,115 @@
+"""Record/replay cache of SerpAPI responses.
+
+Responses are stored in SQLite disk cache keyed by search parameters without API key
+(engine, q, num, uule, engine specific parameters). Cache keys are stable only with deterministic
+uule, see UuleConverter.encode_quantized.
+
+SERPAPI_CACHE_MODE:
+    replay  - fresh cached response if there is one, otherwise live search which is recorded (default)
+    record  - always live search, response is recorded
+    offline - cached responses only regardless of age, no live searches
+    off     - live search without cache
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+from serpapi import GoogleSearch
+
+from integrations.disk_cache import DiskCache, get_cache_path
+
+REPLAY_MODE = "replay"
+RECORD_MODE = "record"
+OFFLINE_MODE = "offline"
+OFF_MODE = "off"
+
+SERPAPI_NAMESPACE = "serpapi:responses"
+SERPAPI_CACHE_MAX_BYTES = int(os.getenv("SERPAPI_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+# Seconds a response is fresh, events change faster than places
+SERPAPI_CACHE_TTLS = {
+    "google": 24 * 60 * 60,
+    "google_local": 24 * 60 * 60,
+    "yelp": 24 * 60 * 60,
+    "google_events": 6 * 60 * 60,
+}
+DEFAULT_SERPAPI_CACHE_TTL = 6 * 60 * 60
+
+_serpapi_cache = None
+_serpapi_cache_lock = threading.Lock()
+
+
+def get_serpapi_cache() -> DiskCache:
+    global _serpapi_cache
+    with _serpapi_cache_lock:
+        if _serpapi_cache is None:
+            _serpapi_cache = DiskCache(get_cache_path("serpapi.sqlite"), max_bytes=SERPAPI_CACHE_MAX_BYTES)
+    return _serpapi_cache
+
+
+def get_cache_mode() -> str:
+    mode = os.getenv("SERPAPI_CACHE_MODE", REPLAY_MODE)
+    if mode not in (REPLAY_MODE, RECORD_MODE, OFFLINE_MODE, OFF_MODE):
+        raise ValueError(f"Unknown SERPAPI_CACHE_MODE '{mode}', expected one of: replay, record, offline, off")
+    return mode
+
+
+def get_cache_key(params: dict) -> str:
+    key_params = {k: v for k, v in params.items() if k != "api_key"}
+    return hashlib.sha256(json.dumps(key_params, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _read(key: str, ttl: Optional[float]) -> Optional[dict]:
+    cached = get_serpapi_cache().get(SERPAPI_NAMESPACE, key)
+    if cached is None:
+        return None
+
+    record = json.loads(cached)
+    # Expiry is checked here rather than by cache TTL: offline mode replays stale responses too
+    if ttl is not None and time.time() - record["fetched_at"] > ttl:
+        return None
+    return record["results"]
+
+
+def _record(key: str, results: dict):
+    # Errors (invalid key, quota) are not recorded
+    if "error" in results:
+        return
+
+    record = {"fetched_at": time.time(), "results": results}
+    get_serpapi_cache().set(SERPAPI_NAMESPACE, key, json.dumps(record).encode("utf-8"))
+
+
+def cached_search(params: dict, mode: str = None) -> dict:
+    """SerpAPI search results as returned by GoogleSearch.get_json, served according to cache mode"""
+    mode = mode or get_cache_mode()
+    if mode == OFF_MODE:
+        return GoogleSearch(params).get_json()
+
+    key = get_cache_key(params)
+    engine = params.get("engine")
+
+    if mode == OFFLINE_MODE:
+        results = _read(key, ttl=None)
+        if results is None:
+            logging.warning(f"No recorded SerpAPI response in offline mode: {engine} '{params.get('q')}'")
+            return {"error": "No recorded response for this search in offline mode"}
+        return results
+
+    if mode == REPLAY_MODE:
+        results = _read(key, ttl=SERPAPI_CACHE_TTLS.get(engine, DEFAULT_SERPAPI_CACHE_TTL))
+        if results is not None:
+            return results
+
+    results = GoogleSearch(params).get_json()
+    _record(key, results)
+
+    return results
+
+
+def get_serpapi_cache_stats() -> dict:
+    return get_serpapi_cache().stats(SERPAPI_NAMESPACE)
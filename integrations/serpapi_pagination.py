@@ -0,0 +1,100 @@
+"""Pagination of SerpAPI searches to reach requested number of results in one tool call.
+
+Engines below return a fixed page of results and ignore or cap num, so pages needed for num
+results are requested at once with start offset, then merged into the first page in page order.
+Merge stops at the first failed or last page, lists are deduplicated and cut at num.
+Google search honors num (one page has num results), it is not paginated.
+"""
+import logging
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Union
+
+# Results per page by engine, start offset of page N is N * page size
+SERPAPI_PAGE_SIZES = {
+    "google_local": 20,
+    "google_events": 10,
+    "yelp": 10,
+}
+# Paginated result list by engine, page with fewer results than page size is the last one
+SERPAPI_PAGED_RESULTS = {
+    "google_local": "local_results",
+    "google_events": "events_results",
+    "yelp": "organic_results",
+}
+SERPAPI_MAX_PAGES = int(os.getenv("SERPAPI_MAX_PAGES", 3))
+
+
+def get_page_params(params: dict) -> List[dict]:
+    """Search parameters of every page needed for params["num"] results, first page is params itself"""
+    page_size = SERPAPI_PAGE_SIZES.get(params.get("engine"))
+    number_of_results = params.get("num") or 0
+    if not page_size or number_of_results <= page_size:
+        return [params]
+
+    pages = min(math.ceil(number_of_results / page_size), SERPAPI_MAX_PAGES)
+    return [params] + [{**params, "start": page * page_size} for page in range(1, pages)]
+
+
+def _result_key(item):
+    if not isinstance(item, dict):
+        return str(item)
+    return item.get("place_id") or item.get("link") or (
+        str(item.get("title") or item.get("name")).lower(), str(item.get("address")))
+
+
+def is_last_page(page: dict, engine: str) -> bool:
+    """Events responses have no serpapi_pagination, end of results is detected by a short page"""
+    pagination = page.get("serpapi_pagination")
+    if pagination is not None and not pagination.get("next"):
+        return True
+
+    results = page.get(SERPAPI_PAGED_RESULTS.get(engine))
+    return not isinstance(results, list) or len(results) < SERPAPI_PAGE_SIZES.get(engine, 0)
+
+
+def merge_pages(pages: List[Union[dict, Exception]], number_of_results: int, engine: str) -> dict:
+    """First page with result lists extended by following pages, deduplicated and cut at number_of_results"""
+    first = pages[0]
+    if isinstance(first, Exception):
+        raise first
+
+    merged = dict(first)
+    list_fields = [field for field, value in first.items() if isinstance(value, list)]
+    seen = {field: {_result_key(item) for item in first[field]} for field in list_fields}
+
+    previous = first
+    for page in pages[1:]:
+        # No more results after the last page, following pages are empty or errors
+        if is_last_page(previous, engine):
+            break
+        if isinstance(page, Exception) or "error" in page:
+            logging.warning(f"SerpAPI page is skipped: {page if isinstance(page, Exception) else page['error']}")
+            break
+
+        for field in list_fields:
+            for item in page.get(field) or []:
+                key = _result_key(item)
+                if key not in seen[field]:
+                    seen[field].add(key)
+                    merged[field] = merged[field] + [item]
+        previous = page
+
+    for field in list_fields:
+        merged[field] = merged[field][:number_of_results]
+
+    return merged
+
+
+def paginated_search(params: dict, search: Callable[[dict], dict]) -> dict:
+    """Search results of all needed pages, pages are fetched concurrently with search(params)"""
+    page_params = get_page_params(params)
+    if len(page_params) == 1:
+        pages = [search(params)]
+    else:
+        with ThreadPoolExecutor(max_workers=len(page_params)) as executor:
+            futures = [executor.submit(search, page) for page in page_params]
+        pages = [future.exception() or future.result() for future in futures]
+
+    return merge_pages(pages, params["num"], params.get("engine"))
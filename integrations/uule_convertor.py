@@ -5,6 +5,8 @@ from typing import Dict, Optional
 
 class UuleConverter:
     E7_FACTOR = 10_000_000
+    # Fixed timestamp (2025-01-01 UTC, microseconds) of quantized UULEs, Google doesn't require it to be recent
+    QUANTIZED_TIMESTAMP = 1_735_689_600_000_000
 
     @staticmethod
     def encode(
@@ -35,6 +37,17 @@ radius: {radius}"""
 
         return 'a+' + UuleConverter._urlsafe_encode64(uule_string)
 
+    @staticmethod
+    def encode_quantized(latitude: float, longitude: float, precision: int = 2, **kwargs) -> str:
+        """Deterministic UULE: coordinates rounded to precision decimals (2 is ~1 km) and fixed timestamp,
+        so repeated searches from the same area have the same parameters and can be cached."""
+        return UuleConverter.encode(
+            round(latitude, precision),
+            round(longitude, precision),
+            timestamp=UuleConverter.QUANTIZED_TIMESTAMP,
+            **kwargs
+        )
+
     @staticmethod
     def decode(uule_encoded: str) -> Dict:
         """Decode a UULE string back into location data."""
@@ -1,54 +1,240 @@
+import hashlib
 import logging
 import os
+import threading
+from array import array
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import uuid
-from langchain_openai import OpenAIEmbeddings
+from langchain_core.embeddings import Embeddings
 from qdrant_client import QdrantClient
 from qdrant_client import models
 from qdrant_client.models import Filter, FieldCondition
 from pyuploadcare import Uploadcare
 
-from agents.activities import ActivityDetails
+from agents.activities import ActivityDetails, parse_timestamp
+from integrations.collection_profiles import (
+    get_collection_profile, get_hnsw_config, get_quantization_config, get_search_params)
+from integrations.disk_cache import DiskCache, get_cache_path
+from integrations.embeddings import embed_queries, get_embedding_backend
+from integrations.image_store import ImageIngestor
+
+# Texts per embed_documents request, a typical save_results call fits into one
+EMBEDDING_BATCH_SIZE = 64
+# Points per upsert request
+UPSERT_BATCH_SIZE = 256
+
+# In-process LRU in front of the on-disk embedding cache
+EMBEDDING_CACHE_LRU_SIZE = 4096
+EMBEDDING_CACHE_MAX_BYTES = int(os.getenv("EMBEDDING_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+# Payload fields filtered server side
+PAYLOAD_INDEXES = {
+    "coordinates": "geo",
+    "category": "keyword",
+    "data_source": "keyword",
+    "updated_at": "integer",
+    "start_timestamp": "integer",
+}
+
+# Qdrant transports: embedded (in-process, path or :memory:), remote over HTTP or gRPC
+QDRANT_LOCAL_MODE = "local"
+QDRANT_HTTP_MODE = "http"
+QDRANT_GRPC_MODE = "grpc"
+
+
+def create_qdrant_client(mode: str = None, path: str = None) -> QdrantClient:
+    """Qdrant client for mode given explicitly or by QDRANT_MODE environment variable (http by default)"""
+    mode = mode or os.getenv("QDRANT_MODE", QDRANT_HTTP_MODE)
+
+    if mode == QDRANT_LOCAL_MODE:
+        path = path or os.getenv("QDRANT_PATH", ":memory:")
+        if path == ":memory:":
+            return QdrantClient(location=":memory:")
+        return QdrantClient(path=path)
+
+    if mode in [QDRANT_HTTP_MODE, QDRANT_GRPC_MODE]:
+        return QdrantClient(
+            url=os.environ["QDRANT_URL"],
+            api_key=os.environ["QDRANT_API_KEY"],
+            prefer_grpc=mode == QDRANT_GRPC_MODE,
+            grpc_port=int(os.getenv("QDRANT_GRPC_PORT", 6334)),
+        )
+
+    raise ValueError(
+        f"Unknown Qdrant mode '{mode}', expected one of: {QDRANT_LOCAL_MODE}, {QDRANT_HTTP_MODE}, {QDRANT_GRPC_MODE}")
+
+
+class CachedEmbeddings(Embeddings):
+    """Content-addressed embedding cache keyed by (model name, text hash).
+
+Lookups go to in-process LRU first, then to disk cache, the wrapped
+embeddings are called only for texts never seen before.
+    """
+
+    def __init__(self, embeddings: Embeddings, model_name: str, disk_cache: DiskCache = None, lru_size: int = EMBEDDING_CACHE_LRU_SIZE):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.disk_cache = disk_cache
+        self.lru_size = lru_size
+
+        self.counters = Counter()
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _namespace(self, kind: str) -> str:
+        # Some models embed queries and documents differently
+        return f"embeddings:{self.model_name}:{kind}"
+
+    def _lru_get(self, key):
+        with self._lock:
+            vector = self._lru.get(key)
+            if vector is not None:
+                self._lru.move_to_end(key)
+            return vector
+
+    def _lru_put(self, key, vector):
+        with self._lock:
+            self._lru[key] = vector
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+    def _embed(self, texts: list[str], kind: str, embed_fn) -> list[list[float]]:
+        namespace = self._namespace(kind)
+        keys = [self._key(text) for text in texts]
+
+        vectors = {}
+        for key in keys:
+            vector = self._lru_get((namespace, key))
+            if vector is not None:
+                vectors[key] = vector
+        self.counters["lru_hits"] += len(vectors)
+
+        missing = [key for key in dict.fromkeys(keys) if key not in vectors]
+        if missing and self.disk_cache:
+            for key, value in self.disk_cache.get_many(namespace, missing).items():
+                vector = array("f", value).tolist()
+                vectors[key] = vector
+                self._lru_put((namespace, key), vector)
+                self.counters["disk_hits"] += 1
+
+        missing_texts = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                missing_texts[key] = text
+        self.counters["misses"] += len(missing_texts)
+
+        if missing_texts:
+            new_vectors = embed_fn(list(missing_texts.values()))
+            for key, vector in zip(missing_texts.keys(), new_vectors):
+                vectors[key] = vector
+                self._lru_put((namespace, key), vector)
+
+            if self.disk_cache:
+                self.disk_cache.set_many(namespace, {
+                    key: array("f", vectors[key]).tobytes() for key in missing_texts})
+
+        return [vectors[key] for key in keys]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self._embed(texts, "document", self.embeddings.embed_documents)
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embed([text], "query", lambda texts: [self.embeddings.embed_query(texts[0])])[0]
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        return self._embed(texts, "query", lambda missing: embed_queries(self.embeddings, missing))
+
+    def stats(self) -> dict:
+        hits = self.counters["lru_hits"] + self.counters["disk_hits"]
+        misses = self.counters["misses"]
+        return {
+            "model": self.model_name,
+            "hits": hits,
+            "lru_hits": self.counters["lru_hits"],
+            "disk_hits": self.counters["disk_hits"],
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
+
 
 class VectorDatabase:
-    def __init__(self, collection_name: str):
+    def __init__(self, collection_name: str, embedding_batch_size: int = EMBEDDING_BATCH_SIZE, upsert_batch_size: int = UPSERT_BATCH_SIZE,
+                 embeddings_backend: str = None, qdrant_mode: str = None, qdrant_path: str = None,
+                 collection_profile: str = None):
         self.collection_name = collection_name
+        # Applied to new collections, existing ones are migrated with apply_collection_profile
+        self.collection_profile = get_collection_profile(collection_profile)
+        self.search_params = get_search_params(self.collection_profile)
+        self.embedding_batch_size = embedding_batch_size
+        self.upsert_batch_size = upsert_batch_size
         
         self.uploadcare = Uploadcare(
             public_key=os.environ["UPLOADCARE_PUBLIC_KEY"],
             secret_key=os.environ["UPLOADCARE_SECRET_KEY"]
         )
+        self.image_ingestor = ImageIngestor(self.uploadcare)
         
-        self.client = QdrantClient(
-            url=os.environ["QDRANT_URL"],
-            api_key=os.environ["QDRANT_API_KEY"]
-        )
+        # Backend is selected by EMBEDDINGS_BACKEND unless given explicitly
+        self.embedding_backend = get_embedding_backend(embeddings_backend)
+        self.embeddings = self.embedding_backend.embeddings
+        if self.embedding_backend.cacheable:
+            self.embeddings = CachedEmbeddings(
+                self.embeddings,
+                model_name=self.embedding_backend.model_name,
+                disk_cache=DiskCache(get_cache_path("embeddings.sqlite"), max_bytes=EMBEDDING_CACHE_MAX_BYTES),
+            )
+
+        self.qdrant_mode = qdrant_mode or os.getenv("QDRANT_MODE", QDRANT_HTTP_MODE)
+        self.client = create_qdrant_client(self.qdrant_mode, qdrant_path)
         
         # Create collection if it doesn't exist
         if not self.client.collection_exists(self.collection_name):
             self.client.create_collection(
                 collection_name=self.collection_name,
                 vectors_config=models.VectorParams(
-                    size=1536,  # OpenAI embedding dimension for text-embedding-3-small
-                    distance=models.Distance.COSINE)
+                    size=self.embedding_backend.size,
+                    distance=models.Distance.COSINE,
+                    on_disk=self.collection_profile.on_disk_vectors),
+                hnsw_config=get_hnsw_config(self.collection_profile),
+                quantization_config=get_quantization_config(self.collection_profile),
+                on_disk_payload=self.collection_profile.on_disk_payload,
             )
             
         # Create indecies if not exist
         collection = self.client.get_collection(self.collection_name)
         existing_indices = collection.payload_schema
 
-        if "coordinates" not in existing_indices:
-            self.client.create_payload_index(
-                collection_name=self.collection_name,
-                field_name="coordinates",
-                field_schema="geo",
-            )
-                
-        self.embeddings = OpenAIEmbeddings(
-            model="text-embedding-3-small",
-            openai_api_key=os.environ["OPENAI_API_KEY"]
+        vector_size = collection.config.params.vectors.size
+        if vector_size != self.embedding_backend.size:
+            raise ValueError(
+                f"Collection {self.collection_name} has vector size {vector_size}, "
+                f"embeddings backend {self.embedding_backend.model_name} produces {self.embedding_backend.size}")
+
+        for field_name, field_schema in PAYLOAD_INDEXES.items():
+            if field_name not in existing_indices:
+                self.client.create_payload_index(
+                    collection_name=self.collection_name,
+                    field_name=field_name,
+                    field_schema=field_schema,
+                )
+
+    def apply_collection_profile(self):
+        """Migrate existing collection to current profile, Qdrant rebuilds indexes in background"""
+        profile = self.collection_profile
+        self.client.update_collection(
+            collection_name=self.collection_name,
+            vectors_config={"": models.VectorParamsDiff(on_disk=profile.on_disk_vectors)},
+            hnsw_config=get_hnsw_config(profile),
+            quantization_config=get_quantization_config(profile) or models.Disabled.DISABLED,
+            collection_params=models.CollectionParamsDiff(on_disk_payload=profile.on_disk_payload),
         )
-    
+
     def safe_point_to_activity(self, point: models.PointStruct) -> ActivityDetails:
         activity = ActivityDetails()
         activity.id = point.id
@@ -60,24 +246,56 @@ class VectorDatabase:
                 
         return activity
     
-    def save_activities(self, activities: list[ActivityDetails]):        
-        for activity in activities:
-            # Query for existing documents with same name and full_address
-            # TODO: Consider using local embeddings like FastEmbed instead of OpenAI API calls
-            
-            # Generate ID based on name and full_address
-            composite_id = (activity.name or '') + (activity.full_address or '')
-            activity_uuid = str(uuid.uuid5(
-                uuid.NAMESPACE_URL, composite_id.lower()))
-            # TODO: Can be optimized by calling once before the loop
-            existing_activities = self.get_by_ids([activity_uuid])
-            
-            current_timestamp = int(datetime.now().timestamp())
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts with as few embedding API round trips as possible"""
+        vectors = []
+        for start in range(0, len(texts), self.embedding_batch_size):
+            batch = texts[start:start + self.embedding_batch_size]
+            vectors.extend(self.embeddings.embed_documents(batch))
+
+        return vectors
+
+    def upsert_points(self, points: list[models.PointStruct]):
+        for start in range(0, len(points), self.upsert_batch_size):
+            self.client.upsert(
+                collection_name=self.collection_name,
+                points=points[start:start + self.upsert_batch_size]
+            )
+
+    @staticmethod
+    def get_activity_uuid(activity: ActivityDetails) -> str:
+        # Generate ID based on name and full_address
+        composite_id = (activity.name or '') + (activity.full_address or '')
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, composite_id.lower()))
+
+    def get_embedding_fingerprint(self, activity: ActivityDetails) -> str:
+        return activity.get_embedding_fingerprint(
+            f"{self.embedding_backend.name}:{self.embedding_backend.model_name}")
+
+    def save_activities(self, activities: list[ActivityDetails]):
+        if not activities:
+            return
+
+        # Query for existing documents with same name and full_address in one round trip
+        activity_uuids = [self.get_activity_uuid(activity) for activity in activities]
+        # Vectors are fetched too, so unchanged activities are not re-embedded
+        existing_points = self.client.retrieve(
+            collection_name=self.collection_name,
+            ids=list(dict.fromkeys(activity_uuids)),
+            with_vectors=True
+        )
+        existing_activities = {
+            str(point.id): self.safe_point_to_activity(point) for point in existing_points}
+        existing_vectors = {
+            str(point.id): point.vector for point in existing_points}
+
+        current_timestamp = int(datetime.now().timestamp())
+        for activity, activity_uuid in zip(activities, activity_uuids):
             activity.updated_at = current_timestamp
             activity.created_at = current_timestamp
 
-            if existing_activities:
-                existing_activity = existing_activities[0]
+            existing_activity = existing_activities.get(activity_uuid)
+            if existing_activity:
                 # Id and created_at should remain the same
                 activity.id = existing_activity.id
                 activity.created_at = existing_activity.created_at                
@@ -89,32 +307,45 @@ class VectorDatabase:
                             existing_activity, field))
             else:
                 activity.id = activity_uuid
-                
+
+            activity.start_timestamp = parse_timestamp(activity.start_time)
+
+        # Upload all new images in parallel, known ones are taken from source URL -> CDN URL map
+        cdn_urls = self.image_ingestor.ingest(
+            [activity.image_url for activity in activities],
+            [activity.id for activity in activities])
+        for activity in activities:
             if activity.image_url:
-                try:
-                    ucare_file = self.uploadcare.upload(activity.image_url, store=True, metadata={
-                                                    "activity_id": f"{activity.id}"})
-                    activity.image_url = ucare_file.cdn_url
-                except Exception as e:
-                    logging.error(f"Error uploading image: {e}")
-                    activity.image_url = None
+                activity.image_url = cdn_urls.get(activity.image_url)
+
+        vectors = {}
+        texts_to_embed = {}
+        for activity, activity_uuid in zip(activities, activity_uuids):
+            existing_activity = existing_activities.get(activity_uuid)
+            fingerprint = self.get_embedding_fingerprint(activity)
+            if existing_activity and existing_activity.embedding_fingerprint == fingerprint \
+                    and existing_vectors.get(activity_uuid):
+                vectors[str(activity.id)] = existing_vectors[activity_uuid]
+            else:
+                texts_to_embed[str(activity.id)] = activity.get_embedding_text()
+            activity.embedding_fingerprint = fingerprint
+
+        if texts_to_embed:
+            vectors.update(zip(texts_to_embed.keys(),
+                               self.embed_texts(list(texts_to_embed.values()))))
 
         points = []
         for activity in activities:
-            activity_dump = activity.model_dump()
             points.append(
                 models.PointStruct(
                     id=str(activity.id),
-                    vector=self.embeddings.embed_query(str(activity_dump)),
-                    payload=activity_dump
+                    vector=vectors[str(activity.id)],
+                    payload=activity.model_dump()
                 )
             )
         
         try:
-            self.client.upsert(
-                collection_name=self.collection_name,
-                points=points
-            )
+            self.upsert_points(points)
         except Exception as e:
             logging.error(f"Error upserting activities: {e}")
             raise e
@@ -123,33 +354,47 @@ class VectorDatabase:
         collection = self.client.get_collection(self.collection_name)
         return collection.model_dump()
         
-    def similarity_search(self, query: str, limit: int = 5, geo_filter: dict = None):
-        if geo_filter is None:
-            points = self.client.search(
-                collection_name=self.collection_name,
-                query_vector=self.embeddings.embed_query(query),
-                limit=limit,
-            )
-        else:
-            points = self.client.search(
-                collection_name=self.collection_name,
-                query_vector=self.embeddings.embed_query(query),
-                limit=limit,
-                query_filter=Filter(
-                    must=[
-                        FieldCondition(
-                            key="coordinates",
-                            geo_radius=models.GeoRadius(
-                                center=models.GeoPoint(
-                                    lat=geo_filter["lat"],
-                                    lon=geo_filter["lon"],
-                                ),
-                                radius=geo_filter["radius"],
-                            ),
-                        )
-                    ]
-                ),
+    @staticmethod
+    def build_filter(geo_filter: dict = None, categories: list[str] = None, data_sources: list[str] = None,
+                     updated_after: int = None, starts_after: int = None, starts_before: int = None) -> Filter:
+        """Qdrant filter from structured constraints, all of them should match. Timestamps are epoch seconds"""
+        conditions = []
+        if geo_filter is not None:
+            conditions.append(
+                FieldCondition(
+                    key="coordinates",
+                    geo_radius=models.GeoRadius(
+                        center=models.GeoPoint(
+                            lat=geo_filter["lat"],
+                            lon=geo_filter["lon"],
+                        ),
+                        radius=geo_filter["radius"],
+                    ),
+                )
             )
+        if categories:
+            conditions.append(FieldCondition(key="category", match=models.MatchAny(any=categories)))
+        if data_sources:
+            conditions.append(FieldCondition(key="data_source", match=models.MatchAny(any=data_sources)))
+        if updated_after is not None:
+            conditions.append(FieldCondition(key="updated_at", range=models.Range(gte=updated_after)))
+        if starts_after is not None or starts_before is not None:
+            conditions.append(FieldCondition(
+                key="start_timestamp", range=models.Range(gte=starts_after, lte=starts_before)))
+
+        return Filter(must=conditions) if conditions else None
+
+    def similarity_search(self, query: str, limit: int = 5, geo_filter: dict = None, categories: list[str] = None,
+                          data_sources: list[str] = None, updated_after: int = None,
+                          starts_after: int = None, starts_before: int = None):
+        points = self.client.search(
+            collection_name=self.collection_name,
+            query_vector=self.embeddings.embed_query(query),
+            limit=limit,
+            search_params=self.search_params,
+            query_filter=self.build_filter(
+                geo_filter, categories, data_sources, updated_after, starts_after, starts_before),
+        )
         
         activities = []
         for point in points:
@@ -159,6 +404,42 @@ class VectorDatabase:
 
         return activities
     
+    def similarity_search_batch(self, queries: list[str], limit: int = 5, geo_filter: dict = None,
+                                categories: list[str] = None, data_sources: list[str] = None, updated_after: int = None,
+                                starts_after: int = None, starts_before: int = None) -> list[list[ActivityDetails]]:
+        """Several similarity searches with shared filters: one embedding request and one Qdrant request"""
+        if not queries:
+            return []
+
+        query_filter = self.build_filter(
+            geo_filter, categories, data_sources, updated_after, starts_after, starts_before)
+        vectors = embed_queries(self.embeddings, queries)
+
+        responses = self.client.query_batch_points(
+            collection_name=self.collection_name,
+            requests=[
+                models.QueryRequest(
+                    query=vector,
+                    limit=limit,
+                    filter=query_filter,
+                    params=self.search_params,
+                    with_payload=True,
+                )
+                for vector in vectors
+            ]
+        )
+
+        results = []
+        for response in responses:
+            activities = []
+            for point in response.points:
+                activity = self.safe_point_to_activity(point)
+                activity.similarity_score = point.score
+                activities.append(activity)
+            results.append(activities)
+
+        return results
+
     def get_by_ids(self, ids: list[str]):
         # HACK: Remove "Blank" from ids. The only reason it's there is to make the config work
         cleared_ids = [id for id in ids if id != "Blank"]
@@ -196,7 +477,28 @@ class VectorDatabase:
 
         return activities
 
-    
-    
-    
+    def iter_collection(self, page_size: int = 256, with_vectors: bool = False, scroll_filter: Filter = None):
+        """Walk the whole collection page by page, next page is fetched while current one is consumed.
+
+Yields ActivityDetails, or (ActivityDetails, vector) tuples if with_vectors is set.
+        """
+        def fetch(offset):
+            return self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=scroll_filter,
+                offset=offset,
+                limit=page_size,
+                with_vectors=with_vectors
+            )
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            next_page = executor.submit(fetch, None)
+            while next_page is not None:
+                points, next_offset = next_page.result()
+                next_page = executor.submit(fetch, next_offset) if next_offset is not None else None
+
+                for point in points:
+                    activity = self.safe_point_to_activity(point)
+                    yield (activity, point.vector) if with_vectors else activity
+
     
\ No newline at end of file
@@ -1,22 +1,21 @@
 import re
 import json
+import asyncio
+import uuid
 from urllib.parse import quote
 
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
-from langgraph.prebuilt import create_react_agent
-from langgraph.checkpoint.memory import InMemorySaver
 import numpy as np
 import pandas as pd
 
 
 from integrations.geocoding import PlaceAddressDetails, get_route_plan
-from agents.data_collection_agent import DataCollectionAgent
-from integrations.geocoding import get_datetime_info, get_weather_data
-from integrations.vector_database import VectorDatabase
-import agents.tools as tools_set
+from integrations.geocoding import get_datetime_info, get_local_datetime, get_location_context
+from integrations.route_optimizer import haversine_matrix, optimize_route, parse_hours_of_operation, route_distance
 import agents.prompts as prmt
+from agents.place_index import PlaceIndex
+from agents.result_normalizer import ResultRegistry
 
 import streamlit as st
 from streamlit_helper import COLLECTION_MODE, DISCOVERY_MODE, ITINERARY_MODE, get_plan_description
@@ -29,13 +28,17 @@ from streamlit_helper import (
     streamlit_display_storage,
     load_environment
 )
+from streamlit_resources import (
+    COLLECTION_TOOLS, DISCOVERY_TOOLS, ITINERARY_TOOLS,
+    get_configured_vector_store, get_data_collection_agent, get_react_agent, get_tools
+)
 
 ######## Start here ########
 chat_mode_list = [COLLECTION_MODE, DISCOVERY_MODE, ITINERARY_MODE]
 
-# Initialize session state
-if "memory" not in st.session_state:
-    st.session_state.memory = InMemorySaver()
+# Initialize session state, conversation memory is shared by sessions and separated by thread id
+if "thread_id" not in st.session_state:
+    st.session_state.thread_id = str(uuid.uuid4())
 
 # HACK: Keep this to preserve var in runnable config, otherwise it will be removed
 affected_records = ["Blank"]
@@ -45,7 +48,8 @@ load_environment()
 settings = streamlit_settings(chat_mode_list, COLLECTION_MODE)
 chat_mode = settings["chat_mode"]
 
-vector_store = VectorDatabase(collection_name=settings["base_location"])
+# Clients and compiled graphs are cached across reruns, see streamlit_resources
+vector_store = get_configured_vector_store(settings["base_location"])
 
 if chat_mode == COLLECTION_MODE:
     config = RunnableConfig({
@@ -54,16 +58,19 @@ if chat_mode == COLLECTION_MODE:
         "search_limit": settings["search_limit"],
         "number_of_results": settings["number_of_results"],
         "affected_records": affected_records,
+        "place_index": PlaceIndex(),
+        "result_registry": ResultRegistry(),
+        "projection_stats": [],
         "callbacks": [get_streamlit_cb(st.empty())],
     })
     
 
-    tools = [tools_set.save_results, tools_set.google_organic_search,
-             tools_set.google_events_search, tools_set.google_local_search, tools_set.yelp_search, tools_set.web_page_data_extraction]
-    # tools = [tools_set.save_results, tools_set.yelp_search]
+    tool_names = COLLECTION_TOOLS
+    # tool_names = ("save_results", "yelp_search")
 
-    agent = DataCollectionAgent(vector_store, tools, settings)
-    agent.setup()
+    agent = get_data_collection_agent(
+        settings["base_location"], tool_names, settings["model"], settings["data_collection_prompt"])
+    tools = agent.tools
 
     chat_input = st.chat_input(
         "Type additonal query here to start data collection...")
@@ -77,26 +84,29 @@ if chat_mode == COLLECTION_MODE:
         with st.spinner("Collecting data...", show_time=True):
             messages = [HumanMessage(content=query)]
 
-            result = agent.runnable.invoke(
+            # Async run, search tool calls of one model turn are executed concurrently
+            result = asyncio.run(agent.runnable.ainvoke(
                 input={"messages": messages},
                 config=config
-            )
+            ))
 
         streamlit_report_execution(result, tools)
 
+        projection_stats = config["projection_stats"]
+        if projection_stats:
+            st.caption(f"Search results sent to model: {sum(s['raw_tokens'] for s in projection_stats)} → "
+                       f"{sum(s['projected_tokens'] for s in projection_stats)} tokens")
+
         streamlit_display_storage(vector_store, affected_records)
     else:
         hide_diagram = True if len(tools) > 3 else False
         streamlit_show_home(agent.runnable, tools, "Data collection mode", "data-mining.png",
                                     "Instructions usage:\n\n **Common** - used for all AI LLM calls. Addtionally to that **Data collection** - used for data collection, **Summarize** - used for summarization", hide_diagram)                
 elif chat_mode == DISCOVERY_MODE:
-    model = ChatOpenAI(model="gpt-4o", temperature=0)
-    tools = [tools_set.vector_store_search, tools_set.vector_store_scroll, tools_set.vector_store_by_id,
-             tools_set.vector_store_delete, tools_set.vector_store_metrics]
+    tool_names = DISCOVERY_TOOLS
 
-    memory = st.session_state.memory
-    agent = create_react_agent(name="Discovery",
-        model=model, tools=tools, store=vector_store, checkpointer=memory)
+    agent = get_react_agent("Discovery", settings["base_location"], tool_names, "gpt-4o", with_memory=True)
+    tools = get_tools(tool_names)
 
     chat_input = st.chat_input("Type query to search vector store...")
     if chat_input:
@@ -104,7 +114,7 @@ elif chat_mode == DISCOVERY_MODE:
             "base_location": settings["base_location"],
             "exact_location": settings["exact_location"],
             "search_radius": settings["search_radius"],
-            "thread_id": "1",
+            "thread_id": st.session_state.thread_id,
             "affected_records": affected_records,
             "callbacks": [get_streamlit_cb(st.empty())],
         })
@@ -119,18 +129,17 @@ elif chat_mode == DISCOVERY_MODE:
         streamlit_show_home(agent, tools, "Discovery mode", "qdrant-logo.png",
                                     "Query the cached database (vector store) for existing information", hide_diagram=True)
 else: # Itinerary mode        
-    model = ChatOpenAI(model="gpt-4o", temperature=0)
-    tools = [tools_set.vector_store_search, tools_set.vector_store_metrics]
+    tool_names = ITINERARY_TOOLS
 
-    agent = create_react_agent(name="Itinerary",
-                               model=model, tools=tools, store=vector_store)
+    agent = get_react_agent("Itinerary", settings["base_location"], tool_names, "gpt-4o")
+    tools = get_tools(tool_names)
 
     chat_input = st.chat_input(
         "Type additonal query here to start itinerary generation...")
     if chat_input:
-        datetime_now_info = get_datetime_info(settings["exact_location"]["lat"], settings["exact_location"]["lon"])
-        
-        weather_data = get_weather_data(settings["exact_location"]["lat"], settings["exact_location"]["lon"])
+        # Time zone and weather forecast are looked up concurrently, both are cached by area
+        datetime_now_info, weather_data = get_location_context(
+            settings["exact_location"]["lat"], settings["exact_location"]["lon"])
         
         config = RunnableConfig({
             "base_location": settings["base_location"],
@@ -194,6 +203,7 @@ else: # Itinerary mode
                         longitude=settings["exact_location"]["lon"]
                     )
                     places = [place]
+                    place_ids = [None]
 
                                         
                     # Extract activities list if it exists
@@ -221,33 +231,41 @@ else: # Itinerary mode
                             
                             map_df.loc[len(map_df)] = [place.latitude, place.longitude]
                             places.append(place)
+                            place_ids.append(activity.get("id"))
                 except json.JSONDecodeError:
                     st.error("Failed to parse activities JSON")
                 except Exception as e:
                     st.error(f"Error processing activities: {str(e)}")
                                                 
-                st.write("Route plan with original waypoint order")
-                route_plan = get_route_plan(places)
-                                
-                st.json(route_plan, expanded=False)
-        
-                map_waypoints_param, route_df = get_plan_description(places, route_plan['routes'][0])
-                st.dataframe(route_df, use_container_width=True)
-                
+                # Waypoints are ordered locally, Routes API is called once for the final legs
+                try:
+                    stored_activities = vector_store.get_by_ids([id for id in place_ids if id])
+                except Exception:
+                    # Opening hours are optional, model may return ids which are not in store
+                    stored_activities = []
+                hours_by_id = {str(a.id): a.hours_of_operation for a in stored_activities}
+                # Opening hours of today are scored against local departure time, the time zone
+                # was looked up (and cached) for the date time info above
+                departure = get_local_datetime(settings["exact_location"]["lat"], settings["exact_location"]["lon"])
+                time_windows = [parse_hours_of_operation(hours_by_id.get(id), departure.weekday()) for id in place_ids]
+
+                original_distance = route_distance(
+                    haversine_matrix([p.latitude for p in places], [p.longitude for p in places]), range(len(places)))
+                route_order = optimize_route(
+                    [p.latitude for p in places], [p.longitude for p in places], time_windows,
+                    start_minute=departure.hour * 60 + departure.minute)
+                new_places = [places[idx] for idx in route_order.order]
+
+                map_waypoints_param = "/".join(quote(p.formatted_address) for p in places)
+                st.write(f"Waypoint order optimized: {original_distance / 1000:.1f} km → "
+                         f"{route_order.distance_meters / 1000:.1f} km straight-line distance")
+
                 st.write("Route plan with optimized waypoint order")
-                route_plan = get_route_plan(places, optimize_waypoint_order=True)
+                route_plan = get_route_plan(new_places)
                 st.json(route_plan, expanded=False)
 
-                # Rearange places order according to optimized waypoints
-                route = route_plan['routes'][0]
-                
-                new_places = [places[0]]                
-                for idx in route['optimizedIntermediateWaypointIndex']:
-                    new_places.append(places[idx + 1])                    
-                new_places.append(places[-1])
-                
                 map_waypoints_optimized_param, route_df = get_plan_description(
-                    new_places, route)
+                    new_places, route_plan['routes'][0])
                 st.dataframe(route_df, use_container_width=True)
                 
                 col1, col2 = st.columns([2, 1])
@@ -2,7 +2,6 @@ from datetime import datetime
 from urllib.parse import quote
 from dotenv import load_dotenv
 import pandas as pd
-import requests
 import streamlit as st
 import inspect
 import os
@@ -12,10 +11,11 @@ from streamlit.external.langchain import StreamlitCallbackHandler
 from langchain.callbacks.base import BaseCallbackHandler
 from langchain_core.messages import SystemMessage, AIMessage, HumanMessage, ToolMessage
 from typing import TypeVar, Callable
-from integrations.geocoding import get_location_from_string
+from streamlit_resources import get_cached_location, clear_resources
+from integrations.geocoding import get_current_conditions
 import agents.prompts as prmt
 import json
-from langchain_core.runnables.graph import NodeStyles, MermaidDrawMethod
+from diagram_cache import get_diagram_png
 
 
 COLLECTION_MODE = "Collection"
@@ -54,15 +54,8 @@ def get_streamlit_cb(parent_container: DeltaGenerator) -> BaseCallbackHandler:
 
 def get_weather_today(latitude, longitude):
     """Get current weather data from Google Weather API using coordinates."""
-    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
-        
     try:
-        url = f"https://weather.googleapis.com/v1/currentConditions:lookup?key={api_key}&location.latitude={latitude}&location.longitude={longitude}&unitsSystem=IMPERIAL"
-        
-        response = requests.get(url)
-        response.raise_for_status()  # Raise an exception for bad status codes
-        
-        weather_data = response.json()
+        weather_data = get_current_conditions(latitude, longitude)
         
         if weather_data:
             return {
@@ -125,7 +118,7 @@ def streamlit_settings(chat_mode_list, current_chat_mode=None):
             exact_location = {}
             area_location = area_location if area_location else base_location
             
-            location_details = get_location_from_string(area_location)
+            location_details = get_cached_location(area_location)
             if location_details:
                 st.info(f"📍 {location_details.formatted_address}")
                 exact_location = {
@@ -149,6 +142,9 @@ def streamlit_settings(chat_mode_list, current_chat_mode=None):
             if chat_mode == COLLECTION_MODE:
                 st.selectbox("Web search", ("serpapi"))
 
+            if st.button("Reset clients", help="Rebuild cached clients, agents and geocoding results"):
+                clear_resources()
+
     return {
         "user_preferences": user_preferences,
         "data_collection_prompt": data_collection_prompt,
@@ -176,12 +172,6 @@ def streamlit_show_home(agent, tools, title, image_name, description, hide_diagr
         st.write(description)
         st.divider()
     
-    node_styles = NodeStyles(
-        default='fill:#ff4b4b,line-height:1.2,fill-opacity:0.5, stroke:#ff4b4b',
-        first='fill-opacity:0',
-        last='fill-opacity:0',
-    )
-    
     def _list_tools():
         st.subheader(":gray[Tools]")
         st.write("Tool name and instructions for the agent on when and how using it")
@@ -191,8 +181,8 @@ def streamlit_show_home(agent, tools, title, image_name, description, hide_diagr
     if hide_diagram:
         _list_tools()
     else: 
-        img = agent.get_graph().draw_mermaid_png(node_colors=node_styles,
-                                                 draw_method=MermaidDrawMethod.PYPPETEER)
+        # Rendered once per graph topology, see diagram_cache
+        img = get_diagram_png(agent.get_graph())
 
         col1, col2 = st.columns([1, 2])
 
@@ -304,7 +294,7 @@ def streamlit_report_execution(result, tools):
                         st.write(msg.name)
                         st.error(f"Error parsing tool message: {msg.content}")
                         continue
-                    if msg.name != "save_results":
+                    if msg.name not in ("save_results", "save_selected_results"):
                         for search_type, results in json_content.items():
                             st.markdown(
                                 f"**{msg.name} results**: <a href='{results.get('search_url', '')}' target='_blank'>{results.get('search_query', '')}</a>", unsafe_allow_html=True)
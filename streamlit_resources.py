@@ -0,0 +1,93 @@
+"""Heavyweight clients and compiled graphs shared across Streamlit reruns and sessions.
+
+Every factory is keyed by its arguments (configuration), so a changed setting builds a new resource
+and unchanged ones are reused. clear_resources() drops everything, e.g. after secrets rotation.
+"""
+import os
+from datetime import timedelta
+
+import streamlit as st
+from langchain_openai import ChatOpenAI
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.prebuilt import create_react_agent
+
+import agents.tools as tools_set
+from agents.data_collection_agent import DataCollectionAgent
+from integrations.geocoding import get_location_from_string
+from integrations.vector_database import VectorDatabase
+
+LOCATION_CACHE_TTL = timedelta(days=1)
+
+# Tool sets of chat modes, by name of tool in agents.tools
+COLLECTION_TOOLS = ("save_results", "save_selected_results", "google_organic_search", "google_events_search",
+                    "google_local_search", "yelp_search", "web_page_data_extraction")
+DISCOVERY_TOOLS = ("vector_store_search", "vector_store_scroll", "vector_store_by_id",
+                   "vector_store_delete", "vector_store_metrics")
+ITINERARY_TOOLS = ("vector_store_multi_search", "vector_store_search", "vector_store_metrics")
+
+
+def get_tools(tool_names):
+    return [getattr(tools_set, name) for name in tool_names]
+
+
+@st.cache_resource(show_spinner=False)
+def get_vector_store(collection_name: str, qdrant_mode: str = None, embeddings_backend: str = None,
+                     collection_profile: str = None) -> VectorDatabase:
+    return VectorDatabase(collection_name=collection_name, qdrant_mode=qdrant_mode,
+                          embeddings_backend=embeddings_backend, collection_profile=collection_profile)
+
+
+def get_configured_vector_store(collection_name: str) -> VectorDatabase:
+    """Vector store for collection with connection settings from environment"""
+    return get_vector_store(
+        collection_name,
+        qdrant_mode=os.getenv("QDRANT_MODE"),
+        embeddings_backend=os.getenv("EMBEDDINGS_BACKEND"),
+        collection_profile=os.getenv("QDRANT_COLLECTION_PROFILE"),
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_chat_model(model: str, temperature: float = 0) -> ChatOpenAI:
+    return ChatOpenAI(model=model, temperature=temperature)
+
+
+@st.cache_resource(show_spinner=False)
+def get_data_collection_agent(collection_name: str, tool_names: tuple, model: str, data_collection_prompt: str) -> DataCollectionAgent:
+    settings = {
+        "model": model,
+        "data_collection_prompt": data_collection_prompt,
+    }
+    agent = DataCollectionAgent(get_configured_vector_store(collection_name), get_tools(tool_names), settings)
+    agent.setup()
+
+    return agent
+
+
+@st.cache_resource(show_spinner=False)
+def get_memory_saver() -> InMemorySaver:
+    # Shared by all sessions, conversations are separated by thread_id
+    return InMemorySaver()
+
+
+@st.cache_resource(show_spinner=False)
+def get_react_agent(name: str, collection_name: str, tool_names: tuple, model: str, with_memory: bool = False):
+    return create_react_agent(
+        name=name,
+        model=get_chat_model(model),
+        tools=get_tools(tool_names),
+        store=get_configured_vector_store(collection_name),
+        checkpointer=get_memory_saver() if with_memory else None,
+    )
+
+
+@st.cache_data(show_spinner=False, ttl=LOCATION_CACHE_TTL)
+def get_cached_location(location_str: str):
+    return get_location_from_string(location_str)
+
+
+def clear_resources():
+    """Explicit invalidation: next rerun rebuilds clients, graphs and geocoding results"""
+    for resource in [get_vector_store, get_chat_model, get_data_collection_agent, get_react_agent, get_memory_saver]:
+        resource.clear()
+    get_cached_location.clear()
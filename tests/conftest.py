@@ -33,4 +33,30 @@ def setup_test_env():
     
     # Restore original environment after test
     os.environ.clear()
-    os.environ.update(original_env) 
\ No newline at end of file
+    os.environ.update(original_env) 
+
+@pytest.fixture(autouse=True)
+def isolated_cache(monkeypatch, tmp_path):
+    """Disk caches of every test live in its own temporary directory, so tests making real API calls
+    are not answered from the developer's working cache and do not fill it.
+    """
+    monkeypatch.setenv("SIERGE_CACHE_DIR", str(tmp_path))
+    # Module caches are created on first use, drop the ones created by previous tests
+    monkeypatch.setattr("integrations.geocoding._geocoding_cache", None)
+    monkeypatch.setattr("integrations.serpapi_cache._serpapi_cache", None)
+    monkeypatch.setattr("diagram_cache._disk_cache", None)
+
+@pytest.fixture
+def store_options():
+    """VectorDatabase arguments of the store fixture: offline embeddings, in-memory Qdrant"""
+    return {"embeddings_backend": "hashing", "qdrant_mode": "local"}
+
+@pytest.fixture
+def store(monkeypatch, store_options):
+    """Empty vector store of the test, its caches are in the isolated cache directory"""
+    from integrations.vector_database import VectorDatabase
+
+    monkeypatch.setenv("UPLOADCARE_PUBLIC_KEY", "test_key")
+    monkeypatch.setenv("UPLOADCARE_SECRET_KEY", "test_key")
+
+    return VectorDatabase("test_collection", **store_options)
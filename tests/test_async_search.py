@@ -0,0 +1,91 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+from langgraph.prebuilt import ToolNode
+
+import agents.tools as tools_set
+
+SEARCH_SECONDS = 0.3
+MOCKUPS = {
+    "google_local": "mockups/serpapi-locals-1.json",
+    "google_events": "mockups/serpapi-events-1.json",
+    "yelp": "mockups/serpapi-locals-1.json",
+}
+
+
+@pytest.fixture
+def slow_search(monkeypatch):
+    """Blocking search like SerpAPI client, records the highest number of searches running at once"""
+    running = {"all": 0}
+    peak = {"all": 0}
+    lock = threading.Lock()
+
+    def cached_search(params):
+        engine = params["engine"]
+        with lock:
+            for key in ["all", engine]:
+                running[key] = running.get(key, 0) + 1
+                peak[key] = max(peak.get(key, 0), running[key])
+        time.sleep(SEARCH_SECONDS)
+        with lock:
+            for key in ["all", engine]:
+                running[key] -= 1
+        with open(MOCKUPS[engine]) as f:
+            return json.load(f)
+
+    monkeypatch.setattr(tools_set, "cached_search", cached_search)
+    return peak
+
+
+def run_tool_calls(calls):
+    message = AIMessage(content="", tool_calls=[
+        {"name": name, "args": {"query": query}, "id": f"call_{i}", "type": "tool_call"}
+        for i, (name, query) in enumerate(calls)])
+    config = {"configurable": {
+        "number_of_results": 5,
+        "exact_location": {"lat": 32.7767, "lon": -96.797, "formatted_address": "Dallas, TX, USA"},
+    }}
+    node = ToolNode([tools_set.google_local_search, tools_set.google_events_search, tools_set.yelp_search])
+
+    started = time.perf_counter()
+    result = asyncio.run(node.ainvoke({"messages": [message]}, config))
+    return result["messages"], time.perf_counter() - started
+
+
+def test_tool_calls_of_one_turn_run_concurrently(slow_search):
+    messages, elapsed = run_tool_calls([
+        ("google_local_search", "parks"), ("google_events_search", "concerts"), ("yelp_search", "bbq")])
+
+    assert [message.status for message in messages] == ["success"] * 3
+    assert "local_results" in json.loads(messages[0].content)
+    # Max of latencies rather than sum
+    assert elapsed < SEARCH_SECONDS * 2
+    assert slow_search["all"] == 3
+
+
+def test_searches_are_limited_per_engine_and_in_total(slow_search, monkeypatch):
+    monkeypatch.setattr(tools_set, "SEARCH_FANOUT_LIMIT", 3)
+    monkeypatch.setattr(tools_set, "SEARCH_ENGINE_CONCURRENCY", 2)
+
+    messages, _ = run_tool_calls([("google_local_search", f"query {i}") for i in range(4)] +
+                                 [("google_events_search", f"query {i}") for i in range(2)])
+
+    assert len(messages) == 6
+    assert slow_search["google_local"] == 2
+    assert slow_search["all"] == 3
+
+
+def test_sync_and_async_tool_results_match(slow_search):
+    config = {"configurable": {
+        "number_of_results": 5,
+        "exact_location": {"lat": 32.7767, "lon": -96.797, "formatted_address": "Dallas, TX, USA"},
+    }}
+
+    sync_results = tools_set.google_events_search.invoke({"query": "concerts"}, config)
+    async_results = asyncio.run(tools_set.google_events_search.ainvoke({"query": "concerts"}, config))
+
+    assert sync_results == async_results
@@ -0,0 +1,80 @@
+import json
+import pytest
+
+from agents.activities import ActivityDetails
+from integrations.collection_snapshot import export_jsonl, export_parquet, import_snapshot
+from integrations.vector_database import VectorDatabase
+
+
+@pytest.fixture
+def store(store):
+    store.save_activities([
+        ActivityDetails(
+            name=f"Venue {i}",
+            full_address=f"{i} Main Street, Dallas, TX 75201, USA",
+            coordinates={"lat": 32.7 + i / 100, "lon": -96.8},
+            accessibility_features=["Wheelchair accessible"],
+        )
+        for i in range(25)
+    ])
+
+    return store
+
+
+def test_iter_collection_walks_all_pages(store):
+    activities = list(store.iter_collection(page_size=10))
+    assert len({activity.id for activity in activities}) == 25
+
+    activity, vector = next(store.iter_collection(page_size=10, with_vectors=True))
+    assert len(vector) == store.embedding_backend.size
+
+
+def test_export_jsonl(store, tmp_path):
+    path = tmp_path / "snapshot.jsonl"
+    assert export_jsonl(store, str(path), page_size=10) == 25
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(records) == 25
+    assert {"id", "payload", "vector"} == set(records[0])
+    assert len(records[0]["vector"]) == store.embedding_backend.size
+
+
+def test_export_parquet(store, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "snapshot.parquet"
+    assert export_parquet(store, str(path), page_size=10) == 25
+
+    parquet_file = pq.ParquetFile(str(path))
+    assert parquet_file.metadata.num_rows == 25
+    assert parquet_file.metadata.num_row_groups == 3
+
+    table = parquet_file.read(columns=["name", "coordinates", "vector"])
+    assert table.column("coordinates")[0].as_py()["lon"] == -96.8
+
+
+@pytest.mark.parametrize("file_name", ["snapshot.jsonl", "snapshot.parquet"])
+def test_import_snapshot_round_trip(store, tmp_path, file_name):
+    if file_name.endswith(".parquet"):
+        pytest.importorskip("pyarrow.parquet")
+        export_parquet(store, str(tmp_path / file_name))
+    else:
+        export_jsonl(store, str(tmp_path / file_name))
+
+    target = VectorDatabase("snapshot_target", embeddings_backend="hashing", qdrant_mode="local")
+    assert import_snapshot(target, str(tmp_path / file_name), chunk_size=10) == 25
+
+    source_ids = sorted(activity.id for activity in store.iter_collection())
+    assert sorted(activity.id for activity in target.iter_collection()) == source_ids
+    # Same vectors, same scores
+    assert [round(activity.similarity_score, 5) for activity in target.similarity_search("Venue 3")] == \
+        [round(activity.similarity_score, 5) for activity in store.similarity_search("Venue 3")]
+
+
+def test_import_vector_store_dump(store):
+    """Legacy dump vectors have different size here, so they are re-embedded"""
+    count = import_snapshot(store, "mockups/vector_store.json")
+    assert count == 9
+
+    activity = store.similarity_search("Cafe Izmir Mediterranean Tapas", limit=1)[0]
+    assert activity.name == "Cafe Izmir Mediterranean Tapas"
+    assert activity.location == "3711 Greenville Ave"
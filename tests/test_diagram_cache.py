@@ -0,0 +1,52 @@
+import os
+
+import pytest
+from langchain_core.runnables.graph import NodeStyles
+
+import agents.tools as tools_set
+import diagram_cache
+from agents.data_collection_agent import DataCollectionAgent
+
+
+@pytest.fixture
+def renders(monkeypatch, tmp_path):
+    monkeypatch.setenv("SIERGE_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(diagram_cache, "_disk_cache", None)
+
+    calls = []
+
+    def fake_draw_mermaid_png(mermaid_syntax, draw_method):
+        calls.append(mermaid_syntax)
+        return b"png:" + mermaid_syntax.encode("utf-8")
+
+    monkeypatch.setattr(diagram_cache, "draw_mermaid_png", fake_draw_mermaid_png)
+    return calls
+
+
+def get_graph(monkeypatch, tools):
+    monkeypatch.setenv("OPENAI_API_KEY", "test_key")
+    agent = DataCollectionAgent(None, tools, {"model": "gpt-4o-mini", "data_collection_prompt": ""})
+    agent.setup()
+    return agent.runnable.get_graph()
+
+
+def test_diagram_rendered_once_per_topology(monkeypatch, renders):
+    graph = get_graph(monkeypatch, [tools_set.save_results, tools_set.yelp_search])
+
+    png = diagram_cache.get_diagram_png(graph)
+    assert diagram_cache.get_diagram_png(graph) == png
+    # Same topology built again, e.g. by another session
+    assert diagram_cache.get_diagram_png(get_graph(monkeypatch, [tools_set.save_results])) == png
+    assert len(renders) == 1
+
+    diagram_cache.get_diagram_png(graph, node_styles=NodeStyles(default="fill:#000000"))
+    assert len(renders) == 2
+
+
+def test_prerender_without_secrets(monkeypatch, renders):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    diagram_cache.prerender_diagrams()
+
+    assert len(renders) == 1
+    assert "OPENAI_API_KEY" not in os.environ
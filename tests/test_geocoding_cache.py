@@ -0,0 +1,135 @@
+import pytest
+
+import integrations.geocoding as geocoding
+import integrations.http_client as http_client
+from agents.activities import ActivityDetails
+from agents.tools import add_full_address
+
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"HTTP {self.status_code}")
+
+    def json(self):
+        return self.data
+
+
+class FakeGoogleApis:
+    """Address Validation and Places text search, counts requests per API"""
+
+    def __init__(self):
+        self.calls = {"validate": 0, "places": 0}
+        self.fail = False
+
+    def request(self, method, url, headers=None, json=None, timeout=None):
+        if self.fail:
+            return FakeResponse({}, status_code=500)
+
+        if "addressvalidation" in url:
+            self.calls["validate"] += 1
+            line = json["address"]["addressLines"][0]
+            granularity = "PREMISE" if line[0].isdigit() else "ROUTE"
+            return FakeResponse({"result": {
+                "verdict": {"validationGranularity": granularity},
+                "address": {"formattedAddress": f"{line}, Dallas, TX 75201, USA"},
+                "geocode": {"location": {"latitude": 32.78, "longitude": -96.8}},
+            }})
+
+        self.calls["places"] += 1
+        if "unknown" in json["textQuery"].lower():
+            return FakeResponse({})
+        return FakeResponse({"places": [{
+            "displayName": {"text": json["textQuery"]},
+            "formattedAddress": "100 Main Street",
+            "location": {"latitude": 32.78, "longitude": -96.8},
+        }]})
+
+
+@pytest.fixture
+def apis(monkeypatch, tmp_path):
+    monkeypatch.setenv("SIERGE_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(geocoding, "_geocoding_cache", None)
+
+    apis = FakeGoogleApis()
+    monkeypatch.setattr(http_client, "get_http_session", lambda: apis)
+    return apis
+
+
+def make_activities():
+    return [
+        ActivityDetails(name="Deep Ellum Brewing", location="2823 St Louis St"),
+        ActivityDetails(name="Klyde Warren Park"),
+        ActivityDetails(name="Unknown Venue"),
+    ]
+
+
+def test_recollection_hits_cache(apis):
+    first = make_activities()
+    add_full_address(first, "Dallas", 32.7767, -96.797)
+    calls = dict(apis.calls)
+    assert calls["validate"] + calls["places"] > 0
+
+    # Same venues again, with bias center moved by a few meters and different query case
+    second = make_activities()
+    second[1].name = "klyde warren  PARK"
+    add_full_address(second, "Dallas", 32.77671, -96.79701)
+
+    assert apis.calls == calls
+    assert [a.full_address for a in second] == [a.full_address for a in first]
+    assert second[2].full_address is None
+
+    stats = geocoding.get_geocoding_cache_stats()
+    assert stats[geocoding.PLACE_ADDRESS_NAMESPACE]["hits"] == 2
+    assert stats[geocoding.PLACE_ADDRESS_NAMESPACE]["hit_rate"] == 0.5
+
+
+def test_errors_are_not_cached(apis):
+    apis.fail = True
+    assert geocoding.get_place_address("Klyde Warren Park", 32.7767, -96.797) is None
+
+    apis.fail = False
+    assert geocoding.get_place_address("Klyde Warren Park", 32.7767, -96.797).formatted_address == "100 Main Street"
+    assert apis.calls["places"] == 1
+
+
+def test_geohash_encode():
+    assert geocoding.geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert geocoding.geohash_encode(32.7767, -96.797, 5) == "9vg4m"
+
+
+class FakeGoogleMapsClient:
+    def __init__(self):
+        self.calls = 0
+
+    def timezone(self, location):
+        self.calls += 1
+        return {"status": "OK", "timeZoneId": "America/Chicago"}
+
+
+def test_weather_and_timezone_shared_by_area(apis, monkeypatch):
+    weather_calls = []
+
+    def fake_fetch_weather(endpoint, latitude, longitude, extra_params=""):
+        weather_calls.append(endpoint)
+        return {"forecastDays": [{"latitude": latitude}]}
+
+    gmaps = FakeGoogleMapsClient()
+    monkeypatch.setattr(geocoding, "_fetch_weather", fake_fetch_weather)
+    monkeypatch.setattr(geocoding, "get_googlemaps_client", lambda: gmaps)
+
+    first = geocoding.get_location_context(32.7767, -96.797)
+    # Another user a few hundred meters away
+    second = geocoding.get_location_context(32.7770, -96.799)
+
+    assert second[1] == first[1]
+    assert weather_calls == ["forecast/days"]
+    assert gmaps.calls == 1
+
+    # Other cell
+    geocoding.get_weather_data(33.2, -97.1)
+    assert len(weather_calls) == 2
@@ -0,0 +1,82 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import integrations.http_client as http_client
+from integrations.http_client import TokenBucket
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Answers 503 to the first requests, then 200"""
+    failures = 0
+    requests = 0
+
+    def do_GET(self):
+        FlakyHandler.requests += 1
+        status = 503 if FlakyHandler.requests <= FlakyHandler.failures else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(http_client, "_session", None)
+    monkeypatch.setattr(http_client, "HTTP_BACKOFF_FACTOR", 0.01)
+    monkeypatch.setattr(http_client, "HTTP_BACKOFF_JITTER", 0.01)
+    FlakyHandler.requests = 0
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def test_retries_server_errors(server):
+    FlakyHandler.failures = 2
+    response = http_client.request("weather", "GET", f"{server}/forecast")
+
+    assert response.status_code == 200
+    assert FlakyHandler.requests == 3
+    # Keep-alive session is shared
+    assert http_client.get_http_session() is http_client.get_http_session()
+
+
+def test_gives_up_after_retries(server):
+    FlakyHandler.failures = 100
+    response = http_client.request("weather", "GET", f"{server}/forecast")
+
+    assert response.status_code == 503
+    assert FlakyHandler.requests == http_client.HTTP_RETRIES + 1
+
+
+def test_every_attempt_takes_token(server, monkeypatch):
+    class CountingBucket:
+        tokens = 0
+
+        def acquire(self):
+            CountingBucket.tokens += 1
+
+    monkeypatch.setitem(http_client._rate_limiters, "weather", CountingBucket())
+    FlakyHandler.failures = 2
+    response = http_client.request("weather", "GET", f"{server}/forecast")
+
+    assert response.status_code == 200
+    assert CountingBucket.tokens == FlakyHandler.requests == 3
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=2)
+
+    start = time.monotonic()
+    for _ in range(7):
+        bucket.acquire()
+
+    # Burst of 2, then 5 more at 50 per second
+    assert time.monotonic() - start >= 0.09
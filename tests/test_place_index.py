@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+import agents.tools as tools_set
+from agents.activities import ActivityDetails
+from agents.place_index import PlaceIndex
+from agents.tools import add_full_address, serpapi_search
+from integrations.geocoding import PlaceAddressDetails
+
+
+def search_mockup(place_index, engine, mock_file, result_types):
+    config = {"configurable": {
+        "number_of_results": 5,
+        "exact_location": {"lat": 32.7767, "lon": -96.797},
+        "place_index": place_index,
+    }}
+    return serpapi_search("mockup", engine, config, result_types, mock_file=mock_file)
+
+
+def test_local_results_fill_address_and_coordinates():
+    place_index = PlaceIndex()
+    search_mockup(place_index, "google_local", "mockups/serpapi-locals-1.json", ["local_results"])
+
+    with open("mockups/serpapi-locals-1.json") as f:
+        raw = json.load(f)["local_results"][0]
+
+    # Model re-emits result without coordinates and with slightly different name
+    activity = ActivityDetails(name=raw["title"].upper() + "!", data_source="google_local")
+    place_index.fill_addresses([activity])
+
+    # Address is left for validation, coordinates are only a fallback for it
+    assert activity.full_address is None
+    assert activity.location == raw["address"]
+    assert activity.coordinates is None
+    assert place_index.hits == 1
+
+
+def test_index_address_is_validated_with_coordinates_fallback(monkeypatch):
+    validated = PlaceAddressDetails(name="The Henry", formatted_address="2301 N Akard St #250, Dallas, TX 75201, USA",
+                                    latitude=32.7892, longitude=-96.8056)
+    monkeypatch.setattr(tools_set, "get_validated_address",
+                        lambda location, base_location: validated if location.startswith("2301") else None)
+    monkeypatch.setattr(tools_set, "get_place_address", lambda *args: pytest.fail("Place search is not needed"))
+
+    place_index = PlaceIndex()
+    search_mockup(place_index, "google_local", "mockups/serpapi-locals-1.json", ["local_results"])
+    with open("mockups/serpapi-locals-1.json") as f:
+        raw = json.load(f)["local_results"][1]
+
+    henry = ActivityDetails(name="The Henry", data_source="google_local")
+    other = ActivityDetails(name=raw["title"], data_source="google_local")
+    place_index.fill_addresses([henry, other])
+    add_full_address([henry, other], "Dallas, Texas, United States", 32.7767, -96.797, place_index)
+
+    # Validated address wins, so the activity matches the one saved before
+    assert henry.full_address == validated.formatted_address
+    assert henry.coordinates == {"lat": validated.latitude, "lon": validated.longitude}
+    # Address which does not pass validation keeps search result coordinates
+    assert other.full_address.startswith(raw["address"])
+    assert other.coordinates == {"lat": raw["gps_coordinates"]["latitude"], "lon": raw["gps_coordinates"]["longitude"]}
+
+
+def test_other_locations_fall_through_to_place_search(monkeypatch):
+    found = PlaceAddressDetails(name="Found", formatted_address="1 Main St, Dallas, TX 75201, USA",
+                                latitude=32.78, longitude=-96.8)
+    monkeypatch.setattr(tools_set, "get_validated_address",
+                        lambda location, base_location: found if location == found.formatted_address else None)
+    monkeypatch.setattr(tools_set, "get_place_address", lambda *args: found)
+
+    place_index = PlaceIndex()
+    search_mockup(place_index, "google_local", "mockups/serpapi-locals-1.json", ["local_results"])
+    with open("mockups/serpapi-locals-1.json") as f:
+        raw = json.load(f)["local_results"][1]
+
+    # Model-supplied coordinates, and location which is not the address of the indexed result
+    model = ActivityDetails(name="Unknown place", location="Uptown", coordinates={"lat": 1.0, "lon": 2.0})
+    other = ActivityDetails(name=raw["title"], location="Downtown", data_source="google_local")
+    add_full_address([model, other], "Dallas, Texas, United States", 32.7767, -96.797, place_index)
+
+    for activity in [model, other]:
+        assert activity.full_address == found.formatted_address
+        assert activity.coordinates == {"lat": found.latitude, "lon": found.longitude}
+
+
+def test_event_address_becomes_location():
+    place_index = PlaceIndex()
+    search_mockup(place_index, "google_events", "mockups/serpapi-events-1.json", ["events_results"])
+
+    by_title = ActivityDetails(name="Dallas Live Music Series: Engaging Our Community with the Arts in our Parks")
+    by_venue = ActivityDetails(name="Kiest Park", data_source="yelp")
+    unknown = ActivityDetails(name="Somewhere else")
+    place_index.fill_addresses([by_title, by_venue, unknown])
+
+    # No coordinates in event results, address is left for validation
+    assert by_title.full_address is None
+    assert by_title.location == "Kiest Park, 3080 S Hampton Rd, Dallas, TX"
+    assert by_venue.location == by_title.location
+    assert unknown.location is None
+    assert (place_index.hits, place_index.misses) == (2, 1)
@@ -0,0 +1,121 @@
+import pytest
+
+import agents.tools as tools_set
+from agents.activities import ResultSelection, SelectedResults
+from agents.place_index import PlaceIndex
+from agents.result_normalizer import ResultRegistry, normalize_event_result, normalize_yelp_result
+from agents.result_projection import project_results
+from agents.tools import save_selected_results, serpapi_search
+from integrations.geocoding import PlaceAddressDetails
+
+
+def search_config(**configurable):
+    return {"configurable": {
+        "number_of_results": 5,
+        "base_location": "Dallas, Texas, United States",
+        "exact_location": {"lat": 32.7767, "lon": -96.797},
+        **configurable,
+    }}
+
+
+def test_local_results_are_normalized_with_stable_ids():
+    registry = ResultRegistry()
+    config = search_config(result_registry=registry)
+    results = serpapi_search("mockup", "google_local", config, ["local_results"], mock_file="mockups/serpapi-locals-1.json")
+
+    first = results["local_results"]["search_results"][0]
+    activity = registry.get(first["result_id"])
+    assert activity.name == "The Henry"
+    assert activity.location == "2301 N Akard St Suite 250"
+    assert activity.description == "American. Dog friendly spot!!"
+    assert activity.cost == "$$"
+    # Live open/closed status is not hours of operation
+    assert activity.hours_of_operation is None
+    assert activity.data_source == "google_local"
+    assert len(registry.activities) == len(results["local_results"]["search_results"])
+
+    # Same results searched again get the same ids
+    again = serpapi_search("mockup", "google_local", search_config(result_registry=ResultRegistry()),
+                           ["local_results"], mock_file="mockups/serpapi-locals-1.json")
+    assert again["local_results"]["search_results"][0]["result_id"] == first["result_id"]
+
+
+def test_event_and_yelp_results_are_normalized():
+    event = normalize_event_result({
+        "title": "Jazz Night",
+        "date": {"start_date": "Apr 17", "when": "Thu, Apr 17, 6:30 – 8:00 PM"},
+        "address": ["Kiest Park, 3080 S Hampton Rd", "Dallas, TX"],
+        "link": "https://example.com/jazz",
+        "ticket_info": [{"source": "Eventbrite.com", "link": "https://eventbrite.com/jazz", "link_type": "tickets"}],
+    }, "google_events")
+    assert event.start_time == "Thu, Apr 17, 6:30 – 8:00 PM"
+    assert event.location == "Kiest Park, 3080 S Hampton Rd, Dallas, TX"
+    assert event.booking_info == "Eventbrite.com: https://eventbrite.com/jazz"
+
+    place = normalize_yelp_result({
+        "title": "Pecan Lodge",
+        "categories": [{"title": "Barbeque"}, {"title": "Southern"}],
+        "snippet": "Best brisket in town",
+        "neighborhoods": "Deep Ellum",
+        "price": "$$",
+        "link": "https://www.yelp.com/biz/pecan-lodge-dallas",
+    }, "yelp")
+    assert place.description == "Barbeque, Southern. Best brisket in town"
+    assert place.location == "Deep Ellum"
+
+
+def test_projected_results_carry_result_id():
+    config = search_config(result_registry=ResultRegistry())
+    results = serpapi_search("mockup", "google_local", config, ["local_results"], mock_file="mockups/serpapi-locals-1.json")
+
+    projected = project_results(results, "google_local")
+    assert all("result_id" in item for item in projected["local_results"]["search_results"])
+
+
+def test_selected_results_are_saved_without_reemitting(store, monkeypatch):
+    validated = PlaceAddressDetails(name="The Henry", formatted_address="2301 N Akard St #250, Dallas, TX 75201, USA",
+                                    latitude=32.7892, longitude=-96.8056)
+    monkeypatch.setattr(tools_set, "get_validated_address",
+                        lambda location, base_location: validated if location.startswith("2301") else None)
+    monkeypatch.setattr(tools_set, "get_place_address", lambda *args: pytest.fail("Place search is not needed"))
+
+    registry = ResultRegistry()
+    config = search_config(result_registry=registry, place_index=PlaceIndex(), affected_records=[])
+    results = serpapi_search("mockup", "google_local", config, ["local_results"], mock_file="mockups/serpapi-locals-1.json")
+    for item in results["local_results"]["search_results"]:
+        # Images are uploaded on save, keep test offline
+        item.pop("thumbnail", None)
+    registry.add_results(results)  # re-register without images
+    ids = [item["result_id"] for item in results["local_results"]["search_results"][:3]]
+
+    response = save_selected_results.func(SelectedResults(selections=[
+        ResultSelection(result_id=ids[0], category="Food & Drink Experiences"),
+        ResultSelection(result_id=ids[1], category="Food & Drink Experiences"),
+        ResultSelection(result_id=ids[2], category="Food & Drink Experiences", description="Rooftop bar"),
+        ResultSelection(result_id="unknown", category="Other"),
+    ]), config, store)
+
+    assert response["records_affected"] == 3
+    assert response["unknown_result_ids"] == ["unknown"]
+
+    saved = {activity.name: activity for activity in store.get_by_ids(config["configurable"]["affected_records"])}
+    henry = saved["The Henry"]
+    assert all(activity.category == "Food & Drink Experiences" for activity in saved.values())
+    # Search result address is normalized by address validation, no place search is needed
+    assert henry.full_address == "2301 N Akard St #250, Dallas, TX 75201, USA"
+    assert henry.coordinates == {"lat": 32.7892, "lon": -96.8056}
+    assert "Rooftop bar" in [activity.description for activity in saved.values()]
+    # Registered result is not changed by annotations
+    assert registry.get(ids[0]).category == "Other"
+
+
+def test_selected_results_without_registry_are_unknown(store):
+    config = search_config(affected_records=[])
+
+    response = save_selected_results.func(SelectedResults(selections=[
+        ResultSelection(result_id="a1b2c3d4", category="Other"),
+        ResultSelection(result_id="e5f6a7b8", category="Other")]), config, store)
+
+    assert response["records_affected"] == 0
+    assert response["unknown_result_ids"] == ["a1b2c3d4", "e5f6a7b8"]
+    assert config["configurable"]["affected_records"] == []
@@ -0,0 +1,87 @@
+import json
+
+from agents.result_projection import MAX_TEXT_LENGTH, project_item, project_tool_results
+from agents.tools import serpapi_search
+
+
+def search_mockup(engine, mock_file, result_types):
+    config = {"configurable": {
+        "number_of_results": 5,
+        "exact_location": {"lat": 32.7767, "lon": -96.797},
+    }}
+    return serpapi_search("mockup", engine, config, result_types, mock_file=mock_file)
+
+
+def test_local_results_keep_activity_fields_only():
+    raw = search_mockup("google_local", "mockups/serpapi-locals-1.json", ["local_results"])
+    config = {"configurable": {"projection_stats": []}}
+
+    projected = project_tool_results("google_local_search", raw, "google_local", config)
+
+    descriptor = projected["local_results"]
+    assert descriptor["data_source"] == raw["local_results"]["data_source"]
+    first = descriptor["search_results"][0]
+    assert first["title"] == raw["local_results"]["search_results"][0]["title"]
+    assert "address" in first
+    for dropped in ["place_id", "place_id_search", "gps_coordinates", "thumbnail", "serpapi_link"]:
+        assert dropped not in first
+
+    stats = config["configurable"]["projection_stats"]
+    assert len(stats) == 1
+    assert stats[0]["tool"] == "google_local_search"
+    assert stats[0]["projected_bytes"] < stats[0]["raw_bytes"] / 2
+    assert stats[0]["projected_tokens"] < stats[0]["raw_tokens"]
+
+
+def test_event_nested_values_are_projected():
+    raw = search_mockup("google_events", "mockups/serpapi-events-1.json", ["events_results"])
+
+    projected = project_tool_results("google_events_search", raw, "google_events")
+
+    event = projected["events_results"]["search_results"][0]
+    assert set(event["venue"]) <= {"name", "link"}
+    assert all(set(ticket) <= {"source", "link", "type"} for ticket in event["ticket_info"])
+    assert len(event["ticket_info"]) <= 3
+    assert "event_location_map" not in event
+    assert len(json.dumps(projected)) < len(json.dumps(raw))
+
+
+def test_long_text_and_lists_are_truncated():
+    item = {
+        "title": "Place",
+        "description": "word " * 200,
+        "extensions": ["a", "b", "c", "d", "e"],
+        "serpapi_link": "https://serpapi.com/search.json?engine=google",
+        "rating": 4.5,
+        "price": "",
+    }
+
+    projected = project_item(item, ["title", "description", "extensions", "rating", "price"])
+
+    assert projected["title"] == "Place"
+    assert len(projected["description"]) <= MAX_TEXT_LENGTH + 1
+    assert projected["description"].endswith("…")
+    assert projected["extensions"] == ["a", "b", "c"]
+    assert projected["rating"] == 4.5
+    assert "price" not in projected
+    assert "serpapi_link" not in projected
+
+
+def test_links_are_not_truncated():
+    raw = search_mockup("google", "mockups/serpapi-2.json", ["knowledge_graph"])
+    reviews = raw["knowledge_graph"]["search_results"]["reviews"]
+    assert len(reviews) > MAX_TEXT_LENGTH
+
+    projected = project_tool_results("google_organic_search", raw, "google")
+
+    assert projected["knowledge_graph"]["search_results"]["reviews"] == reviews
+
+    long_link = "https://example.com/" + "a" * 400
+    projected = project_item({"link": long_link, "image_url": long_link, "links": {"website": long_link}},
+                             ["link", "image_url", "links"])
+    assert projected == {"link": long_link, "image_url": long_link, "links": {"website": long_link}}
+
+
+def test_errors_are_passed_through():
+    raw = {"error": "Invalid API key"}
+    assert project_tool_results("yelp_search", raw, "yelp") == raw
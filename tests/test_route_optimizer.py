@@ -0,0 +1,66 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from integrations.route_optimizer import (
+    haversine_matrix, optimize_route, parse_hours_of_operation, route_distance)
+
+
+def test_haversine_matrix():
+    # Dallas to Fort Worth, about 49 km
+    distances = haversine_matrix([32.7767, 32.7555], [-96.7970, -97.3308])
+    assert distances[0, 1] == pytest.approx(49_900, rel=0.02)
+    assert distances[1, 0] == distances[0, 1]
+    assert distances[0, 0] == 0
+
+
+@pytest.mark.parametrize("hours, weekday, window", [
+    ("10 AM - 5 PM", None, (600, 1020)),
+    ("1 - 4 PM", 2, (780, 960)),
+    ("11:00am–2:00am", None, (660, 1560)),
+    ("Open 24 hours", None, (0, 1440)),
+    ("Varies", 0, None),
+    (None, 0, None),
+    # Hours by day: today's range, none when today is unknown or not listed
+    ("Mon-Fri 9am to 5pm", 4, (540, 1020)),
+    ("Mon-Fri 9am to 5pm", 5, None),
+    ("Mon-Fri 9am to 5pm", None, None),
+    ("Mon-Fri 9am - 5pm, Sat, Sun 10am - 2pm", 6, (600, 840)),
+    ("Fri-Mon 4 PM - 11 PM", 0, (960, 1380)),
+    ("Monday: 10 AM–5 PM; Tuesday: 11 AM–9 PM; Wednesday: Closed", 1, (660, 1260)),
+    ("Monday: 10 AM–5 PM; Tuesday: 11 AM–9 PM; Wednesday: Closed", 2, None),
+    ("Open until sunset, 6 AM - 8 PM", 3, (360, 1200)),
+])
+def test_parse_hours_of_operation(hours, weekday, window):
+    assert parse_hours_of_operation(hours, weekday) == window
+
+
+def test_order_close_to_optimal():
+    rng = np.random.default_rng(7)
+    for _ in range(20):
+        latitudes = 32.78 + rng.normal(scale=0.05, size=8)
+        longitudes = -96.8 + rng.normal(scale=0.05, size=8)
+
+        route = optimize_route(latitudes, longitudes)
+        assert route.order[0] == 0 and route.order[-1] == 7
+        assert sorted(route.order) == list(range(8))
+
+        distances = haversine_matrix(latitudes, longitudes)
+        optimal = min(route_distance(distances, [0, *middle, 7]) for middle in itertools.permutations(range(1, 7)))
+        assert route.distance_meters <= optimal * 1.1
+
+
+def test_time_windows_move_closing_place_first():
+    # Start, then three places in line, the farthest one closes soon after departure
+    latitudes = [32.70, 32.71, 32.72, 32.73, 32.74]
+    longitudes = [-96.8] * 5
+    time_windows = [None, None, None, (600, 640), None]
+
+    assert optimize_route(latitudes, longitudes).order == [0, 1, 2, 3, 4]
+    # Without departure time lateness can't be scored
+    assert optimize_route(latitudes, longitudes, time_windows).order == [0, 1, 2, 3, 4]
+
+    route = optimize_route(latitudes, longitudes, time_windows, start_minute=600)
+    assert route.order[1] == 3
+    assert route.lateness_minutes == 0
@@ -0,0 +1,67 @@
+import pytest
+
+import integrations.serpapi_cache as serpapi_cache
+from agents.tools import serpapi_search
+
+
+class FakeGoogleSearch:
+    calls = []
+
+    def __init__(self, params):
+        self.params = params
+
+    def get_json(self):
+        FakeGoogleSearch.calls.append(self.params)
+        return {
+            "search_metadata": {"google_local_url": "https://www.google.com/search?q=x"},
+            "search_parameters": {"q": self.params["q"]},
+            "local_results": [{"title": f"Result {len(FakeGoogleSearch.calls)}"}],
+        }
+
+
+@pytest.fixture
+def searches(monkeypatch, tmp_path):
+    monkeypatch.setenv("SIERGE_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(serpapi_cache, "_serpapi_cache", None)
+    monkeypatch.setattr(serpapi_cache, "GoogleSearch", FakeGoogleSearch)
+    FakeGoogleSearch.calls = []
+    return FakeGoogleSearch.calls
+
+
+def search(query, lat=32.7767, lon=-96.797):
+    config = {"configurable": {"number_of_results": 5, "exact_location": {"lat": lat, "lon": lon}}}
+    results = serpapi_search(query, "google_local", config, ["local_results"])
+    return results["local_results"]["search_results"][0]["title"]
+
+
+def test_repeated_search_from_same_area_is_replayed(searches):
+    assert search("jazz bars") == "Result 1"
+    # Few hundred meters away
+    assert search("jazz bars", lat=32.7771, lon=-96.7968) == "Result 1"
+    assert len(searches) == 1
+
+    assert search("jazz bars", lat=32.9, lon=-96.7) == "Result 2"
+    assert search("rooftop bars") == "Result 3"
+    assert serpapi_cache.get_serpapi_cache_stats()["hits"] == 1
+
+
+def test_expired_response_is_searched_again(searches, monkeypatch):
+    search("jazz bars")
+    monkeypatch.setitem(serpapi_cache.SERPAPI_CACHE_TTLS, "google_local", -1)
+
+    assert search("jazz bars") == "Result 2"
+
+
+def test_record_and_offline_modes(searches, monkeypatch):
+    monkeypatch.setenv("SERPAPI_CACHE_MODE", "record")
+    search("jazz bars")
+    assert search("jazz bars") == "Result 2"
+
+    monkeypatch.setenv("SERPAPI_CACHE_MODE", "offline")
+    monkeypatch.setitem(serpapi_cache.SERPAPI_CACHE_TTLS, "google_local", -1)
+    assert search("jazz bars") == "Result 2"
+    assert len(searches) == 2
+
+    config = {"configurable": {"number_of_results": 5, "exact_location": {"lat": 32.7767, "lon": -96.797}}}
+    assert "error" in serpapi_search("not recorded", "google_local", config, ["local_results"])
+    assert len(searches) == 2
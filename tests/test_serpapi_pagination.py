@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import agents.tools as tools_set
+from integrations.serpapi_pagination import get_page_params, merge_pages, paginated_search
+
+SEARCH_SECONDS = 0.2
+
+
+def local_page(start, count, last=False):
+    page = {
+        "search_metadata": {"google_local_url": "https://www.google.com/search"},
+        "search_parameters": {"q": "parks"},
+        "local_results": [{"place_id": str(i), "title": f"Park {i}"} for i in range(start, start + count)],
+    }
+    if not last:
+        page["serpapi_pagination"] = {"next": f"https://serpapi.com/search.json?start={start + count}"}
+    return page
+
+
+class FakeSearch:
+    """Blocking search returning 45 local results in pages of 20"""
+
+    def __init__(self, total=45, failing_start=None):
+        self.total = total
+        self.failing_start = failing_start
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, params):
+        with self._lock:
+            self.calls.append(params)
+        time.sleep(SEARCH_SECONDS)
+
+        start = params.get("start", 0)
+        if start == self.failing_start:
+            raise ConnectionError("Connection reset")
+        if start >= self.total:
+            return {"error": "Google hasn't returned any results for this query."}
+        count = min(20, self.total - start)
+        return local_page(start, count, last=start + count >= self.total)
+
+
+def search_params(num):
+    return {"engine": "google_local", "q": "parks", "num": num}
+
+
+def test_pages_needed_for_number_of_results():
+    assert get_page_params(search_params(20)) == [search_params(20)]
+    assert [page.get("start", 0) for page in get_page_params(search_params(45))] == [0, 20, 40]
+    # Limited by SERPAPI_MAX_PAGES
+    assert len(get_page_params(search_params(500))) == 3
+    # Unknown engine is not paginated, Google search returns num results in one page
+    assert len(get_page_params({"engine": "google_maps", "num": 100})) == 1
+    assert get_page_params({"engine": "google", "num": 20}) == [{"engine": "google", "num": 20}]
+
+
+def test_pages_are_fetched_concurrently_and_merged():
+    search = FakeSearch()
+
+    started = time.perf_counter()
+    results = paginated_search(search_params(45), search)
+    elapsed = time.perf_counter() - started
+
+    assert len(search.calls) == 3
+    assert elapsed < SEARCH_SECONDS * 2
+    assert [item["place_id"] for item in results["local_results"]] == [str(i) for i in range(45)]
+    assert results["search_parameters"] == {"q": "parks"}
+
+
+def test_async_pages_are_fetched_within_one_search_slot(monkeypatch):
+    search = FakeSearch()
+    monkeypatch.setattr(tools_set, "cached_search", search)
+    monkeypatch.setattr(tools_set, "SEARCH_ENGINE_CONCURRENCY", 2)
+    config = {"configurable": {
+        "number_of_results": 45,
+        "exact_location": {"lat": 32.7767, "lon": -96.797, "formatted_address": "Dallas, TX, USA"},
+    }}
+
+    started = time.perf_counter()
+    results = asyncio.run(tools_set.aserpapi_search("parks", "google_local", config, ["local_results"]))
+    elapsed = time.perf_counter() - started
+
+    assert len(search.calls) == 3
+    # Three pages take one search latency, not two rounds limited by engine concurrency
+    assert elapsed < SEARCH_SECONDS * 1.8
+    assert len(results["local_results"]["search_results"]) == 45
+
+
+def test_merge_cuts_off_at_requested_count_and_last_page():
+    search = FakeSearch(total=30)
+
+    results = paginated_search(search_params(60), search)
+
+    # Third page is past the last page, its error is not merged
+    assert "error" not in results
+    assert len(results["local_results"]) == 30
+
+    results = paginated_search(search_params(25), FakeSearch())
+    assert len(results["local_results"]) == 25
+
+
+def test_events_end_is_detected_by_short_page():
+    def events_page(start, count):
+        # Events responses have no serpapi_pagination
+        return {"events_results": [{"title": f"Event {i}", "link": str(i)} for i in range(start, start + count)]}
+
+    results = merge_pages([events_page(0, 10), events_page(10, 4), events_page(14, 10)], 30, "google_events")
+    assert [item["link"] for item in results["events_results"]] == [str(i) for i in range(14)]
+
+    results = merge_pages([events_page(0, 7), events_page(7, 10)], 20, "google_events")
+    assert len(results["events_results"]) == 7
+
+
+def test_merge_deduplicates_results():
+    first = local_page(0, 20)
+    second = local_page(15, 20)
+
+    results = merge_pages([first, second], 40, "google_local")
+
+    assert [item["place_id"] for item in results["local_results"]] == [str(i) for i in range(35)]
+
+
+def test_failed_following_page_is_skipped():
+    results = paginated_search(search_params(60), FakeSearch(failing_start=20))
+    assert len(results["local_results"]) == 20
+
+    with pytest.raises(ConnectionError):
+        paginated_search(search_params(60), FakeSearch(failing_start=0))
+
+
+def test_search_tools_paginate(monkeypatch):
+    search = FakeSearch()
+    monkeypatch.setattr(tools_set, "cached_search", search)
+    config = {"configurable": {
+        "number_of_results": 45,
+        "exact_location": {"lat": 32.7767, "lon": -96.797, "formatted_address": "Dallas, TX, USA"},
+    }}
+
+    sync_results = tools_set.serpapi_search("parks", "google_local", config, ["local_results"])
+    async_results = asyncio.run(tools_set.aserpapi_search("parks", "google_local", config, ["local_results"]))
+
+    assert len(sync_results["local_results"]["search_results"]) == 45
+    assert sync_results == async_results
+    assert len(search.calls) == 6
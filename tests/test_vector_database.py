@@ -0,0 +1,280 @@
+import calendar
+import pytest
+from collections import Counter
+from datetime import datetime
+
+import integrations.embeddings as embeddings
+import integrations.vector_database as vdb
+from agents.activities import ActivityDetails
+from agents.tools import vector_store_multi_search, vector_store_search
+from qdrant_client import QdrantClient
+
+
+class CountingQdrantClient:
+    """In-memory Qdrant client which counts calls per method"""
+
+    def __init__(self, **kwargs):
+        self.client = QdrantClient(":memory:")
+        self.calls = Counter()
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+        if not callable(attr):
+            return attr
+
+        def wrapper(*args, **kwargs):
+            self.calls[name] += 1
+            return attr(*args, **kwargs)
+
+        return wrapper
+
+
+class FakeEmbeddings:
+    def __init__(self, **kwargs):
+        self.calls = Counter()
+
+    def embed_documents(self, texts):
+        self.calls["embed_documents"] += 1
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        self.calls["embed_query"] += 1
+        return self._vector(text)
+
+    @staticmethod
+    def _vector(text):
+        return [float(len(text) % 5 + 1)] + [1.0] * 1535
+
+
+class FakeUploadcare:
+    cdn_base = "https://ucarecdn.com/"
+
+    def __init__(self, **kwargs):
+        self.uploads = []
+
+    def upload(self, url, store=None, metadata=None):
+        self.uploads.append(url)
+        file = type("File", (), {})()
+        file.cdn_url = f"{self.cdn_base}{len(self.uploads)}/"
+        return file
+
+
+@pytest.fixture
+def store_options(monkeypatch):
+    """Default (OpenAI) embeddings backend with fake embeddings, Qdrant and Uploadcare clients"""
+    monkeypatch.setattr(vdb, "QdrantClient", CountingQdrantClient)
+    monkeypatch.setattr(embeddings, "OpenAIEmbeddings", FakeEmbeddings)
+    monkeypatch.setattr(vdb, "Uploadcare", FakeUploadcare)
+
+    return {}
+
+
+def make_activities(count, description="Initial description"):
+    return [
+        ActivityDetails(
+            name=f"Venue {i}",
+            full_address=f"{i} Main Street, Dallas, TX 75201, USA",
+            description=description,
+        )
+        for i in range(count)
+    ]
+
+
+def test_save_activities_single_lookup_and_embedding(store):
+    """Saving N activities costs one retrieve, one embedding request and one upsert"""
+    store.save_activities(make_activities(20))
+
+    assert store.client.calls["retrieve"] == 1
+    assert store.client.calls["upsert"] == 1
+    assert store.embeddings.embeddings.calls["embed_documents"] == 1
+    assert store.embeddings.embeddings.calls["embed_query"] == 0
+
+
+def test_save_activities_merges_existing(store):
+    """Existing records keep id and created_at and fill missing fields"""
+    first = make_activities(5)
+    first[0].cost = "$$"
+    store.save_activities(first)
+    created_at = {activity.id: activity.created_at for activity in first}
+    store.client.calls.clear()
+
+    second = make_activities(5, description="Updated description")
+    store.save_activities(second)
+
+    assert store.client.calls["retrieve"] == 1
+    assert [activity.id for activity in second] == [activity.id for activity in first]
+    assert all(activity.created_at == created_at[activity.id] for activity in second)
+    assert second[0].cost == "$$"
+    assert second[0].description == "Updated description"
+
+
+def test_embedding_cache_hits(store):
+    """Repeated queries and texts are served from LRU and disk cache"""
+    store.similarity_search("live music with patio")
+    store.similarity_search("live music with patio")
+    assert store.embeddings.embeddings.calls["embed_query"] == 1
+
+    # Fresh process: empty LRU, same disk cache
+    cold = vdb.CachedEmbeddings(FakeEmbeddings(), store.embeddings.model_name, store.embeddings.disk_cache)
+    vectors = cold.embed_documents(["a", "b", "a"])
+    assert cold.embeddings.calls["embed_documents"] == 1
+    assert cold.embed_documents(["b", "a"]) == [vectors[1], vectors[0]]
+    assert cold.embed_query("live music with patio") == store.embeddings.embed_query("live music with patio")
+    assert cold.embeddings.calls == {"embed_documents": 1}
+
+    stats = cold.stats()
+    assert stats["misses"] == 2
+    assert stats["disk_hits"] == 1
+    assert stats["lru_hits"] == 2
+
+
+def test_save_activities_skips_unchanged_embeddings(store):
+    """Re-saving semantically identical activities reuses stored vectors"""
+    store.save_activities(make_activities(5))
+    store.embeddings.embeddings.calls.clear()
+
+    store.save_activities(make_activities(5))
+    assert store.embeddings.embeddings.calls["embed_documents"] == 0
+
+    changed = make_activities(5)
+    changed[0].description = "Rooftop bar"
+    store.save_activities(changed)
+    assert store.embeddings.embeddings.calls["embed_documents"] == 1
+
+
+def test_save_activities_reembeds_with_another_model(store, monkeypatch):
+    """Vectors of the same size built by another embedding model are not reused"""
+    store.save_activities(make_activities(2))
+    embedded = []
+    embed_texts = store.embed_texts
+    monkeypatch.setattr(store, "embed_texts", lambda texts: embedded.extend(texts) or embed_texts(texts))
+
+    store.save_activities(make_activities(2))
+    assert embedded == []
+
+    store.embedding_backend = store.embedding_backend._replace(model_name="text-embedding-ada-002")
+    store.save_activities(make_activities(2))
+    assert len(embedded) == 2
+
+
+def test_embedding_text_is_canonical():
+    activity = ActivityDetails(
+        id="1", created_at=1, updated_at=2, similarity_score=0.5,
+        image_url="https://ucarecdn.com/image.png",
+        name="  Venue   1 ", cost="N/A", category="Shopping",
+        accessibility_features=["Wheelchair accessible", ""])
+    same_activity = ActivityDetails(
+        name="Venue 1", category="Shopping", accessibility_features=["Wheelchair accessible"])
+
+    assert activity.get_embedding_text() == \
+        "category: Shopping\nname: Venue 1\naccessibility_features: Wheelchair accessible"
+    assert activity.get_embedding_fingerprint("openai:text-embedding-3-small") == \
+        same_activity.get_embedding_fingerprint("openai:text-embedding-3-small")
+    assert activity.get_embedding_fingerprint("openai:text-embedding-3-small") != \
+        activity.get_embedding_fingerprint("fastembed:BAAI/bge-small-en-v1.5")
+
+
+def test_save_activities_uploads_each_image_once(store):
+    activities = make_activities(4)
+    activities[0].image_url = "https://serpapi.com/thumbnail-1.jpg"
+    activities[1].image_url = "https://serpapi.com/thumbnail-1.jpg"
+    activities[2].image_url = "https://ucarecdn.com/existing/"
+    store.save_activities(activities)
+
+    assert store.uploadcare.uploads == ["https://serpapi.com/thumbnail-1.jpg"]
+    assert activities[0].image_url == activities[1].image_url == "https://ucarecdn.com/1/"
+    assert activities[2].image_url == "https://ucarecdn.com/existing/"
+    assert activities[3].image_url is None
+
+    # Persistent source URL -> CDN URL map survives new store instance
+    other_store = vdb.VectorDatabase("test_collection")
+    activities = make_activities(1)
+    activities[0].image_url = "https://serpapi.com/thumbnail-1.jpg"
+    other_store.save_activities(activities)
+
+    assert other_store.uploadcare.uploads == []
+    assert activities[0].image_url == "https://ucarecdn.com/1/"
+
+
+def test_hashing_backend_runs_offline(store):
+    offline_store = vdb.VectorDatabase("offline_collection", embeddings_backend="hashing", qdrant_mode="local")
+
+    assert offline_store.embedding_backend.size == 384
+    assert not isinstance(offline_store.embeddings, vdb.CachedEmbeddings)
+
+    activities = make_activities(3)
+    activities[1].description = "Jazz club with late night live music"
+    offline_store.save_activities(activities)
+
+    results = offline_store.similarity_search("live jazz music", limit=1)
+    assert results[0].name == "Venue 1"
+
+
+def test_similarity_search_structured_filters(store):
+    activities = make_activities(4)
+    activities[0].category = "Food & Drink Experiences"
+    activities[1].category = "Live Entertainment"
+    activities[1].start_time = "Sat, Apr 12, 1 – 4 PM"
+    activities[2].category = "Live Entertainment"
+    activities[2].start_time = "2025-04-13T20:00"
+    store.save_activities(activities)
+
+    assert activities[1].start_timestamp == vdb.parse_timestamp("Sat, Apr 12, 1 PM")
+
+    results = store.similarity_search("venue", limit=10, categories=["Food & Drink Experiences"])
+    assert [activity.name for activity in results] == ["Venue 0"]
+
+    results = store.similarity_search(
+        "venue", limit=10, categories=["Live Entertainment"],
+        starts_after=vdb.parse_timestamp("2025-04-13"), starts_before=vdb.parse_timestamp("2025-04-14"))
+    assert [activity.name for activity in results] == ["Venue 2"]
+
+
+@pytest.mark.parametrize("value, expected", [
+    # Yearless date before now is next year's
+    ("Sat, Apr 12, 1 – 4 PM", datetime(2027, 4, 12, 13, 0)),
+    ("Fri, Jan 2, 7 PM", datetime(2027, 1, 2, 19, 0)),
+    ("Oct 15", datetime(2026, 10, 15)),
+    ("2025-01-02T20:00", datetime(2025, 1, 2, 20, 0)),
+    # Coming weekday, save date is not the event date
+    ("Sat 1 PM", datetime(2026, 10, 17, 13, 0)),
+    ("Monday", datetime(2026, 10, 19)),
+    ("8 PM", None),
+    ("7:30 – 9:00 PM", None),
+    ("Varies", None),
+])
+def test_parse_timestamp_relative_to_now(value, expected):
+    now = datetime(2026, 10, 15, 12, 0)  # Thursday
+    expected = calendar.timegm(expected.timetuple()) if expected else None
+    assert vdb.parse_timestamp(value, now=now) == expected
+
+
+def test_similarity_search_batch(store):
+    activities = make_activities(6)
+    activities[0].description = "Jazz club with live music"
+    activities[1].description = "Modern art museum"
+    store.save_activities(activities)
+    store.embeddings.embeddings.calls.clear()
+    store.client.calls.clear()
+
+    queries = ["jazz live music", "art museum"]
+    results = store.similarity_search_batch(queries, limit=2)
+
+    assert store.embeddings.embeddings.calls == {"embed_documents": 1}
+    assert store.client.calls == {"query_batch_points": 1}
+    assert [[activity.id for activity in activities] for activities in results] == \
+        [[activity.id for activity in store.similarity_search(query, limit=2)] for query in queries]
+
+
+def test_search_tools_leave_out_storage_fields(store):
+    activities = make_activities(2)
+    activities[0].start_time = "2025-04-13T20:00"
+    store.save_activities(activities)
+    config = {"configurable": {"search_radius": 0}}
+
+    single = vector_store_search.func("venue", config, store)
+    multi = vector_store_multi_search.func(["venue"], config, store)
+    results = single["similarity_search"]["search_results"] + multi["similarity_search: venue"]["search_results"]
+
+    assert len(results) == 4
+    assert all("embedding_fingerprint" not in result and "start_timestamp" not in result for result in results)